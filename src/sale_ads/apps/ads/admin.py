@@ -1,5 +1,3 @@
-from functools import cached_property
-
 from django.contrib import admin
 from django.utils.translation import pgettext_lazy
 
@@ -28,26 +26,12 @@ class _AdAdmin(admin.ModelAdmin):
             value = self.value()
             if value is not None:
                 pk = Category.pk_from_string(value)
-                root_category = self._model_admin._category_cache[pk]
-                categories = [root_category, *root_category.descendants]
-                queryset = queryset.filter(
-                    category__in=[category.pk for category in categories]
-                )
+                queryset = queryset.filter(category__ancestor_links__ancestor=pk)
             return queryset
 
-    @cached_property
+    @property
     def _category_choices(self):
-        return [
-            (category.pk, category.full_name)
-            for category in sorted(
-                self._category_cache.values(),
-                key=lambda category: category.lowercased_full_name,
-            )
-        ]
-
-    @cached_property
-    def _category_cache(self):
-        return Category.objects.cache()
+        return Category.objects.snapshot().choices
 
     list_filter = ("created", _CategoryListFilter)
 
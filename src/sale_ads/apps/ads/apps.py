@@ -5,3 +5,8 @@ from django.utils.translation import pgettext_lazy
 class AdsConfig(AppConfig):
     name = "ads"
     verbose_name = pgettext_lazy("app name", "ads")
+
+    def ready(self):
+        import ads.checks  # NOQA
+        import ads.signals  # NOQA
+        import common.lookups  # NOQA
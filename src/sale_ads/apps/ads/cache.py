@@ -0,0 +1,4 @@
+from common.cache_versions import CacheVersion
+
+# Ads, their entries and categories
+ad_data_version = CacheVersion("ads.ad_data")
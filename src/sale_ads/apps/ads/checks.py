@@ -0,0 +1,11 @@
+from django.core import checks
+
+from common.cache_versions import check_cache_is_shared
+
+
+@checks.register(checks.Tags.caches)
+def check_ad_data_caching(app_configs, **kwargs):
+    return check_cache_is_shared(
+        ["ADS_AD_COUNT_CACHING", "ADS_CATEGORY_TREE_CACHING", "ADS_LIST_PAGE_CACHING"],
+        "ads.E001",
+    )
@@ -7,13 +7,13 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import (
     get_language,
-    get_language_info,
     ngettext_lazy,
     pgettext_lazy,
 )
 
 from ads.models import Ad, AdEntry, AdImage
 from categories.models import Category
+from languages.choices import get_language_choices
 
 
 class AdForm(forms.ModelForm):
@@ -31,14 +31,7 @@ class AdForm(forms.ModelForm):
         )
 
     def _create_category_choices(self):
-        return tuple(
-            (category.pk, category.full_name)
-            for category in sorted(
-                self._category_cache.values(),
-                key=lambda category: category.lowercased_full_name,
-            )
-            if category.ultimate
-        )
+        return self._category_cache.ultimate_choices
 
     def _coerce_to_category(self, pk_as_string):
         pk = Category.pk_from_string(pk_as_string)
@@ -112,21 +105,31 @@ class _BaseAdImageFormSet(forms.BaseModelFormSet):
 
 
 def ad_image_formset_factory(extra):
-    """Create `AdImage` model formset class with unrequired image fields."""
+    """
+    Create `AdImage` model formset class with unrequired image fields.
+
+    The classes with numbers of extra forms from 0 to `Ad.MAX_IMAGES`
+    (the ones used by the views) are created once and shared.
+    """
+    if 0 <= extra <= Ad.MAX_IMAGES:
+        return _AD_IMAGE_FORMSET_CLASSES[extra]
+    return _create_ad_image_formset_class(extra)
+
+
+def _create_ad_image_formset_class(extra):
     return forms.modelformset_factory(
         AdImage, _BaseAdImageFormSet._Form, extra=extra, formset=_BaseAdImageFormSet
     )
 
 
+_AD_IMAGE_FORMSET_CLASSES = tuple(
+    _create_ad_image_formset_class(extra) for extra in range(Ad.MAX_IMAGES + 1)
+)
+
+
 class AdEntryForm(forms.ModelForm):
     description = AdEntry._meta.get_field("description").formfield()
-    language = forms.ChoiceField(
-        choices=lambda: [
-            (language, get_language_info(language)["name_local"])
-            for language in settings.LANGUAGE_PREFERENCE_ORDER
-        ],
-        initial=get_language,
-    )
+    language = forms.ChoiceField(choices=get_language_choices, initial=get_language)
     name = AdEntry._meta.get_field("name").formfield()
 
     class Meta:
@@ -166,33 +169,28 @@ class AdQueryForm(forms.Form):
 
     @property
     def _category_choices(self):
-        if self.is_bound:
-            return self._create_category_choice_subset(
-                self._get_category_cache().values()
-            )
         category_cache = self._get_category_cache()
-        selected_categories = {
-            category_cache[pk] for pk in self.initial.get("categories", ())
-        }
-        non_selected_categories = set(category_cache.values()) - selected_categories
-        selected_choices = self._create_category_choice_subset(selected_categories)
-        non_selected_choices = self._create_category_choice_subset(
-            non_selected_categories
-        )
-        return selected_choices + non_selected_choices
-
-    def _create_category_choice_subset(self, categories):
-        return [
-            (category.pk, category.full_name)
-            for category in sorted(
-                categories, key=lambda category: category.lowercased_full_name
+        if settings.ADS_CATEGORY_PICKER:
+            # Other categories are found by searching
+            pks = (
+                self._get_initial_categories_from_cleaned()
+                if self.is_bound
+                else self.initial.get("categories", ())
             )
-        ]
+            return category_cache.get_selected_choices(pks)
+        if self.is_bound:
+            return category_cache.choices
+        return category_cache.get_choices_selected_first(
+            self.initial.get("categories", ())
+        )
 
     def _coerce_to_category(self, pk_as_string):
         pk = Category.pk_from_string(pk_as_string)
         return self._get_category_cache()[pk]
 
+    def _get_categories_choice_values(self):
+        return self._get_category_cache().choice_values
+
     @cached_property
     def cleaned_categories(self):
         return tuple(self._clean_mutli_choice_field("categories"))
@@ -203,13 +201,7 @@ class AdQueryForm(forms.Form):
     # --------------------------------------
     # Languages
 
-    languages = forms.MultipleChoiceField(
-        choices=lambda: [
-            (language, get_language_info(language)["name_local"])
-            for language in settings.LANGUAGE_PREFERENCE_ORDER
-        ],
-        required=False,
-    )
+    languages = forms.MultipleChoiceField(choices=get_language_choices, required=False)
 
     @cached_property
     def cleaned_languages(self):
@@ -218,6 +210,10 @@ class AdQueryForm(forms.Form):
             value = self._get_default_languages()
         return tuple(value)
 
+    @staticmethod
+    def _get_languages_choice_values():
+        return frozenset(settings.LANGUAGE_PREFERENCE_ORDER)
+
     @staticmethod
     def _get_default_languages():
         return [get_language()]
@@ -234,6 +230,7 @@ class AdQueryForm(forms.Form):
         LOWEST_PRICE_FIRST = enum.auto()
         NEWEST_FIRST = enum.auto()
         OLDEST_FIRST = enum.auto()
+        RELEVANCE = enum.auto()
 
         from_string = staticmethod(int)
 
@@ -254,16 +251,29 @@ class AdQueryForm(forms.Form):
                 Order.HIGHEST_PRICE_FIRST,
                 pgettext_lazy("ad order choice", "Price: highest first"),
             ),
+            (Order.RELEVANCE, pgettext_lazy("ad order choice", "Relevance")),
         ],
         coerce=Order.from_string,
         empty_value=_EMPTY_ORDER,
         required=False,
     )
 
+    def _limit_order_choices(self):
+        # There is relevance only with full-text search
+        if settings.ADS_SEARCH_MODE != "full_text":
+            field = self.fields["order"]
+            field.choices = [
+                (value, label)
+                for value, label in field.choices
+                if value != self.Order.RELEVANCE
+            ]
+
     @cached_property
     def cleaned_order(self):
         value = self._clean_field("order", self._EMPTY_ORDER)
-        if value == self._EMPTY_ORDER:
+        if value == self._EMPTY_ORDER or (
+            value == self.Order.RELEVANCE and not self.cleaned_search
+        ):
             value = self._DEFAULT_ORDER
         return value
 
@@ -340,6 +350,12 @@ class AdQueryForm(forms.Form):
             value = self._DEFAULT_SEARCH_FIELDS
         return tuple(value)
 
+    _SEARCH_FIELDS_CHOICE_VALUES = frozenset(map(str, SearchField))
+
+    @classmethod
+    def _get_search_fields_choice_values(cls):
+        return cls._SEARCH_FIELDS_CHOICE_VALUES
+
     _DEFAULT_SEARCH_FIELDS = tuple(SearchField)
 
     def _get_initial_search_fields_from_cleaned(self):
@@ -383,6 +399,7 @@ class AdQueryForm(forms.Form):
         super().__init__(*args, **kwargs)
         self._get_category_cache = get_category_cache
         self._create_category_field()
+        self._limit_order_choices()
         self._renamed_bound_fields = []
 
     class Factory:
@@ -422,6 +439,10 @@ class AdQueryForm(forms.Form):
         If the value is a valid iterable of choices, then extracts those
         of them that are valid.
         Otherwise, returns an empty container.
+        The choices are checked against the set of string values of
+        valid choices got from `_get_<name>_choice_values()`, rather
+        than cleaned with the field one by one, so that the choices of
+        the field aren't built.
         """
         value = self[name].data
         field = self.fields[name]
@@ -429,15 +450,13 @@ class AdQueryForm(forms.Form):
             value = field.to_python(value)
         except ValidationError:
             value = []
-        new_value = []
-        for choice in value:
-            try:
-                (choice,) = field.clean([choice])
-            except ValidationError:
-                pass
-            else:
-                new_value.append(choice)
-        return new_value
+        valid_values = getattr(self, f"_get_{name}_choice_values")()
+        coerce = getattr(field, "coerce", None)
+        return [
+            choice if coerce is None else coerce(choice)
+            for choice in value
+            if choice in valid_values
+        ]
 
     def get_field_initial_from_cleaned(self, name):
         """Get initial for field value from value from cleaned data."""
@@ -457,8 +476,8 @@ class AdDetailEntryChoiceForm(forms.Form):
     def _create_language_field(self, available_languages):
         self.fields["language"] = forms.ChoiceField(
             choices=[
-                (language, get_language_info(language)["name_local"])
-                for language in settings.LANGUAGE_PREFERENCE_ORDER
+                (language, local_name)
+                for language, local_name in get_language_choices()
                 if language in available_languages
             ]
         )
@@ -479,13 +498,32 @@ class AdUpdateEntryChoiceForm(forms.Form):
 
     def _create_language_field(self, used_languages):
         self.fields["language"] = forms.ChoiceField(
-            choices=self._create_language_choices(used_languages)
+            choices=self._get_language_choices(used_languages)
         )
 
+    _language_choices = {}
+
+    @classmethod
+    def _get_language_choices(cls, used_languages):
+        """
+        Get choices of languages with notes whether entries are created.
+
+        The choices are computed once per active language, language
+        choices and set of used languages.
+        """
+        used_languages = frozenset(used_languages)
+        key = (get_language(), get_language_choices(), used_languages)
+        try:
+            return cls._language_choices[key]
+        except KeyError:
+            value = cls._language_choices[key] = tuple(
+                cls._create_language_choices(used_languages)
+            )
+            return value
+
     @staticmethod
     def _create_language_choices(used_languages):
-        for language in settings.LANGUAGE_PREFERENCE_ORDER:
-            local_name = get_language_info(language)["name_local"]
+        for language, local_name in get_language_choices():
             note = (
                 AdUpdateEntryChoiceForm._CREATED_NOTE
                 if language in used_languages
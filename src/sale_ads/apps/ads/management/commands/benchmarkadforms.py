@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+from django.utils.translation import get_language
+
+import ads.forms
+import languages.choices
+from ads.forms import (
+    AdEntryForm,
+    AdImageCreateFormSet,
+    AdUpdateEntryChoiceForm,
+    ad_image_formset_factory,
+)
+from ads.models import Ad, AdImage
+from common.benchmarking import measure
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time of creating the forms of the ad creation, update and "
+        "images update views per request, with cold and warm caches of form "
+        "classes and choices."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", default=1000, type=int)
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, number, repeat, **options):
+        self.stdout.write(str.join("\t", ["view", "cold", "warm"]))
+        views = {
+            "create": self._create_creation_forms,
+            "update": self._create_update_forms,
+            "update_images": self._create_images_update_forms,
+        }
+        for name, create_forms in views.items():
+            times = [
+                self._measure(create_forms, number, repeat, cold=cold)
+                for cold in [True, False]
+            ]
+            row = [name, *(f"{value * 1e6:.1f} us" for value in times)]
+            self.stdout.write(str.join("\t", row))
+
+    def _measure(self, create_forms, number, repeat, *, cold):
+        """Measure median time of creating the forms for a request."""
+        if cold:
+            # The caches are cleared before each call
+            return measure(
+                lambda cleared: create_forms(cold=True),
+                number=number,
+                repeat=repeat,
+                setup=self._clear_caches,
+            )
+        return measure(lambda: create_forms(cold=False), number=number, repeat=repeat)
+
+    @staticmethod
+    def _clear_caches():
+        languages.choices._language_choices.clear()
+        AdUpdateEntryChoiceForm._language_choices.clear()
+
+    @staticmethod
+    def _create_creation_forms(*, cold):
+        entry_form = AdEntryForm()
+        list(entry_form.fields["language"].choices)
+        AdImageCreateFormSet(queryset=AdImage.objects.none())
+
+    @staticmethod
+    def _create_update_forms(*, cold):
+        entry_choice_form = AdUpdateEntryChoiceForm(used_languages=[get_language()])
+        list(entry_choice_form.fields["language"].choices)
+        entry_form = AdEntryForm()
+        list(entry_form.fields["language"].choices)
+
+    @staticmethod
+    def _create_images_update_forms(*, cold):
+        extra = Ad.MAX_IMAGES - 1
+        formset_class = (
+            ads.forms._create_ad_image_formset_class(extra)
+            if cold
+            else ad_image_formset_factory(extra)
+        )
+        formset_class(queryset=AdImage.objects.none())
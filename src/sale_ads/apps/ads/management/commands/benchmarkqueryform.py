@@ -0,0 +1,86 @@
+import random
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from ads.forms import AdQueryForm
+from categories.models import Category
+from common.benchmarking import compiled_htmlforms_elements, measure
+from frontend.templatetags.htmlforms import _CustomHTMLFormsLib
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time of rendering the query form of the ad list page against "
+        "the number of categories, with and without compiled htmlforms "
+        "elements. The benchmark data is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=[10, 100, 1000], nargs="+", type=int)
+        parser.add_argument("--number", default=20, type=int)
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, sizes, number, repeat, **options):
+        self.stdout.write(str.join("\t", ["categories", "uncompiled", "compiled"]))
+        template = get_template("ads/lists/_base/_query_form.html")
+        with transaction.atomic():
+            # The sizes include the existing categories
+            pks = list(Category.objects.values_list("pk", flat=True))
+            for size in sorted(sizes):
+                pks += self._create_categories(pks, size - len(pks))
+                context = self._create_context(pks)
+                times = []
+                renders = []
+                for compiled in [False, True]:
+                    with compiled_htmlforms_elements(_CustomHTMLFormsLib, compiled):
+                        renders.append(template.render(context))
+                        times.append(
+                            measure(
+                                lambda: template.render(context),
+                                number=number,
+                                repeat=repeat,
+                            )
+                        )
+                if renders[0] != renders[1]:
+                    raise AssertionError("Compiled elements render differently.")
+                row = [str(size), *(f"{value * 1000:.2f} ms" for value in times)]
+                self.stdout.write(str.join("\t", row))
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _create_categories(parent_pks, count):
+        categories = Category.objects.bulk_create(
+            Category(
+                name=uuid4().hex,
+                parent_id=random.choice(parent_pks) if parent_pks else None,
+                ultimate=True,
+            )
+            for i in range(count)
+        )
+        return [category.pk for category in categories]
+
+    @staticmethod
+    def _create_context(category_pks):
+        """Create context of the template as the list view does."""
+        parameters = AdQueryForm.URL_PARAMETERS
+        query = {
+            parameters["categories"]: random.sample(
+                category_pks, min(len(category_pks), 3)
+            ),
+            parameters["languages"]: ["en"],
+            parameters["search"]: "benchmark",
+        }
+        request = RequestFactory().get("/", query)
+        category_cache = Category.objects.snapshot()
+        factory = AdQueryForm.Factory(get_category_cache=lambda: category_cache)
+        query_form = factory.create(request.GET)
+        return {
+            "query_form": factory.create(
+                initial=query_form.create_initial_from_cleaned()
+            ),
+            "request": request,
+        }
@@ -0,0 +1,114 @@
+import random
+import string
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+
+from ads.forms import AdQueryForm
+from ads.models import Ad, AdEntry
+from ads.views import _AdListView
+from categories.models import Category
+from common.benchmarking import measure
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time of ad list search queries against the number of ad "
+        "entries. The benchmark data is rolled back at the end."
+    )
+
+    _MODES = ("substring", "trigram", "full_text")
+    _WORDS = (
+        "bicycle",
+        "camera",
+        "chair",
+        "guitar",
+        "lamp",
+        "laptop",
+        "phone",
+        "sofa",
+        "table",
+        "watch",
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default=[1000, 10000, 100000], nargs="+", type=int
+        )
+        parser.add_argument(
+            "--modes", choices=self._MODES, default=self._MODES, nargs="+"
+        )
+        parser.add_argument("--repeat", default=5, type=int)
+        parser.add_argument("--keyword", default="QX-17")
+
+    def handle(self, *args, sizes, modes, repeat, keyword, **options):
+        self.stdout.write(str.join("\t", ["entries", *modes]))
+        with transaction.atomic():
+            author = get_user_model().objects.create(
+                email=f"{uuid4().hex}@benchmark.test", username=uuid4().hex[:20]
+            )
+            category = Category.objects.create(name=uuid4().hex, ultimate=True)
+            entry_count = 0
+            for size in sorted(sizes):
+                self._create_entries(author, category, size - entry_count, keyword)
+                entry_count = size
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE ads_ad, ads_adentry")
+                times = [self._measure(mode, keyword, repeat) for mode in modes]
+                row = [str(size), *(f"{value * 1000:.1f} ms" for value in times)]
+                self.stdout.write(str.join("\t", row))
+            transaction.set_rollback(True)
+
+    def _create_entries(self, author, category, count, keyword):
+        ads = Ad.objects.bulk_create(
+            Ad(author=author, category=category, price=1, verified=True)
+            for i in range(count)
+        )
+        AdEntry.objects.bulk_create(
+            AdEntry(
+                ad=ad,
+                description=self._create_text(keyword, 30),
+                language="en",
+                name=self._create_text(keyword, 4),
+            )
+            for ad in ads
+        )
+
+    def _create_text(self, keyword, word_count):
+        words = random.choices(self._WORDS, k=word_count)
+        # Model code, matching the keyword in about 1% of texts
+        if random.random() < 0.01:
+            words.append(f"{keyword}{random.randrange(10)}")
+        else:
+            letters = str.join("", random.choices(string.ascii_uppercase, k=2))
+            words.append(f"{letters}-{random.randrange(100)}")
+        random.shuffle(words)
+        return str.join(" ", words)
+
+    def _measure(self, mode, keyword, repeat):
+        """Measure median time of getting the first page and the count."""
+        url_parameters = {AdQueryForm.URL_PARAMETERS["search"]: keyword}
+        request = RequestFactory().get("/", url_parameters)
+        request.user = AnonymousUser()
+        with override_settings(ADS_SEARCH_MODE=mode):
+            return measure(
+                self._get_first_page_and_count,
+                repeat=repeat,
+                setup=lambda: self._create_view(request),
+            )
+
+    @staticmethod
+    def _create_view(request):
+        view = _AdListView()
+        view.setup(request)
+        return view
+
+    @staticmethod
+    def _get_first_page_and_count(view):
+        queryset = view.get_queryset()
+        list(queryset[: AdQueryForm._DEFAULT_PAGE_SIZE])
+        queryset.count()
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from ads.models import CategoryAdCounter
+
+
+class Command(BaseCommand):
+    help = "Recount verified ads of all categories."
+
+    def handle(self, *args, **options):
+        CategoryAdCounter.objects.rebuild()
@@ -0,0 +1,83 @@
+# Generated by Django 4.1.13 on 2026-10-17 23:30
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def count_category_ads(apps, schema_editor):
+    AdEntry = apps.get_model("ads", "AdEntry")
+    Category = apps.get_model("categories", "Category")
+    CategoryAdCounter = apps.get_model("ads", "CategoryAdCounter")
+    own_counts = list(
+        AdEntry.objects.filter(ad__verified=True)
+        .values_list("ad__category", "language")
+        .annotate(Count("pk"))
+    )
+    parents = dict(Category.objects.values_list("pk", "parent"))
+    counters = {}
+    for category_pk, language, count in own_counts:
+        counters[category_pk, language] = CategoryAdCounter(
+            category_id=category_pk, language=language, own_count=count
+        )
+    for category_pk, language, count in own_counts:
+        while category_pk is not None:
+            if (category_pk, language) not in counters:
+                counters[category_pk, language] = CategoryAdCounter(
+                    category_id=category_pk, language=language
+                )
+            counters[category_pk, language].subtree_count += count
+            category_pk = parents[category_pk]
+    CategoryAdCounter.objects.bulk_create(counters.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("ads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryAdCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("language", models.CharField(max_length=10, verbose_name="language")),
+                ("own_count", models.IntegerField(default=0, verbose_name="own count")),
+                (
+                    "subtree_count",
+                    models.IntegerField(default=0, verbose_name="subtree count"),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ad_counters",
+                        to="categories.category",
+                        verbose_name="category",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "category ad counter",
+                "verbose_name_plural": "category ad counters",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="categoryadcounter",
+            constraint=models.UniqueConstraint(
+                fields=("category", "language"),
+                name="category_and_language_unique_together",
+            ),
+        ),
+        migrations.RunPython(count_category_ads, migrations.RunPython.noop),
+    ]
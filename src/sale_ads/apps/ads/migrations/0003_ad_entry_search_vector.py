@@ -0,0 +1,70 @@
+# Generated by Django 4.1.13 on 2026-10-17 23:36
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Search vectors are computed by a trigger, so that they are up to date
+# regardless of the way entries are saved (including bulk creation)
+SEARCH_VECTOR_SQL = """
+CREATE FUNCTION ads_adentry_search_vector(
+    language varchar, name varchar, description text
+) RETURNS tsvector AS $$
+    SELECT
+        setweight(to_tsvector(config, coalesce(name, '')), 'A')
+        || setweight(to_tsvector(config, coalesce(description, '')), 'B')
+    FROM (
+        SELECT CASE language
+            WHEN 'en' THEN 'english'::regconfig
+            WHEN 'ru' THEN 'russian'::regconfig
+            ELSE 'simple'::regconfig
+        END AS config
+    ) AS configs
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE FUNCTION ads_adentry_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := ads_adentry_search_vector(
+        NEW.language, NEW.name, NEW.description
+    );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER ads_adentry_search_vector
+BEFORE INSERT OR UPDATE ON ads_adentry
+FOR EACH ROW EXECUTE FUNCTION ads_adentry_search_vector_trigger();
+
+UPDATE ads_adentry
+SET search_vector = ads_adentry_search_vector(language, name, description);
+"""
+
+REVERSE_SEARCH_VECTOR_SQL = """
+DROP TRIGGER ads_adentry_search_vector ON ads_adentry;
+DROP FUNCTION ads_adentry_search_vector_trigger();
+DROP FUNCTION ads_adentry_search_vector(varchar, varchar, text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0002_category_ad_counter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adentry",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="search vector"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adentry",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="ad_entry_search_vector"
+            ),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, REVERSE_SEARCH_VECTOR_SQL),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.1.13 on 2026-10-17 23:42
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0003_ad_entry_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="adentry",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["description"],
+                name="ad_entry_description_trigram",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adentry",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="ad_entry_name_trigram",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
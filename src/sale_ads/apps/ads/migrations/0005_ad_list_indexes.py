@@ -0,0 +1,102 @@
+# Generated by Django 4.1.13 on 2026-10-17 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0004_ad_entry_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["-created", "id"],
+                name="ad_verified_created_desc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["created", "id"],
+                name="ad_verified_created_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["price", "-created", "id"],
+                name="ad_verified_price_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["-price", "-created", "id"],
+                name="ad_verified_price_desc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["category", "-created", "id"],
+                name="ad_category_created_desc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["category", "created", "id"],
+                name="ad_category_created_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["category", "price", "-created", "id"],
+                name="ad_category_price_asc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                condition=models.Q(("verified", True)),
+                fields=["category", "-price", "-created", "id"],
+                name="ad_category_price_desc",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                fields=["author", "-created", "id"], name="ad_author_created_desc"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                fields=["author", "created", "id"], name="ad_author_created_asc"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                fields=["author", "price", "-created", "id"], name="ad_author_price_asc"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ad",
+            index=models.Index(
+                fields=["author", "-price", "-created", "id"],
+                name="ad_author_price_desc",
+            ),
+        ),
+    ]
@@ -1,11 +1,16 @@
 from decimal import Decimal
+from operator import attrgetter
 from pathlib import Path
+from types import MappingProxyType
 from uuid import uuid4
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F
 from django.urls import reverse
 from django.utils.translation import get_language, get_language_info
 from django.utils.translation import gettext_lazy as _
@@ -14,6 +19,13 @@ from django.utils.translation import pgettext_lazy
 from categories.models import Category
 from languages.validators import validate_language_allowed
 
+_LIST_INDEX_ORDERINGS = [
+    ("created_desc", ["-created", "id"]),
+    ("created_asc", ["created", "id"]),
+    ("price_asc", ["price", "-created", "id"]),
+    ("price_desc", ["-price", "-created", "id"]),
+]
+
 
 class Ad(models.Model):
     # ==========================================================
@@ -70,6 +82,31 @@ class Ad(models.Model):
     # ==========================================================
 
     class Meta:
+        indexes = [
+            # For ad lists, one index per ordering of list views,
+            # followed by the default and the tie-breaking orderings
+            # Public lists (all and of categories)
+            *[
+                models.Index(
+                    condition=models.Q(verified=True),
+                    fields=[*leading_fields, *ordering_fields],
+                    name=f"ad_{prefix}_{suffix}",
+                )
+                for prefix, leading_fields in [
+                    ("verified", []),
+                    ("category", ["category"]),
+                ]
+                for suffix, ordering_fields in _LIST_INDEX_ORDERINGS
+            ],
+            # Lists of ads of users, including unverified ones for
+            # their authors
+            *[
+                models.Index(
+                    fields=["author", *ordering_fields], name=f"ad_author_{suffix}"
+                )
+                for suffix, ordering_fields in _LIST_INDEX_ORDERINGS
+            ],
+        ]
         verbose_name = pgettext_lazy("model", "ad")
         verbose_name_plural = pgettext_lazy("model plural", "ads")
 
@@ -77,8 +114,12 @@ class Ad(models.Model):
         return reverse("ads_detail", kwargs={"pk": self.pk})
 
     def ordered_images(self):
-        """Get images ordered by number."""
-        return self.images.order_by("number")
+        """
+        Get images ordered by number.
+
+        Sorts the images in Python, so that prefetched images are used.
+        """
+        return sorted(self.images.all(), key=attrgetter("number"))
 
     def __str__(self):
         names = dict(self.entries.values_list("language", "name"))
@@ -137,18 +178,76 @@ class AdEntry(models.Model):
     )
     name = models.CharField(pgettext_lazy("ad entry field", "name"), max_length=200)
 
+    # --------------------------------------
+    # Search vector
+
+    # The vector is maintained by a database trigger (see migrations),
+    # so that bulk creation and updates keep it up to date too.
+    # The configurations and weights must match the trigger.
+    search_vector = SearchVectorField(
+        pgettext_lazy("ad entry field", "search vector"), editable=False, null=True
+    )
+
+    SEARCH_CONFIGS = MappingProxyType({"en": "english", "ru": "russian"})
+    _DEFAULT_SEARCH_CONFIG = "simple"
+    SEARCH_WEIGHTS = MappingProxyType({"name": "A", "description": "B"})
+
+    # ==========================================================
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
                 fields=["ad", "language"], name="ad_and_language_unique_together"
             )
         ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="ad_entry_search_vector"),
+            # For trigram search
+            GinIndex(
+                fields=["description"],
+                name="ad_entry_description_trigram",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["name"],
+                name="ad_entry_name_trigram",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
         verbose_name = pgettext_lazy("model", "ad entry")
         verbose_name_plural = pgettext_lazy("model plural", "ad entries")
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def get_search_config(cls, language):
+        """Get text search configuration of language."""
+        return cls.SEARCH_CONFIGS.get(language, cls._DEFAULT_SEARCH_CONFIG)
+
+    @classmethod
+    def create_search_query(cls, keywords, language, fields=SEARCH_WEIGHTS.keys()):
+        """
+        Create full-text query matching search vectors of entries.
+
+        The query matches entries in the language containing all the
+        keywords (reduced to lexemes) in any of the fields.
+        """
+        weights = str.join("", sorted(cls.SEARCH_WEIGHTS[field] for field in fields))
+        terms = [
+            f"'{cls._escape_search_keyword(keyword)}':{weights}"
+            for keyword in sorted(keywords)
+        ]
+        return SearchQuery(
+            str.join(" & ", terms),
+            config=cls.get_search_config(language),
+            search_type="raw",
+        )
+
+    @staticmethod
+    def _escape_search_keyword(keyword):
+        return keyword.replace("\\", "\\\\").replace("'", "''")
+
 
 class AdImage(models.Model):
     # ==========================================================
@@ -182,3 +281,199 @@ class AdImage(models.Model):
     class Meta:
         verbose_name = pgettext_lazy("model", "ad image")
         verbose_name_plural = pgettext_lazy("model plural", "ad images")
+
+
+class _CategoryAdCounterQuerySet(models.QuerySet):
+    def refresh(self, category_pks):
+        """
+        Refresh counters of categories.
+
+        Recounts the own verified ads of the categories and propagates
+        the changes of the own counts to the subtree counts of the
+        categories and their ancestors.
+        """
+        with transaction.atomic():
+            for pk in sorted(set(category_pks)):
+                self._refresh_category(pk)
+
+    def _refresh_category(self, pk):
+        # Locking the category, so that concurrent refreshes of the same
+        # category don't compute the same changes twice
+        if not Category.objects.select_for_update().filter(pk=pk).exists():
+            return
+        new_counts = dict(
+            AdEntry.objects.filter(ad__category=pk, ad__verified=True)
+            .values_list("language")
+            .annotate(Count("pk"))
+        )
+        old_counts = dict(self.filter(category=pk).values_list("language", "own_count"))
+        changes = {
+            language: new_counts.get(language, 0) - old_counts.get(language, 0)
+            for language in new_counts.keys() | old_counts.keys()
+        }
+        changes = {language: change for language, change in changes.items() if change}
+        if not changes:
+            return
+        path = self._get_path_from_root(pk)
+        self.bulk_create(
+            [
+                CategoryAdCounter(category_id=category_pk, language=language)
+                for category_pk in path
+                for language in changes
+            ],
+            ignore_conflicts=True,
+        )
+        for language, change in changes.items():
+            self.filter(category=pk, language=language).update(
+                own_count=F("own_count") + change
+            )
+            self.filter(category__in=path, language=language).update(
+                subtree_count=F("subtree_count") + change
+            )
+
+    @staticmethod
+    def _get_path_from_root(pk):
+        path = []
+        while pk is not None:
+            path.append(pk)
+            pk = Category.objects.filter(pk=pk).values_list("parent", flat=True).get()
+        return path[::-1]
+
+    def move(self, pk, previous_parent_pk):
+        """
+        Move counts of subtree of category from its previous ancestors to
+        its current ones.
+
+        The categories of the subtree and of both paths are locked, so
+        that concurrent refreshes of them are applied before or after
+        the move (and then along the current path).
+        """
+        with transaction.atomic():
+            parent_pk = (
+                Category.objects.filter(pk=pk).values_list("parent", flat=True).get()
+            )
+            previous_path = (
+                self._get_path_from_root(previous_parent_pk)
+                if previous_parent_pk is not None
+                else []
+            )
+            path = self._get_path_from_root(parent_pk) if parent_pk is not None else []
+            # Common ancestors keep their counts
+            common_ancestors = set(previous_path) & set(path)
+            previous_path = [
+                category_pk
+                for category_pk in previous_path
+                if category_pk not in common_ancestors
+            ]
+            path = [
+                category_pk
+                for category_pk in path
+                if category_pk not in common_ancestors
+            ]
+            locked_pks = [*self._get_subtree(pk), *previous_path, *path]
+            list(
+                Category.objects.select_for_update()
+                .filter(pk__in=locked_pks)
+                .order_by("pk")
+                .values_list("pk")
+            )
+            counts = dict(
+                self.filter(category=pk)
+                .exclude(subtree_count=0)
+                .values_list("language", "subtree_count")
+            )
+            if not counts:
+                return
+            self.bulk_create(
+                [
+                    CategoryAdCounter(category_id=category_pk, language=language)
+                    for category_pk in path
+                    for language in counts
+                ],
+                ignore_conflicts=True,
+            )
+            for language, count in counts.items():
+                self.filter(category__in=previous_path, language=language).update(
+                    subtree_count=F("subtree_count") - count
+                )
+                self.filter(category__in=path, language=language).update(
+                    subtree_count=F("subtree_count") + count
+                )
+
+    @staticmethod
+    def _get_subtree(pk):
+        subtree = [pk]
+        level = [pk]
+        while level:
+            level = list(
+                Category.objects.filter(parent__in=level).values_list("pk", flat=True)
+            )
+            subtree += level
+        return subtree
+
+    def rebuild(self):
+        """Recount verified ads of all categories."""
+        with transaction.atomic():
+            # Locking the categories, so that concurrent refreshes don't
+            # apply changes computed from the replaced counters
+            list(Category.objects.select_for_update().order_by("pk").values_list("pk"))
+            own_counts = list(
+                AdEntry.objects.filter(ad__verified=True)
+                .values_list("ad__category", "language")
+                .annotate(Count("pk"))
+            )
+            parents = dict(Category.objects.values_list("pk", "parent"))
+            counters = {}
+            for category_pk, language, count in own_counts:
+                counters[category_pk, language] = CategoryAdCounter(
+                    category_id=category_pk, language=language, own_count=count
+                )
+            for category_pk, language, count in own_counts:
+                while category_pk is not None:
+                    if (category_pk, language) not in counters:
+                        counters[category_pk, language] = CategoryAdCounter(
+                            category_id=category_pk, language=language
+                        )
+                    counters[category_pk, language].subtree_count += count
+                    category_pk = parents[category_pk]
+            self.all().delete()
+            self.bulk_create(counters.values())
+
+
+class CategoryAdCounter(models.Model):
+    """
+    Numbers of verified ads in category having entries in language.
+
+    The own count includes only ads of the category itself; the subtree
+    count includes ads of the category and its descendants.
+    The counters are maintained by signal receivers; after bulk changes
+    they should be rebuilt with `CategoryAdCounter.objects.rebuild()`.
+    """
+
+    category = models.ForeignKey(
+        Category,
+        models.CASCADE,
+        "ad_counters",
+        verbose_name=pgettext_lazy("category ad counter field", "category"),
+    )
+    language = models.CharField(
+        pgettext_lazy("category ad counter field", "language"), max_length=10
+    )
+    own_count = models.IntegerField(
+        pgettext_lazy("category ad counter field", "own count"), default=0
+    )
+    subtree_count = models.IntegerField(
+        pgettext_lazy("category ad counter field", "subtree count"), default=0
+    )
+
+    objects = _CategoryAdCounterQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "language"],
+                name="category_and_language_unique_together",
+            )
+        ]
+        verbose_name = pgettext_lazy("model", "category ad counter")
+        verbose_name_plural = pgettext_lazy("model plural", "category ad counters")
@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from ads.cache import ad_data_version
+from ads.models import Ad, AdEntry, CategoryAdCounter
+from categories.models import Category
+
+
+@receiver(post_delete, sender=Ad)
+@receiver(post_delete, sender=AdEntry)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Ad)
+@receiver(post_save, sender=AdEntry)
+@receiver(post_save, sender=Category)
+def bump_ad_data_version(**kwargs):
+    # Bumping after the commit, so that data cached for the new version
+    # doesn't miss the change
+    transaction.on_commit(ad_data_version.bump)
+
+
+# ==========================================================================
+# Category ad counters
+
+
+@receiver(pre_save, sender=Ad)
+def remember_previous_ad_category(instance, update_fields, **kwargs):
+    if instance._state.adding or (
+        update_fields is not None and "category" not in update_fields
+    ):
+        instance._previous_category_pk = instance.category_id
+    else:
+        instance._previous_category_pk = (
+            Ad.objects.filter(pk=instance.pk).values_list("category", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Ad)
+def refresh_category_ad_counters_on_ad_save(instance, **kwargs):
+    category_pks = {instance.category_id}
+    previous_category_pk = getattr(instance, "_previous_category_pk", None)
+    if previous_category_pk is not None:
+        category_pks.add(previous_category_pk)
+    CategoryAdCounter.objects.refresh(category_pks)
+
+
+@receiver(post_delete, sender=Ad)
+def refresh_category_ad_counters_on_ad_deletion(instance, **kwargs):
+    CategoryAdCounter.objects.refresh([instance.category_id])
+
+
+@receiver(post_delete, sender=AdEntry)
+@receiver(post_save, sender=AdEntry)
+def refresh_category_ad_counters_on_ad_entry_change(instance, **kwargs):
+    category_pk = Ad.objects.filter(pk=instance.ad_id).values_list(
+        "category", flat=True
+    )
+    CategoryAdCounter.objects.refresh(category_pk)
+
+
+@receiver(pre_save, sender=Category)
+def remember_previous_category_parent(instance, update_fields, **kwargs):
+    if instance._state.adding or (
+        update_fields is not None and "parent" not in update_fields
+    ):
+        instance._previous_parent_pk = instance.parent_id
+    else:
+        instance._previous_parent_pk = (
+            Category.objects.filter(pk=instance.pk)
+            .values_list("parent", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Category)
+def move_category_ad_counters_on_category_move(instance, created, **kwargs):
+    # New categories have no ads, and categories having ads or children
+    # can't be deleted, so only changes of parents matter
+    previous_parent_pk = getattr(instance, "_previous_parent_pk", instance.parent_id)
+    if not created and previous_parent_pk != instance.parent_id:
+        CategoryAdCounter.objects.move(instance.pk, previous_parent_pk)
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.test import SimpleTestCase
 
 from ads.forms import _BaseAdImageFormSet, ad_image_formset_factory
+from ads.models import Ad
 from common.tests.utils.image_test_mixin import ImageTestMixin
 
 
@@ -26,6 +27,18 @@ class AdImageFormsetFactoryTest(SimpleTestCase):
         result = ad_image_formset_factory(extra)
         self.assertEqual(result.extra, extra)
 
+    def test_classes_shared(self):
+        for extra in range(Ad.MAX_IMAGES + 1):
+            with self.subTest(extra=extra):
+                result = ad_image_formset_factory(extra)
+                self.assertEqual(result.extra, extra)
+                self.assertIs(ad_image_formset_factory(extra), result)
+
+    def test_with_extra_greater_than_max_images(self):
+        extra = Ad.MAX_IMAGES + 1
+        result = ad_image_formset_factory(extra)
+        self.assertEqual(result.extra, extra)
+
 
 ###############################################################################
 # Base formset
@@ -2,10 +2,10 @@ import itertools
 from collections import Counter
 from collections.abc import Iterable
 from importlib import import_module
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 from django.conf import settings
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils.translation import get_language, get_language_info
 
 from ads.forms import AdQueryForm
@@ -257,6 +257,17 @@ class AdQueryFormCategoriesValidationTest(
         category = next(iter(self.categories))
         self._test([self.invalid_pk, category.pk], [category])
 
+    def test_with_non_canonical_pk(self):
+        category = next(iter(self.categories))
+        self._test([f"0{category.pk}"], [])
+
+    def test_choices_not_built(self):
+        with patch.object(
+            AdQueryForm, "_category_choices", new_callable=PropertyMock
+        ) as mock:
+            self._test([category.pk for category in self.categories], self.categories)
+        mock.assert_not_called()
+
 
 # --------------------------------------
 # Languages
@@ -321,6 +332,26 @@ class AdQueryFormOrderValidationTest(AdQueryFormFieldValidationTestMixin, TestCa
     def test_without_order(self):
         self._test(None, AdQueryForm._DEFAULT_ORDER)
 
+    @override_settings(ADS_SEARCH_MODE="full_text")
+    def test_relevance_with_search(self):
+        form = self.create_form(
+            {AdQueryForm.URL_PARAMETERS["search"]: "spam"},
+            value=AdQueryForm.Order.RELEVANCE,
+        )
+        self.assertEqual(form.cleaned_order, AdQueryForm.Order.RELEVANCE)
+
+    @override_settings(ADS_SEARCH_MODE="full_text")
+    def test_relevance_without_search(self):
+        self._test(AdQueryForm.Order.RELEVANCE, AdQueryForm._DEFAULT_ORDER)
+
+    @override_settings(ADS_SEARCH_MODE="substring")
+    def test_relevance_without_full_text_search(self):
+        form = self.create_form(
+            {AdQueryForm.URL_PARAMETERS["search"]: "spam"},
+            value=AdQueryForm.Order.RELEVANCE,
+        )
+        self.assertEqual(form.cleaned_order, AdQueryForm._DEFAULT_ORDER)
+
 
 # --------------------------------------
 # Page size
@@ -659,6 +690,33 @@ class AdQueryFormCategoryChoicesTest(AdQueryFormTestMixin, SaleAdsTestMixin, Tes
         expected_values = [category.pk for category in [a, b, C, D]]
         self.assertEqual(list(actual_values), expected_values)
 
+    @override_settings(ADS_CATEGORY_PICKER=True)
+    def test_with_picker_in_unbound_forms_only_initial(self):
+        a, b, c = Category.objects.bulk_create(
+            self.category_factory.create(
+                name=self.category_name_factory.get_unique(prefix=name_prefix),
+                save=False,
+            )
+            for name_prefix in "abc"
+        )
+        form = self.create_form(initial={"categories": [c.pk, a.pk]})
+        actual = form.fields["categories"].choices
+        expected = [(a.pk, a.full_name), (c.pk, c.full_name)]
+        self.assertEqual(list(actual), expected)
+
+    @override_settings(ADS_CATEGORY_PICKER=True)
+    def test_with_picker_in_bound_forms_only_cleaned(self):
+        a, b = Category.objects.bulk_create(
+            self.category_factory.create(
+                name=self.category_name_factory.get_unique(prefix=name_prefix),
+                save=False,
+            )
+            for name_prefix in "ab"
+        )
+        form = self.create_form({AdQueryForm.URL_PARAMETERS["categories"]: [b.pk]})
+        actual = form.fields["categories"].choices
+        self.assertEqual(list(actual), [(b.pk, b.full_name)])
+
 
 class AdQueryFormGetInitialCategoriesFromCleaned(
     AdQueryFormGetInitialFieldValueFromCleanedTestMixin, SaleAdsTestMixin, TestCase
@@ -741,12 +799,21 @@ class AdQueryFormOrderEnumFromStringTest(SimpleTestCase):
 
 
 class AdQueryFormOrderChoicesTest(AdQueryFormTestMixin, TestCase):
+    @override_settings(ADS_SEARCH_MODE="full_text")
     def test_values_are_orders(self):
         form = self.create_form()
         choices = form.fields["order"].choices
         values = list(zip(*choices))[0]
         self.assertDictEqual(Counter(values), Counter(AdQueryForm.Order))
 
+    @override_settings(ADS_SEARCH_MODE="substring")
+    def test_values_without_full_text_search(self):
+        form = self.create_form()
+        choices = form.fields["order"].choices
+        values = list(zip(*choices))[0]
+        expected = set(AdQueryForm.Order) - {AdQueryForm.Order.RELEVANCE}
+        self.assertDictEqual(Counter(values), Counter(expected))
+
 
 class AdQueryFormDefaultOrderTest(SimpleTestCase):
     def test(self):
@@ -1,4 +1,7 @@
+from unittest.mock import patch
+
 from django.test import SimpleTestCase
+from django.utils import translation
 from django.utils.translation import get_language_info
 
 from ads.forms import AdUpdateEntryChoiceForm
@@ -25,3 +28,29 @@ class AdUpdateEntryChoiceFormLanguageChoicesTest(SimpleTestCase):
             ("fr", f"{get_language_info('fr')['name_local']} (not created)"),
         ]
         self.assertEqual(actual, expected)
+
+    def test_computed_once(self):
+        with (
+            self.settings(LANGUAGE_PREFERENCE_ORDER=["de", "fr"]),
+            patch.dict(AdUpdateEntryChoiceForm._language_choices, clear=True),
+            patch.object(
+                AdUpdateEntryChoiceForm,
+                "_create_language_choices",
+                wraps=AdUpdateEntryChoiceForm._create_language_choices,
+            ) as mock,
+        ):
+            for used_languages in [["de"], ["de"], ["fr"]]:
+                AdUpdateEntryChoiceForm(used_languages=used_languages)
+        self.assertEqual(mock.call_count, 2)
+
+    def test_with_other_active_language(self):
+        with self.settings(LANGUAGE_PREFERENCE_ORDER=["de", "fr"]):
+            AdUpdateEntryChoiceForm(used_languages=["de"])
+            with translation.override("ru"):
+                form = AdUpdateEntryChoiceForm(used_languages=["de"])
+                actual = list(form.fields["language"].choices)
+                expected = [
+                    ("de", f"{get_language_info('de')['name_local']} (создана)"),
+                    ("fr", f"{get_language_info('fr')['name_local']} (не создана)"),
+                ]
+        self.assertEqual(actual, expected)
@@ -129,15 +129,24 @@ class AdGetAbsoluteURLTest(SaleAdsTestMixin, TestCase):
 
 
 class AdOrderedImagesTest(SaleAdsTestMixin, TestCase):
-    def test(self):
-        ad = self.create_ad_factory().create()
-        image_factory = self.create_ad_image_factory(ad=ad)
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.ad = cls.create_ad_factory().create()
+        image_factory = cls.create_ad_image_factory(ad=cls.ad)
         image_3, image_4, image_1, image_2 = AdImage.objects.bulk_create(
             image_factory.create(number=number, save=False) for number in [3, 4, 1, 2]
         )
-        self.assertEqual(
-            list(ad.ordered_images()), [image_1, image_2, image_3, image_4]
-        )
+        cls.expected = [image_1, image_2, image_3, image_4]
+
+    def test(self):
+        self.assertEqual(list(self.ad.ordered_images()), self.expected)
+
+    def test_prefetched_images(self):
+        ad = Ad.objects.prefetch_related("images").get(pk=self.ad.pk)
+        with self.assertNumQueries(0):
+            images = ad.ordered_images()
+        self.assertEqual(list(images), self.expected)
 
 
 # ==========================================================
@@ -1,8 +1,110 @@
-from django.test import SimpleTestCase
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
 
 from ads.models import AdEntry
 from common.tests import SaleAdsTestMixin
 
+###############################################################################
+# Integration tests
+
+
+# ==========================================================
+# Search vector
+
+
+class AdEntrySearchVectorTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.entry_factory = cls.create_ad_entry_factory()
+
+    def test_creation(self):
+        for language, language_name in settings.LANGUAGES:
+            with self.subTest(language):
+                entry = self.entry_factory.create(language=language)
+                self.assertSearchVectorUpToDate(entry)
+
+    def test_bulk_creation(self):
+        ad = self.create_ad_factory().create()
+        entry_factory = self.create_ad_entry_factory(not_create=["ad"])
+        (entry,) = AdEntry.objects.bulk_create(
+            [entry_factory.create(ad=ad, save=False)]
+        )
+        self.assertSearchVectorUpToDate(entry)
+
+    def test_update(self):
+        entry = self.entry_factory.create(name="old name", description="old text")
+        AdEntry.objects.filter(pk=entry.pk).update(name="new name")
+        self.assertSearchVectorUpToDate(entry)
+
+    def assertSearchVectorUpToDate(self, entry):
+        config = AdEntry.get_search_config(entry.language)
+        vector = SearchVector(
+            "name", config=config, weight=AdEntry.SEARCH_WEIGHTS["name"]
+        ) + SearchVector(
+            "description", config=config, weight=AdEntry.SEARCH_WEIGHTS["description"]
+        )
+        entries = AdEntry.objects.filter(pk=entry.pk)
+        ((actual, expected),) = entries.annotate(expected=vector).values_list(
+            "search_vector", "expected"
+        )
+        self.assertEqual(actual, expected)
+
+
+class AdEntryCreateSearchQueryTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.entry = cls.create_ad_entry_factory().create(
+            language="en", name="Red bicycles", description="Hardly used"
+        )
+
+    def test_keywords_in_any_field(self):
+        self.assertMatches(["bicycle", "use"], ["name", "description"])
+
+    def test_keywords_in_single_field(self):
+        self.assertMatches(["bicycle"], ["name"])
+        self.assertNotMatches(["bicycle"], ["description"])
+
+    def test_all_keywords_required(self):
+        self.assertNotMatches(["bicycle", "car"], ["name", "description"])
+
+    def test_quotes_and_backslashes(self):
+        self.assertNotMatches(["red' | 'car", "\\\\'"], ["name", "description"])
+
+    def assertMatches(self, keywords, fields):
+        self.assertTrue(self.match(keywords, fields))
+
+    def assertNotMatches(self, keywords, fields):
+        self.assertFalse(self.match(keywords, fields))
+
+    def match(self, keywords, fields):
+        query = AdEntry.create_search_query(keywords, "en", fields)
+        return AdEntry.objects.filter(pk=self.entry.pk, search_vector=query).exists()
+
+
+# ==========================================================
+# Trigram indexes
+
+
+class AdEntryTrigramIndexesTest(SaleAdsTestMixin, TestCase):
+    def test(self):
+        for field, index in [
+            ("description", "ad_entry_description_trigram"),
+            ("name", "ad_entry_name_trigram"),
+        ]:
+            with self.subTest(field):
+                entries = AdEntry.objects.filter(
+                    **{f"{field}__trigram_icontains": "ab-12"}
+                )
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                    plan = entries.explain()
+                self.assertIn(index, plan)
+
+
 ###############################################################################
 # Unit tests
 
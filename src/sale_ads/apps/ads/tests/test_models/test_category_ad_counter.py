@@ -0,0 +1,159 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from ads.models import CategoryAdCounter
+from common.tests import SaleAdsTestMixin
+
+###############################################################################
+# Integration tests
+
+
+class CategoryAdCounterTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        cls.root = category_factory.create()
+        cls.child = category_factory.create(parent=cls.root)
+        cls.other_child = category_factory.create(parent=cls.root)
+        cls.grandchild = category_factory.create(parent=cls.child)
+
+    def setUp(self):
+        super().setUp()
+        self.ad = self.create_ad_factory().create(
+            category=self.grandchild, verified=True
+        )
+        self.entry = self.create_ad_entry_factory().create(ad=self.ad, language="en")
+
+    # ==========================================================
+    # Maintenance
+
+    def test_entry_creation(self):
+        self.assertCounts(
+            {
+                (self.grandchild, "en"): (1, 1),
+                (self.child, "en"): (0, 1),
+                (self.root, "en"): (0, 1),
+            }
+        )
+
+    def test_entry_in_other_language(self):
+        self.create_ad_entry_factory().create(ad=self.ad, language="ru")
+        self.assertCounts(
+            {
+                (self.grandchild, "en"): (1, 1),
+                (self.child, "en"): (0, 1),
+                (self.root, "en"): (0, 1),
+                (self.grandchild, "ru"): (1, 1),
+                (self.child, "ru"): (0, 1),
+                (self.root, "ru"): (0, 1),
+            }
+        )
+
+    def test_ads_in_different_categories(self):
+        ad = self.create_ad_factory().create(category=self.child, verified=True)
+        self.create_ad_entry_factory().create(ad=ad, language="en")
+        self.assertCounts(
+            {
+                (self.grandchild, "en"): (1, 1),
+                (self.child, "en"): (1, 2),
+                (self.root, "en"): (0, 2),
+            }
+        )
+
+    def test_entry_deletion(self):
+        self.entry.delete()
+        self.assertCounts({})
+
+    def test_ad_deletion(self):
+        self.ad.delete()
+        self.assertCounts({})
+
+    def test_ad_unverification(self):
+        self.ad.verified = False
+        self.ad.save(update_fields=["verified"])
+        self.assertCounts({})
+
+    def test_unverified_ad(self):
+        ad = self.create_ad_factory().create(category=self.child, verified=False)
+        self.create_ad_entry_factory().create(ad=ad, language="en")
+        self.test_entry_creation()
+
+    def test_ad_category_change(self):
+        self.ad.category = self.other_child
+        self.ad.save()
+        self.assertCounts({(self.other_child, "en"): (1, 1), (self.root, "en"): (0, 1)})
+
+    def test_category_parent_change(self):
+        self.grandchild.parent = self.other_child
+        self.grandchild.save()
+        self.assertCounts(
+            {
+                (self.grandchild, "en"): (1, 1),
+                (self.other_child, "en"): (0, 1),
+                (self.root, "en"): (0, 1),
+            }
+        )
+
+    def test_subtree_move(self):
+        self.child.parent = self.other_child
+        self.child.save()
+        self.assertCounts(
+            {
+                (self.grandchild, "en"): (1, 1),
+                (self.child, "en"): (0, 1),
+                (self.other_child, "en"): (0, 1),
+                (self.root, "en"): (0, 1),
+            }
+        )
+
+    def test_category_move_to_root(self):
+        self.grandchild.parent = None
+        self.grandchild.save()
+        self.assertCounts({(self.grandchild, "en"): (1, 1)})
+
+    def test_category_change_without_parent_change(self):
+        expected = self.get_counts()
+        manager_class = type(CategoryAdCounter.objects)
+        with (
+            patch.object(manager_class, "move") as move_mock,
+            patch.object(manager_class, "rebuild") as rebuild_mock,
+        ):
+            self.grandchild.name = "renamed"
+            self.grandchild.save()
+        move_mock.assert_not_called()
+        rebuild_mock.assert_not_called()
+        self.assertEqual(self.get_counts(), expected)
+
+    # ==========================================================
+    # Rebuilding
+
+    def test_rebuild(self):
+        ad = self.create_ad_factory().create(category=self.child, verified=True)
+        self.create_ad_entry_factory().create(ad=ad, language="ru")
+        expected = self.get_counts()
+        CategoryAdCounter.objects.all().delete()
+        CategoryAdCounter.objects.rebuild()
+        self.assertEqual(self.get_counts(), expected)
+
+    # ==========================================================
+
+    def assertCounts(self, expected):
+        expected = {
+            (category.pk, language): counts
+            for (category, language), counts in expected.items()
+        }
+        self.assertEqual(self.get_counts(), expected)
+
+    @staticmethod
+    def get_counts():
+        counters = CategoryAdCounter.objects.exclude(subtree_count=0)
+        return {
+            (category_pk, language): (own_count, subtree_count)
+            for category_pk, language, own_count, subtree_count in (
+                counters.values_list(
+                    "category", "language", "own_count", "subtree_count"
+                )
+            )
+        }
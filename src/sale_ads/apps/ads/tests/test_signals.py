@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from ads.cache import ad_data_version
+from common.tests import SaleAdsTestMixin
+
+
+class AdDataVersionBumpingTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.ad = cls.create_ad_factory().create()
+        cls.entry = cls.create_ad_entry_factory().create(ad=cls.ad)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_ad_creation(self):
+        self._test(lambda: self.create_ad_factory().create())
+
+    def test_ad_update(self):
+        self.ad.verified = not self.ad.verified
+        self._test(lambda: self.ad.save(update_fields=["verified"]))
+
+    def test_ad_deletion(self):
+        self._test(self.ad.delete)
+
+    def test_entry_creation(self):
+        self._test(lambda: self.create_ad_entry_factory().create())
+
+    def test_entry_deletion(self):
+        self._test(self.entry.delete)
+
+    def test_category_creation(self):
+        self._test(lambda: self.create_category_factory().create())
+
+    def test_category_update(self):
+        category = self.ad.category
+        category.name = self.create_category_name_factory().get_unique()
+        self._test(category.save)
+
+    def test_not_bumped_before_commit(self):
+        old_value = ad_data_version.get()
+        with self.captureOnCommitCallbacks():
+            self.create_ad_factory().create()
+            self.assertEqual(ad_data_version.get(), old_value)
+
+    def test_non_ad_data_change(self):
+        old_value = ad_data_version.get()
+        self.create_user_factory().create()
+        self.assertEqual(ad_data_version.get(), old_value)
+
+    def _test(self, change):
+        old_value = ad_data_version.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertNotEqual(ad_data_version.get(), old_value)
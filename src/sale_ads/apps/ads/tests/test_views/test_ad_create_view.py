@@ -1,12 +1,14 @@
 from collections import Counter
 from http import HTTPStatus
 from types import MappingProxyType
+from unittest.mock import patch
 
 from django.conf import settings
+from django.db import DatabaseError
 from django.test import TestCase
 
 from ads.forms import AdImageCreateFormSet
-from ads.models import Ad, AdEntry, AdImage
+from ads.models import Ad, AdEntry, AdImage, _CategoryAdCounterQuerySet
 from ads.views import _AdCreateView
 from categories.models import Category
 from common.tests import SaleAdsTestMixin
@@ -172,6 +174,16 @@ class AdCreateViewPostTest(AdCreateViewTextMixin, ImageTestMixin, TestCase):
         self.post(data=data, default_for_required=True, expected_status=HTTPStatus.OK)
         self.assertFalse(Ad.objects.exists())
 
+    def test_ad_with_failed_category_ad_counter_refresh(self):
+        with (
+            patch.object(
+                _CategoryAdCounterQuerySet, "refresh", side_effect=DatabaseError
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            self.post(default_for_required=True, expected_status=HTTPStatus.FOUND)
+        self.assertFalse(Ad.objects.exists())
+
     def test_ad_without_field_values(self):
         self.post(
             default_for_required=True,
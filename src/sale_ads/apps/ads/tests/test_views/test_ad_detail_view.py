@@ -15,6 +15,7 @@ from common.tests import (
 from common.tests.utils.composite_languages_setting_test_mixin import (
     CompositeLanguagesSettingTestMixin,
 )
+from common.tests.utils.temp_media_root_test_mixin import TempMediaRootTestMixin
 from common.tests.utils.view_test_mixin import ViewTestMixin
 
 
@@ -116,3 +117,49 @@ class AdDetailViewGetTest(
 
     def get_url_pattern_kwargs(self):
         return {"pk": self.ad.pk}
+
+
+class AdDetailViewQueryCountTest(
+    SaleAdsTestMixin, TempMediaRootTestMixin, ViewTestMixin, TestCase
+):
+    """Test that the number of queries doesn't depend on the ad."""
+
+    url_pattern_name = "ads_detail"
+
+    def test(self):
+        for category_depth, image_count in [(1, 0), (1, 1), (5, Ad.MAX_IMAGES)]:
+            with self.subTest(category_depth=category_depth, image_count=image_count):
+                self.ad = self.create_ad(category_depth, image_count)
+                with self.assertNumQueries(4):
+                    self.get(expected_status=HTTPStatus.OK)
+
+    def test_category_full_name(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ad = self.create_ad(3, 0)
+        for snapshot in [False, True]:
+            with (
+                self.subTest(snapshot=snapshot),
+                self.settings(CATEGORIES_SNAPSHOT=snapshot),
+            ):
+                response = self.get(expected_status=HTTPStatus.OK)
+                self.assertEqual(
+                    response.context["object"].category.full_name,
+                    self.ad.category.full_name,
+                )
+
+    def create_ad(self, category_depth, image_count):
+        category_factory = self.create_category_factory()
+        category = None
+        for i in range(category_depth):
+            category = category_factory.create(
+                parent=category, ultimate=i == category_depth - 1
+            )
+        ad = self.create_ad_factory(not_create=["category"]).create(category=category)
+        self.create_ad_entry_factory(ad=ad).create(language=get_language())
+        image_factory = self.create_ad_image_factory(ad=ad)
+        for number in range(1, image_count + 1):
+            image_factory.create(number=number)
+        return ad
+
+    def get_url_pattern_kwargs(self):
+        return {"pk": self.ad.pk}
@@ -1,8 +1,13 @@
 from http import HTTPStatus
+from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db import DatabaseError
 from django.test import TestCase
 from django.urls import reverse
 
+from ads.cache import ad_data_version
+from ads.models import _CategoryAdCounterQuerySet
 from common.tests import SaleAdsTestMixin
 from common.tests.utils.composite_languages_setting_test_mixin import (
     CompositeLanguagesSettingTestMixin,
@@ -271,6 +276,32 @@ class AdEntryCreateOrUpdateViewPostTestMixin(AdEntryCreateOrUpdateViewTestMixin)
         self.ad.refresh_from_db(fields=["verified"])
         self.assertTrue(self.ad.verified)
 
+    def test_ad_verified_with_failed_category_ad_counter_refresh(self):
+        self.ad.verified = True
+        self.ad.save(update_fields=["verified"])
+        data = self.get_success_field_values()
+        with (
+            patch.object(
+                _CategoryAdCounterQuerySet, "refresh", side_effect=DatabaseError
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            self.post(data=data, expected_status=HTTPStatus.FOUND)
+        self.ad.refresh_from_db(fields=["verified"])
+        self.assertTrue(self.ad.verified)
+
+    # ==========================================================
+    # Cached data
+
+    def test_ad_data_version_bumped_after_commit(self):
+        cache.clear()
+        old_value = ad_data_version.get()
+        data = self.get_success_field_values()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post(data=data, expected_status=HTTPStatus.FOUND)
+            self.assertEqual(ad_data_version.get(), old_value)
+        self.assertNotEqual(ad_data_version.get(), old_value)
+
     # ==========================================================
     # Redirections
 
@@ -105,6 +105,16 @@ class AdImagesUpdateViewGeneralTest(AdImagesUpdateViewTestMixin, TestCase):
         response = self.get(expected_status=HTTPStatus.OK)
         self._test_context_addition_formset(response, 0)
 
+    # --------------------------------------
+    # Ordered images
+
+    def test_context_ordered_images(self):
+        image_1, image_2 = self.create_initial_images(2)
+        image_1.number, image_2.number = image_2.number, image_1.number
+        AdImage.objects.bulk_update([image_1, image_2], ["number"])
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertEqual(response.context["ordered_images"], [image_2, image_1])
+
 
 class AdImagesUpdateViewGetTest(AdImagesUpdateViewTestMixin, TestCase):
     # ==========================================================
@@ -302,6 +312,20 @@ class AdImagesUpdateViewPostAddTest(AdImagesUpdateViewTestMixin, TestCase):
         for form in formset:
             self.assertEqual(form.errors, {})
 
+    # --------------------------------------
+    # Ordered images
+
+    def test_context_ordered_images(self):
+        (initial_image,) = self.create_initial_images(1)
+        data = {self.get_field(0): self.get_test_image().open()}
+        response = self.post(
+            data=data, form_count=Ad.MAX_IMAGES - 1, expected_status=HTTPStatus.OK
+        )
+        added_image = AdImage.objects.exclude(pk=initial_image.pk).get()
+        self.assertEqual(
+            response.context["ordered_images"], [initial_image, added_image]
+        )
+
     # ==========================================================
 
     def get_field(self, form_index):
@@ -415,6 +439,18 @@ class AdImagesUpdateViewPostDeleteTest(AdImagesUpdateViewTestMixin, TestCase):
         )
         self._test_context_addition_formset(response, Ad.MAX_IMAGES - 1)
 
+    # --------------------------------------
+    # Ordered images
+
+    def test_context_ordered_images(self):
+        deleted, remaining = self.create_initial_images(2)
+        response = self.post(
+            data={"number": deleted.number}, expected_status=HTTPStatus.OK
+        )
+        (image,) = response.context["ordered_images"]
+        self.assertEqual(image, remaining)
+        self.assertEqual(image.number, 1)
+
     # ==========================================================
 
     def post(self, url=None, data=None, *args, **kwargs):
@@ -575,3 +611,15 @@ class AdImagesUpdateViewPostReorderTest(AdImagesUpdateViewTestMixin, TestCase):
             data = {}
         data["direction"] = "down"
         return self.post(url, data, *args, **kwargs)
+
+
+class AdImagesUpdateViewQueryCountTest(AdImagesUpdateViewTestMixin, TestCase):
+    """Test that the number of queries doesn't depend on the images."""
+
+    def test(self):
+        for image_count in [0, 1, Ad.MAX_IMAGES]:
+            with self.subTest(image_count=image_count):
+                AdImage.objects.filter(ad=self.ad).delete()
+                self.create_initial_images(image_count)
+                with self.assertNumQueries(6):
+                    self.get(expected_status=HTTPStatus.OK)
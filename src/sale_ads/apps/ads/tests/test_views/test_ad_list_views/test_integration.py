@@ -1,10 +1,22 @@
+import itertools
+import time
+from collections import Counter
 from http import HTTPStatus
 from unittest.mock import Mock, patch
 from urllib.parse import parse_qs, urlsplit
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.template.loader import get_template
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from django.utils.translation import get_language
 
 from ads.forms import AdQueryForm
 from ads.models import Ad, AdEntry
@@ -13,8 +25,11 @@ from ads.tests.test_views.test_ad_list_views.mixins import (
     BaseAdListViewTestMixin,
     UserAdListViewTestMixin,
 )
+from ads.views import _BaseAdListView
 from categories.models import Category
 from common.tests.utils.http_request_query_comparison import HTTPRequestQueryTestMixin
+from common.tests.utils.temp_media_root_test_mixin import TempMediaRootTestMixin
+from frontend.templatetags.htmlforms import _CustomHTMLFormsLib
 
 ###############################################################################
 # General
@@ -36,6 +51,53 @@ class BaseAdListViewGeneralTestMixin(
         response = self.get(expected_status=HTTPStatus.OK)
         self.assertTemplateUsed(response, self.template_name)
 
+    def test_template_with_category_picker(self):
+        category_factory = self.create_category_factory()
+        selected, other = [category_factory.create() for i in range(2)]
+        query = {AdQueryForm.URL_PARAMETERS["categories"]: selected.pk}
+        url = self.get_url(query=query)
+        with override_settings(ADS_CATEGORY_PICKER=True):
+            response = self.get(url, expected_status=HTTPStatus.OK)
+            choices = response.context["query_form"].fields["categories"].choices
+            self.assertEqual(list(choices), [(selected.pk, selected.full_name)])
+        self.assertContains(response, reverse("ads_category_search"))
+
+    def test_query_form_with_compiled_elements(self):
+        category_factory = self.create_category_factory()
+        category = category_factory.create()
+        parameters = AdQueryForm.URL_PARAMETERS
+        query = {parameters["categories"]: category.pk, parameters["min_price"]: "x"}
+        template = get_template("ads/lists/_base/_query_form.html")
+        context = self._get_query_form_template_context(query)
+        with patch.object(_CustomHTMLFormsLib, "compile_elements", False):
+            expected = template.render(context)
+        for i in range(2):
+            self.assertEqual(template.render(context), expected)
+
+    def test_query_form_with_cached_choices_and_other_chosen_choices(self):
+        category_factory = self.create_category_factory()
+        categories = [category_factory.create() for i in range(3)]
+        parameters = AdQueryForm.URL_PARAMETERS
+        template = get_template("ads/lists/_base/_query_form.html")
+        for chosen in [categories[:1], categories[1:]]:
+            query = {
+                parameters["categories"]: [category.pk for category in chosen],
+                parameters["languages"]: settings.LANGUAGE_PREFERENCE_ORDER[-1],
+                parameters["order"]: len(chosen),
+            }
+            context = self._get_query_form_template_context(query)
+            with patch.object(_CustomHTMLFormsLib, "compile_elements", False):
+                expected = template.render(context)
+            self.assertEqual(template.render(context), expected)
+
+    def _get_query_form_template_context(self, query):
+        url = self.get_url(query=query)
+        response = self.get(url, expected_status=HTTPStatus.OK)
+        return {
+            "query_form": response.context["query_form"],
+            "request": response.wsgi_request,
+        }
+
     # ==========================================================
     # Context
 
@@ -162,6 +224,116 @@ class UserAdListViewContextAdCountTest(
     pass
 
 
+class BaseAdListViewAdCountQueryTestMixin(BaseAdListViewTestMixin):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.ad_factory = cls.create_ad_factory()
+        cls.entry_factory = cls.create_ad_entry_factory(not_create=["ad"])
+        cls.price_factory = cls.create_ad_price_factory()
+        cls.low_price = cls.price_factory.get_unique()
+        cls.high_price = cls.low_price + 1
+        cls.price_factory.check(cls.high_price)
+        ads = Ad.objects.bulk_create(
+            cls.ad_factory.create(price=price, save=False)
+            for price in [cls.low_price, cls.high_price, cls.high_price]
+        )
+        AdEntry.objects.bulk_create(
+            cls.entry_factory.create(ad=ad, save=False) for ad in ads
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_ads_are_counted_once(self):
+        response, count_queries = self.get_counting()
+        self.assertEqual(count_queries, 1)
+        self.assertEqual(response.context["ad_count"], 3)
+        self.assertEqual(response.context["paginator"].count, 3)
+
+    @override_settings(ADS_AD_COUNT_CACHING=False)
+    def test_without_caching(self):
+        self.get_counting()
+        response, count_queries = self.get_counting()
+        self.assertEqual(count_queries, 1)
+
+    @override_settings(ADS_AD_COUNT_CACHING=True)
+    def test_caching(self):
+        self.get_counting()
+        response, count_queries = self.get_counting()
+        self.assertEqual(count_queries, 0)
+        self.assertEqual(response.context["ad_count"], 3)
+        self.assertEqual(response.context["paginator"].count, 3)
+
+    @override_settings(ADS_AD_COUNT_CACHING=True)
+    def test_caching_ignores_order_and_page_size(self):
+        self.get_counting()
+        query = {
+            AdQueryForm.URL_PARAMETERS["order"]: AdQueryForm.Order.LOWEST_PRICE_FIRST,
+            AdQueryForm.URL_PARAMETERS["page_size"]: self.get_page_size(),
+        }
+        response, count_queries = self.get_counting(query)
+        self.assertEqual(count_queries, 0)
+
+    @override_settings(ADS_AD_COUNT_CACHING=True)
+    def test_caching_with_other_filters(self):
+        self.get_counting()
+        query = {AdQueryForm.URL_PARAMETERS["max_price"]: self.low_price}
+        response, count_queries = self.get_counting(query)
+        self.assertEqual(count_queries, 1)
+        self.assertEqual(response.context["ad_count"], 1)
+
+    @override_settings(ADS_AD_COUNT_CACHING=True)
+    def test_caching_with_ad_creation(self):
+        self.get_counting()
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = self.ad_factory.create()
+            self.entry_factory.create(ad=ad)
+        response, count_queries = self.get_counting()
+        self.assertEqual(count_queries, 1)
+        self.assertEqual(response.context["ad_count"], 4)
+
+    @override_settings(ADS_AD_COUNT_CACHING=True)
+    def test_caching_with_verification_change(self):
+        self.get_counting()
+        ad = Ad.objects.first()
+        ad.verified = False
+        with self.captureOnCommitCallbacks(execute=True):
+            ad.save(update_fields=["verified"])
+        response, count_queries = self.get_counting()
+        self.assertEqual(count_queries, 1)
+        self.assertEqual(response.context["ad_count"], 2)
+
+    def get_counting(self, query=None):
+        url = self.get_url(query=query)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(url, expected_status=HTTPStatus.OK)
+        count_queries = [
+            query for query in queries.captured_queries if "COUNT(*)" in query["sql"]
+        ]
+        return response, len(count_queries)
+
+
+class AdListViewAdCountQueryTest(
+    AdListViewTestMixin, BaseAdListViewAdCountQueryTestMixin, TestCase
+):
+    pass
+
+
+class UserAdListViewAdCountQueryTest(
+    UserAdListViewTestMixin, BaseAdListViewAdCountQueryTestMixin, TestCase
+):
+    @override_settings(ADS_AD_COUNT_CACHING=True)
+    def test_caching_with_author(self):
+        self.get_counting()
+        self.client.force_login(self.author)
+        Ad.objects.filter(author=self.author).update(verified=False)
+        response, count_queries = self.get_counting()
+        self.assertEqual(count_queries, 1)
+        self.assertEqual(response.context["ad_count"], 3)
+
+
 # --------------------------------------
 # Category tree
 
@@ -338,6 +510,45 @@ class BaseAdListViewContextCategoryTreeTestMixin(BaseAdListViewTestMixin):
         ):
             self.assertEqual(result_node.ad_count, return_values[category.pk])
 
+    def test_ad_count_with_rollup(self):
+        root = self.category_factory.create()
+        branch = self.category_factory.create(parent=root)
+        leaf = self.category_factory.create(parent=branch)
+        empty_root = self.category_factory.create()
+        ad_factory = self.create_ad_factory(not_create=["category"])
+        entry_factory = self.create_ad_entry_factory(not_create=["ad"])
+        for category, price in [(root, 1), (branch, 1), (leaf, 1), (leaf, 3)]:
+            ad = ad_factory.create(category=category, price=price)
+            entry_factory.create(ad=ad)
+        for url_parameters in [{}, {AdQueryForm.URL_PARAMETERS["max_price"]: 2}]:
+            with self.subTest(url_parameters=url_parameters):
+                url = self.get_url(query=url_parameters)
+                with override_settings(ADS_CATEGORY_AD_COUNT_ROLLUP=False):
+                    response = self.get(url, expected_status=HTTPStatus.OK)
+                expected = self._get_node_ad_counts(response.context["category_tree"])
+                with (
+                    override_settings(ADS_CATEGORY_AD_COUNT_ROLLUP=True),
+                    CaptureQueriesContext(connection) as queries,
+                ):
+                    response = self.get(url, expected_status=HTTPStatus.OK)
+                actual = self._get_node_ad_counts(response.context["category_tree"])
+                self.assertEqual(actual, expected)
+                self.assertGreater(actual[root.name], actual[leaf.name])
+                self.assertEqual(actual[empty_root.name], 0)
+                self.assertTrue(
+                    any(
+                        "WITH RECURSIVE" in query["sql"]
+                        for query in queries.captured_queries
+                    )
+                )
+
+    def _get_node_ad_counts(self, nodes):
+        counts = {}
+        for node in nodes:
+            counts[node.name] = node.ad_count
+            counts.update(self._get_node_ad_counts(node.children))
+        return counts
+
     def create_category(self, *args, name=None, **kwargs):
         if not name:
             name = self.category_name_factory.get_unique()
@@ -358,7 +569,43 @@ class BaseAdListViewContextCategoryTreeTestMixin(BaseAdListViewTestMixin):
 class AdListViewContextCategoryTreeTest(
     AdListViewTestMixin, BaseAdListViewContextCategoryTreeTestMixin, TestCase
 ):
-    pass
+    @override_settings(ADS_CATEGORY_AD_COUNTERS=True)
+    def test_ad_count_with_category_ad_counters(self):
+        self._test_ad_count_with_category_ad_counters({}, 1, aggregated=False)
+
+    @override_settings(ADS_CATEGORY_AD_COUNTERS=True)
+    def test_ad_count_with_category_ad_counters_and_search(self):
+        url_parameters = {AdQueryForm.URL_PARAMETERS["search"]: "unmatched"}
+        self._test_ad_count_with_category_ad_counters(
+            url_parameters, 0, aggregated=True
+        )
+
+    @override_settings(ADS_CATEGORY_AD_COUNTERS=False)
+    def test_ad_count_without_category_ad_counters(self):
+        self._test_ad_count_with_category_ad_counters({}, 1, aggregated=True)
+
+    def _test_ad_count_with_category_ad_counters(
+        self, url_parameters, expected, aggregated
+    ):
+        root = self.category_factory.create()
+        category = self.category_factory.create(parent=root)
+        ad = self.create_ad_factory(not_create=["category"]).create(category=category)
+        self.create_ad_entry_factory(not_create=["ad"]).create(
+            ad=ad, language=get_language(), name="name", description="description"
+        )
+        url = self.get_url(query=url_parameters)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(url, expected_status=HTTPStatus.OK)
+        (result_root_node,) = response.context["category_tree"]
+        (result_node,) = result_root_node.children
+        self.assertEqual(result_root_node.ad_count, expected)
+        self.assertEqual(result_node.ad_count, expected)
+        category_ad_count_queries = [
+            query
+            for query in queries.captured_queries
+            if 'GROUP BY "ads_ad"."category_id"' in query["sql"]
+        ]
+        self.assertEqual(bool(category_ad_count_queries), aggregated)
 
 
 class UserAdListViewContextCategoryTreeTest(
@@ -367,6 +614,232 @@ class UserAdListViewContextCategoryTreeTest(
     pass
 
 
+class BaseAdListViewCategoryTreeCachingTestMixin(BaseAdListViewTestMixin):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_CATEGORY_TREE_CACHING=True))
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = cls.create_category_factory().create(ultimate=True)
+        cls.ad_factory = cls.create_ad_factory(category=cls.category)
+        cls.entry_factory = cls.create_ad_entry_factory(not_create=["ad"])
+        cls.price = cls.create_ad_price_factory().get_unique()
+        ad = cls.ad_factory.create(price=cls.price)
+        cls.entry_factory.create(ad=ad, language=get_language())
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @override_settings(ADS_CATEGORY_TREE_CACHING=False)
+    def test_without_caching(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertIn("category_tree", response.context)
+        self.assertNotIn("category_tree_html", response.context)
+
+    def test_caching(self):
+        expected_html = self.get_category_tree_html()
+        self.assertIn(f"{self.category.name}&nbsp;(1)", expected_html)
+        with (
+            patch.object(self.cls, "_get_context_category_tree") as mock,
+            CaptureQueriesContext(connection) as queries,
+        ):
+            response = self.get(expected_status=HTTPStatus.OK)
+        mock.assert_not_called()
+        category_ad_count_queries = [
+            query
+            for query in queries.captured_queries
+            if 'GROUP BY "ads_ad"."category_id"' in query["sql"]
+        ]
+        self.assertFalse(category_ad_count_queries)
+        self.assertEqual(response.context["category_tree_html"], expected_html)
+        self.assertContains(response, expected_html, html=True)
+
+    def test_caching_ignores_categories_and_page(self):
+        self.get_category_tree_html()
+        query = {
+            AdQueryForm.URL_PARAMETERS["categories"]: self.category.pk,
+            self.cls.page_kwarg: 1,
+        }
+        with patch.object(self.cls, "_get_context_category_tree") as mock:
+            self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        mock.assert_not_called()
+
+    def test_caching_with_other_filters(self):
+        self.get_category_tree_html()
+        query = {AdQueryForm.URL_PARAMETERS["min_price"]: self.price + 1}
+        html = self.get_category_tree_html(query)
+        self.assertIn(f"{self.category.name}&nbsp;(0)", html)
+
+    def test_caching_with_other_language(self):
+        self.get_category_tree_html()
+        languages = self.create_ad_entry_language_factory().get_choices()
+        other_language = next(
+            language for language in languages if language != get_language()
+        )
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = other_language
+        html = self.get_category_tree_html()
+        self.assertIn(f"{self.category.name}&nbsp;(0)", html)
+
+    def test_caching_with_ad_creation(self):
+        self.get_category_tree_html()
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = self.ad_factory.create(price=self.price)
+            self.entry_factory.create(ad=ad, language=get_language())
+        html = self.get_category_tree_html()
+        self.assertIn(f"{self.category.name}&nbsp;(2)", html)
+
+    def test_caching_with_category_renaming(self):
+        self.get_category_tree_html()
+        self.category.name = self.create_category_name_factory().get_unique()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        html = self.get_category_tree_html()
+        self.assertIn(f"{self.category.name}&nbsp;(1)", html)
+
+    def get_category_tree_html(self, query=None):
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        return response.context["category_tree_html"]
+
+
+class AdListViewCategoryTreeCachingTest(
+    AdListViewTestMixin, BaseAdListViewCategoryTreeCachingTestMixin, TestCase
+):
+    pass
+
+
+class UserAdListViewCategoryTreeCachingTest(
+    UserAdListViewTestMixin, BaseAdListViewCategoryTreeCachingTestMixin, TestCase
+):
+    def test_caching_with_author(self):
+        self.get_category_tree_html()
+        Ad.objects.filter(author=self.author).update(verified=False)
+        self.client.force_login(self.author)
+        html = self.get_category_tree_html()
+        self.assertIn(f"{self.category.name}&nbsp;(1)", html)
+
+
+class BaseAdListViewLazyCategoryTreeTestMixin(BaseAdListViewTestMixin):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_LAZY_CATEGORY_TREE=True))
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        cls.root = category_factory.create()
+        cls.child = category_factory.create(parent=cls.root)
+        cls.grandchild = category_factory.create(parent=cls.child)
+        cls.leaf_root = category_factory.create()
+        cls.price = cls.create_ad_price_factory().get_unique()
+        ad = cls.create_ad_factory(not_create=["category"]).create(
+            category=cls.grandchild, price=cls.price
+        )
+        cls.create_ad_entry_factory(not_create=["ad"]).create(
+            ad=ad, language=get_language()
+        )
+
+    @override_settings(ADS_LAZY_CATEGORY_TREE=False)
+    def test_without_lazy_tree(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        result_root_node = self.get_sibling_node(
+            response.context["category_tree"], self.root
+        )
+        (result_child_node,) = result_root_node.children
+        self.assertEqual(len(result_child_node.children), 1)
+        self.assertIsNone(result_root_node.children_url)
+
+    def test_roots(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        result_category_tree = response.context["category_tree"]
+        result_root_node = self.get_sibling_node(result_category_tree, self.root)
+        self.assertEqual(result_root_node.children, [])
+        self.assertFalse(result_root_node.expanded)
+        self.assertEqual(result_root_node.ad_count, 1)
+        self.assertChildrenURL(result_root_node.children_url, self.root)
+        result_leaf_root_node = self.get_sibling_node(
+            result_category_tree, self.leaf_root
+        )
+        self.assertIsNone(result_leaf_root_node.children_url)
+        self.assertContains(response, "category_tree.js")
+
+    def test_selected_category_path_expanded(self):
+        query = {AdQueryForm.URL_PARAMETERS["categories"]: self.child.pk}
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        result_root_node = self.get_sibling_node(
+            response.context["category_tree"], self.root
+        )
+        self.assertTrue(result_root_node.expanded)
+        (result_child_node,) = result_root_node.children
+        self.assertTrue(result_child_node.expanded)
+        self.assertEqual(result_child_node.ad_count, 1)
+        (result_grandchild_node,) = result_child_node.children
+        self.assertFalse(result_grandchild_node.expanded)
+        self.assertEqual(result_grandchild_node.ad_count, 1)
+        self.assertIsNone(result_grandchild_node.children_url)
+
+    def test_children(self):
+        query = {self.cls.category_tree_node_kwarg: self.root.pk}
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        (result_child_node,) = response.context["siblings"]
+        self.assertEqual(result_child_node.name, self.child.name)
+        self.assertEqual(result_child_node.ad_count, 1)
+        self.assertEqual(result_child_node.children, [])
+        self.assertChildrenURL(result_child_node.children_url, self.child)
+        self.assertContains(response, f"{self.child.name}&nbsp;(1)")
+        self.assertNotContains(response, "<html")
+
+    def test_children_with_other_filters(self):
+        query = {
+            self.cls.category_tree_node_kwarg: self.root.pk,
+            AdQueryForm.URL_PARAMETERS["min_price"]: self.price + 1,
+        }
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        (result_child_node,) = response.context["siblings"]
+        self.assertEqual(result_child_node.ad_count, 0)
+        self.assertIn(
+            f"{AdQueryForm.URL_PARAMETERS['min_price']}={self.price + 1}",
+            result_child_node.children_url,
+        )
+
+    def test_children_of_invalid_category(self):
+        nonexistent_pk = Category.objects.order_by("pk").last().pk + 1
+        for value in ["invalid", nonexistent_pk]:
+            with self.subTest(value=value):
+                query = {self.cls.category_tree_node_kwarg: value}
+                url = self.get_url(query=query)
+                self.get(url, expected_status=HTTPStatus.NOT_FOUND)
+
+    def assertChildrenURL(self, url, category):
+        url = urlsplit(url)
+        self.assertEqual(url.path, self.get_url())
+        query = parse_qs(url.query)
+        self.assertEqual(query[self.cls.category_tree_node_kwarg], [str(category.pk)])
+        self.assertNotIn(AdQueryForm.URL_PARAMETERS["categories"], query)
+        self.assertNotIn(self.cls.page_kwarg, query)
+
+    def get_sibling_node(self, nodes, category):
+        (node,) = filter(lambda node: node.name == category.name, nodes)
+        return node
+
+
+class AdListViewLazyCategoryTreeTest(
+    AdListViewTestMixin, BaseAdListViewLazyCategoryTreeTestMixin, TestCase
+):
+    pass
+
+
+class UserAdListViewLazyCategoryTreeTest(
+    UserAdListViewTestMixin, BaseAdListViewLazyCategoryTreeTestMixin, TestCase
+):
+    pass
+
+
 # --------------------------------------
 # Query form
 
@@ -1206,6 +1679,123 @@ class UserAdListViewSearchFiltrationTest(
     pass
 
 
+class AdListViewFullTextSearchFiltrationTest(AdListViewSearchFiltrationTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_SEARCH_MODE="full_text"))
+
+
+class UserAdListViewFullTextSearchFiltrationTest(UserAdListViewSearchFiltrationTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_SEARCH_MODE="full_text"))
+
+
+class AdListViewTrigramSearchFiltrationTest(AdListViewSearchFiltrationTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_SEARCH_MODE="trigram"))
+
+
+class UserAdListViewTrigramSearchFiltrationTest(UserAdListViewSearchFiltrationTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_SEARCH_MODE="trigram"))
+
+
+class BaseAdListViewFullTextSearchTestMixin(BaseAdListViewTestMixin):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_SEARCH_MODE="full_text"))
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.ad_factory = cls.create_ad_factory()
+        cls.entry_factory = cls.create_ad_entry_factory(not_create=["ad"])
+
+    def test_stemming(self):
+        ad = self.create_ad_with_entry("en", "Running shoes", "Barely used")
+        self._test_filtration(self.get_url_parameters("run shoe", "en"), [ad])
+
+    def test_stemming_in_russian(self):
+        ad = self.create_ad_with_entry("ru", "Беговые кроссовки", "Почти новые")
+        self._test_filtration(self.get_url_parameters("кроссовка", "ru"), [ad])
+
+    def test_special_characters(self):
+        ad = self.create_ad_with_entry(get_language(), "it's a \\ test", "")
+        self._test_filtration(self.get_url_parameters("it's \\ test"), [ad])
+
+    def test_relevance_order(self):
+        language = get_language()
+        ad_matching_description = self.create_ad_with_entry(language, "", "spam")
+        ad_matching_name = self.create_ad_with_entry(language, "spam", "")
+        ad_matching_both = self.create_ad_with_entry(language, "spam", "spam")
+        self.create_ad_with_entry(language, "eggs", "eggs")
+        self._test_ordering(
+            AdQueryForm.Order.RELEVANCE,
+            [ad_matching_both, ad_matching_name, ad_matching_description],
+            self.get_url_parameters("spam"),
+        )
+
+    def test_relevance_order_without_search(self):
+        language = get_language()
+        ads = [self.create_ad_with_entry(language, "spam", "") for i in range(3)]
+        ads.sort(key=lambda ad: ad.created, reverse=True)
+        self._test_ordering(AdQueryForm.Order.RELEVANCE, ads)
+
+    def test_relevance_order_with_keyset_pagination(self):
+        language = get_language()
+        ads = []
+        for i in range(1, 13):
+            ads.append(self.create_ad_with_entry(language, "spam", "spam " * i))
+        url_parameters = self.get_url_parameters("spam") | {
+            AdQueryForm.URL_PARAMETERS["order"]: AdQueryForm.Order.RELEVANCE,
+            AdQueryForm.URL_PARAMETERS["page_size"]: 10,
+        }
+        with override_settings(ADS_KEYSET_PAGINATION=True):
+            response = self.get(
+                self.get_url(query=url_parameters), expected_status=HTTPStatus.OK
+            )
+            first_page = list(response.context["page_obj"])
+            url = response.context["other_page_url_template"].render({"number": 2})
+            self.assertIn(self.cls.cursor_kwarg, parse_qs(urlsplit(url).query))
+            response = self.get(url, expected_status=HTTPStatus.OK)
+            second_page = list(response.context["page_obj"])
+        self.assertEqual(first_page + second_page, ads[::-1])
+
+    def create_ad_with_entry(self, language, name, description):
+        ad = self.ad_factory.create()
+        self.entry_factory.create(
+            ad=ad, language=language, name=name, description=description
+        )
+        return ad
+
+    @staticmethod
+    def get_url_parameters(search, language=None):
+        url_parameters = {AdQueryForm.URL_PARAMETERS["search"]: search}
+        if language is not None:
+            url_parameters[AdQueryForm.URL_PARAMETERS["languages"]] = language
+        return url_parameters
+
+
+class AdListViewFullTextSearchTest(
+    AdListViewTestMixin, BaseAdListViewFullTextSearchTestMixin, TestCase
+):
+    pass
+
+
+class UserAdListViewFullTextSearchTest(
+    UserAdListViewTestMixin, BaseAdListViewFullTextSearchTestMixin, TestCase
+):
+    pass
+
+
 # --------------------------------------
 # Combination
 
@@ -1259,6 +1849,170 @@ class UserAdListViewCombinedFiltrationTest(
     pass
 
 
+# --------------------------------------
+# All combinations of query form fields
+
+
+class BaseAdListViewQueryFormCombinationsTestMixin(BaseAdListViewTestMixin):
+    """
+    Test filtration with combinations of query form fields.
+
+    Compares the results with the results of reference querysets
+    filtering through joins of entries with deduplication.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        cls.root = category_factory.create()
+        cls.branch = category_factory.create(parent=cls.root)
+        cls.leaf_1 = category_factory.create(parent=cls.branch, ultimate=True)
+        cls.leaf_2 = category_factory.create(parent=cls.branch, ultimate=True)
+        cls.other = category_factory.create(ultimate=True)
+        cls.low_price = cls.get_min_price()
+        cls.high_price = cls.low_price + 1
+        entry_variants = [
+            [("en", "spam", "text")],
+            [("ru", "text", "spam and eggs")],
+            [("en", "eggs", "text"), ("ru", "spam", "text")],
+            [("en", "Spam eggs", "spam"), ("ru", "text", "eggs")],
+        ]
+        ad_factory = cls.create_ad_factory(not_create=["category"])
+        entry_factory = cls.create_ad_entry_factory(not_create=["ad"])
+        for category in [cls.leaf_1, cls.leaf_2, cls.other]:
+            for price in [cls.low_price, cls.high_price]:
+                for verified in [True, False]:
+                    for entries in entry_variants:
+                        ad = ad_factory.create(
+                            category=category, price=price, verified=verified
+                        )
+                        for language, name, description in entries:
+                            entry_factory.create(
+                                ad=ad,
+                                description=description,
+                                language=language,
+                                name=name,
+                            )
+
+    def test(self):
+        orders = list(AdQueryForm.Order)
+        combinations = itertools.product(
+            [[], [self.leaf_1], [self.branch], [self.leaf_1, self.other]],
+            [["en"], ["ru"], ["en", "ru"]],
+            [(None, None), (self.low_price, None), (None, self.low_price)],
+            [
+                (None, []),
+                *itertools.product(
+                    ["spam", "spam eggs"],
+                    [
+                        [AdQueryForm.SearchField.NAME],
+                        [AdQueryForm.SearchField.DESCRIPTION],
+                        [
+                            AdQueryForm.SearchField.NAME,
+                            AdQueryForm.SearchField.DESCRIPTION,
+                        ],
+                    ],
+                ),
+            ],
+        )
+        for index, combination in enumerate(combinations):
+            categories, languages, (min_price, max_price), (search, fields) = (
+                combination
+            )
+            order = orders[index % len(orders)]
+            with self.subTest(combination=combination, order=order):
+                self._test(
+                    categories, languages, min_price, max_price, search, fields, order
+                )
+
+    def _test(self, categories, languages, min_price, max_price, search, fields, order):
+        url_parameters = {
+            AdQueryForm.URL_PARAMETERS["categories"]: [
+                category.pk for category in categories
+            ],
+            AdQueryForm.URL_PARAMETERS["languages"]: languages,
+            AdQueryForm.URL_PARAMETERS["order"]: order,
+            AdQueryForm.URL_PARAMETERS["search_fields"]: fields,
+        }
+        for name, value in [
+            ("min_price", min_price),
+            ("max_price", max_price),
+            ("search", search),
+        ]:
+            if value is not None:
+                url_parameters[AdQueryForm.URL_PARAMETERS[name]] = value
+        request = RequestFactory().get(self.get_url(query=url_parameters))
+        request.user = AnonymousUser()
+        # Fresh view for each combination
+        vars(self).pop("view", None)
+        self.setup_view(request)
+        view = self.view
+
+        # Ads
+        reference_condition = self.get_reference_condition(
+            languages, min_price, max_price, search, fields
+        )
+        category_pks = set()
+        for category in categories:
+            category_pks.add(category.pk)
+            category_pks.update(category.pk for category in category.descendants)
+        expected_ads = Ad.objects.filter(reference_condition)
+        if categories:
+            expected_ads = expected_ads.filter(category__in=category_pks)
+        expected_ads = expected_ads.distinct().order_by(*view.get_ordering())
+        self.assertEqual(list(view.get_queryset()), list(expected_ads))
+
+        # Category ad counts
+        ad_categories = (
+            Ad.objects.filter(reference_condition)
+            .values_list("pk", "category")
+            .distinct()
+        )
+        own_counts = Counter(category_pk for pk, category_pk in ad_categories)
+        for category in Category.objects.all():
+            subtree = [category, *category.descendants]
+            expected_count = sum(own_counts[category.pk] for category in subtree)
+            self.assertEqual(view._get_category_ad_count(category.pk), expected_count)
+
+    def get_reference_condition(self, languages, min_price, max_price, search, fields):
+        condition = self.get_reference_view_condition()
+        language_condition = Q()
+        for language in languages:
+            language_condition |= Q(entries__language=language)
+        condition &= language_condition
+        if min_price is not None:
+            condition &= Q(price__gte=min_price)
+        if max_price is not None:
+            condition &= Q(price__lte=max_price)
+        if search:
+            entry_fields = {
+                AdQueryForm.SearchField.DESCRIPTION: "description",
+                AdQueryForm.SearchField.NAME: "name",
+            }
+            for keyword in search.split():
+                keyword_condition = Q()
+                for field in fields:
+                    lookup = f"entries__{entry_fields[field]}__icontains"
+                    keyword_condition |= Q(**{lookup: keyword})
+                condition &= keyword_condition
+        return condition
+
+
+class AdListViewQueryFormCombinationsTest(
+    AdListViewTestMixin, BaseAdListViewQueryFormCombinationsTestMixin, TestCase
+):
+    def get_reference_view_condition(self):
+        return Q(verified=True)
+
+
+class UserAdListViewQueryFormCombinationsTest(
+    UserAdListViewTestMixin, BaseAdListViewQueryFormCombinationsTestMixin, TestCase
+):
+    def get_reference_view_condition(self):
+        return Q(author=self.author, verified=True)
+
+
 # --------------------------------------
 # Verification
 
@@ -1550,6 +2304,103 @@ class UserAdListViewPriceOrderingTest(
     pass
 
 
+# ==========================================================
+# Indexes
+
+
+class BaseAdListViewIndexTestMixin(BaseAdListViewTestMixin):
+    _ORDER_INDEX_SUFFIXES = {
+        AdQueryForm.Order.HIGHEST_PRICE_FIRST: "price_desc",
+        AdQueryForm.Order.LOWEST_PRICE_FIRST: "price_asc",
+        AdQueryForm.Order.NEWEST_FIRST: "created_desc",
+        AdQueryForm.Order.OLDEST_FIRST: "created_asc",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = cls.create_category_factory().create(ultimate=True)
+
+    # Fields of the filtered columns preceding the ordering ones
+    _INDEX_LEADING_FIELDS = {
+        "ad_author": ["author"],
+        "ad_category": ["category"],
+        "ad_verified": [],
+    }
+
+    def test(self):
+        for order, suffix in self._ORDER_INDEX_SUFFIXES.items():
+            for categories in self.get_tested_categories():
+                with self.subTest(order=order, categories=categories):
+                    prefix = self.get_index_prefix(categories)
+                    self._test(order, categories, prefix, f"{prefix}_{suffix}")
+
+    def _test(self, order, categories, prefix, expected_index):
+        url_parameters = {
+            AdQueryForm.URL_PARAMETERS["categories"]: [
+                category.pk for category in categories
+            ],
+            AdQueryForm.URL_PARAMETERS["order"]: order,
+        }
+        request = RequestFactory().get(self.get_url(query=url_parameters))
+        request.user = AnonymousUser()
+        # Fresh view for each combination
+        vars(self).pop("view", None)
+        self.setup_view(request)
+        # The index serves the list if the ordering follows the filtered
+        # fields in the index, so the rows are read without sorting
+        (index,) = [index for index in Ad._meta.indexes if index.name == expected_index]
+        ordering = self._normalize_ordering(self.view.get_ordering())
+        self.assertEqual(index.fields, [*self._INDEX_LEADING_FIELDS[prefix], *ordering])
+
+    @staticmethod
+    def _normalize_ordering(ordering):
+        # Repeated fields don't change the order
+        normalized = []
+        names = set()
+        for field in ordering:
+            descending = field.startswith("-")
+            name = field.removeprefix("-")
+            if name == "pk":
+                name = Ad._meta.pk.name
+            if name not in names:
+                names.add(name)
+                normalized.append(f"-{name}" if descending else name)
+        return normalized
+
+    def get_tested_categories(self):
+        return [[]]
+
+
+class AdListViewIndexTest(AdListViewTestMixin, BaseAdListViewIndexTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        cls.branch_category = category_factory.create()
+        category_factory.create(parent=cls.branch_category, ultimate=True)
+
+    def get_tested_categories(self):
+        return [
+            *super().get_tested_categories(),
+            [self.category],
+            [self.branch_category],
+        ]
+
+    def get_index_prefix(self, categories):
+        # Subtrees are filtered through the closure table while the
+        # ads are read in the order of the index of all verified ads
+        return "ad_category" if categories == [self.category] else "ad_verified"
+
+
+class UserAdListViewIndexTest(
+    UserAdListViewTestMixin, BaseAdListViewIndexTestMixin, TestCase
+):
+    @staticmethod
+    def get_index_prefix(categories):
+        return "ad_author"
+
+
 # ==========================================================
 # Pagination
 
@@ -1652,6 +2503,181 @@ class UserAdListViewPaginationTest(
     pass
 
 
+# --------------------------------------
+# Keyset pagination
+
+
+class BaseAdListViewKeysetPaginationTestMixin(BaseAdListViewTestMixin):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_KEYSET_PAGINATION=True))
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        page_size_choices = cls.create_ad_query_form().fields["page_size"].choices
+        page_sizes = list(zip(*page_size_choices))[0]
+        cls.page_size = min(page_sizes)
+        cls.page_count = cls.cls._ONE_SIDE_NEIGHBORING_PAGES * 2 + 2
+        ad_factory = cls.create_ad_factory()
+        price_factory = cls.create_ad_price_factory()
+        prices = [price_factory.get_unique() for i in range(3)]
+        ads = Ad.objects.bulk_create(
+            ad_factory.create(price=prices[i % len(prices)], save=False)
+            for i in range(cls.page_size * (cls.page_count - 1) + 1)
+        )
+        entry_factory = cls.create_ad_entry_factory(not_create=["ad"])
+        AdEntry.objects.bulk_create(
+            entry_factory.create(ad=ad, save=False) for ad in ads
+        )
+
+    def test_forward(self):
+        for order in AdQueryForm.Order:
+            with self.subTest(order=order):
+                self.assert_forward_pages(order)
+
+    def test_backward(self):
+        for order in AdQueryForm.Order:
+            with self.subTest(order=order):
+                self.assert_backward_pages(order)
+
+    @override_settings(ADS_SEARCH_MODE="full_text")
+    def test_relevance_order_with_tied_ranks(self):
+        # All the ads match the search, with two distinct ranks
+        entries = list(AdEntry.objects.all())
+        for i, entry in enumerate(entries):
+            entry.language = get_language()
+            entry.name = "spam"
+            entry.description = "spam" if i % 2 else ""
+        AdEntry.objects.bulk_update(entries, ["language", "name", "description"])
+        order = AdQueryForm.Order.RELEVANCE
+        for assert_pages in [self.assert_forward_pages, self.assert_backward_pages]:
+            with self.subTest(assert_pages=assert_pages.__name__):
+                assert_pages(order, "spam")
+
+    def assert_forward_pages(self, order, search=None):
+        expected = self.get_offset_pages(order, search)
+        response = self.get_page(order, search=search)
+        actual = [list(response.context["page_obj"])]
+        for number in range(2, self.page_count + 1):
+            response = self.follow(response, number)
+            actual.append(list(response.context["page_obj"]))
+        self.assertEqual(actual, expected)
+
+    def assert_backward_pages(self, order, search=None):
+        expected = self.get_offset_pages(order, search)
+        response = self.follow(self.get_page(order, search=search), self.page_count)
+        actual = [list(response.context["page_obj"])]
+        for number in reversed(range(1, self.page_count)):
+            response = self.follow(response, number)
+            actual.insert(0, list(response.context["page_obj"]))
+        self.assertEqual(actual, expected)
+
+    def test_neighboring_pages(self):
+        number = self.cls._ONE_SIDE_NEIGHBORING_PAGES + 1
+        for order in AdQueryForm.Order:
+            expected = self.get_offset_pages(order)
+            response = self.get_page(order, number)
+            for neighbor in [
+                *response.context["previous_pages"],
+                *response.context["next_pages"],
+            ]:
+                with self.subTest(order=order, neighbor=neighbor):
+                    neighbor_response = self.follow(response, neighbor)
+                    page = neighbor_response.context["page_obj"]
+                    self.assertEqual(list(page), expected[neighbor - 1])
+
+    def test_neighboring_pages_use_key(self):
+        number = self.cls._ONE_SIDE_NEIGHBORING_PAGES + 1
+        response = self.get_page(AdQueryForm.Order.NEWEST_FIRST, number)
+        for neighbor in [number - 1, number + 1]:
+            url = self.get_other_page_url(response, neighbor)
+            with (
+                self.subTest(neighbor=neighbor),
+                patch.object(
+                    self.cls,
+                    "_create_keyset_condition",
+                    autospec=True,
+                    side_effect=self.cls._create_keyset_condition,
+                ) as mock,
+            ):
+                self.get(url, expected_status=HTTPStatus.OK)
+                mock.assert_called_once()
+
+    def test_cursor_of_other_order_uses_page_number(self):
+        order = AdQueryForm.Order.HIGHEST_PRICE_FIRST
+        other_order = AdQueryForm.Order.NEWEST_FIRST
+        expected = self.get_offset_pages(other_order)
+        url = self.get_other_page_url(self.get_page(order), 2)
+        query = parse_qs(urlsplit(url).query)
+        query[AdQueryForm.URL_PARAMETERS["order"]] = [other_order]
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        page = response.context["page_obj"]
+        self.assertEqual(page.number, 2)
+        self.assertEqual(list(page), expected[1])
+
+    def test_invalid_cursor(self):
+        order = AdQueryForm.Order.NEWEST_FIRST
+        expected = self.get_offset_pages(order)
+        query = self.get_query(order) | {
+            self.cls.page_kwarg: 2,
+            self.cls.cursor_kwarg: "invalid",
+        }
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        self.assertEqual(list(response.context["page_obj"]), expected[1])
+
+    def test_cursor_is_ignored_if_disabled(self):
+        url = self.get_other_page_url(self.get_page(AdQueryForm.Order.NEWEST_FIRST), 2)
+        with self.settings(ADS_KEYSET_PAGINATION=False):
+            response = self.get(url, expected_status=HTTPStatus.OK)
+        self.assertEqual(response.context["page_obj"].number, 1)
+
+    def get_offset_pages(self, order, search=None):
+        with self.settings(ADS_KEYSET_PAGINATION=False):
+            return [
+                list(self.get_page(order, number, search).context["page_obj"])
+                for number in range(1, self.page_count + 1)
+            ]
+
+    def get_page(self, order, number=None, search=None):
+        query = self.get_query(order)
+        if number is not None:
+            query[self.cls.page_kwarg] = number
+        if search is not None:
+            query[AdQueryForm.URL_PARAMETERS["search"]] = search
+        return self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+
+    def get_query(self, order):
+        return {
+            AdQueryForm.URL_PARAMETERS["order"]: order,
+            AdQueryForm.URL_PARAMETERS["page_size"]: self.page_size,
+        }
+
+    def follow(self, response, number):
+        url = self.get_other_page_url(response, number)
+        response = self.get(url, expected_status=HTTPStatus.OK)
+        self.assertEqual(response.context["page_obj"].number, number)
+        return response
+
+    def get_other_page_url(self, response, number):
+        url = response.context["other_page_url_template"].render({"number": number})
+        self.assertIn(self.cls.cursor_kwarg, parse_qs(urlsplit(url).query))
+        return url
+
+
+class AdListViewKeysetPaginationTest(
+    AdListViewTestMixin, BaseAdListViewKeysetPaginationTestMixin, TestCase
+):
+    pass
+
+
+class UserAdListViewKeysetPaginationTest(
+    UserAdListViewTestMixin, BaseAdListViewKeysetPaginationTestMixin, TestCase
+):
+    pass
+
+
 ###############################################################################
 # Miscellaneous
 
@@ -1692,3 +2718,183 @@ class UserAdListViewQueryFormFactoryGetCategoryCacheArgTestMixin(
     TestCase,
 ):
     pass
+
+
+# Page caching
+
+
+@override_settings(ADS_LIST_PAGE_CACHING=True)
+class AdListViewPageCachingTest(AdListViewTestMixin, BaseAdListViewTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.ad_factory = cls.create_ad_factory()
+        cls.entry_factory = cls.create_ad_entry_factory(not_create=["ad"])
+        ad = cls.ad_factory.create()
+        cls.entry_factory.create(ad=ad, language=get_language())
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @override_settings(ADS_LIST_PAGE_CACHING=False)
+    def test_without_caching(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_caching(self):
+        first_response = self.get(expected_status=HTTPStatus.OK)
+        with self.assertNumQueries(0):
+            response = self.get(expected_status=HTTPStatus.OK)
+        self.assertEqual(response.content, first_response.content)
+        self.assertEqual(response["ETag"], first_response["ETag"])
+
+    def test_caching_keeps_status_and_headers(self):
+        def get(view, *args, **kwargs):
+            response = original_get(view, *args, **kwargs)
+            response["X-Spam"] = "eggs"
+            return response
+
+        original_get = _BaseAdListView.get
+        with patch.object(_BaseAdListView, "get", get):
+            first_response = self.get(expected_status=HTTPStatus.OK)
+        with self.assertNumQueries(0):
+            response = self.get(expected_status=HTTPStatus.OK)
+        self.assertEqual(response.status_code, first_response.status_code)
+        self.assertEqual(dict(response.headers), dict(first_response.headers))
+        self.assertEqual(response["X-Spam"], "eggs")
+
+    def test_caching_with_authenticated_user(self):
+        self.client.force_login(self.create_user_factory().create())
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertEqual(response.context["ad_count"], 1)
+
+    def test_caching_with_anonymous_user_session(self):
+        session = self.client.session
+        session["spam"] = "eggs"
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_caching_with_reordered_parameters(self):
+        parameters = [
+            (AdQueryForm.URL_PARAMETERS["order"], AdQueryForm.Order.OLDEST_FIRST),
+            (AdQueryForm.URL_PARAMETERS["page_size"], self.get_page_size()),
+        ]
+        first_response = self.get(
+            self.get_url(query=parameters), expected_status=HTTPStatus.OK
+        )
+        with self.assertNumQueries(0):
+            response = self.get(
+                self.get_url(query=parameters[::-1]), expected_status=HTTPStatus.OK
+            )
+        self.assertEqual(response["ETag"], first_response["ETag"])
+
+    def test_caching_with_other_parameters(self):
+        first_response = self.get(expected_status=HTTPStatus.OK)
+        query = {AdQueryForm.URL_PARAMETERS["search"]: "spam"}
+        response = self.get(self.get_url(query=query), expected_status=HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], first_response["ETag"])
+        self.assertEqual(response.context["ad_count"], 0)
+
+    def test_caching_with_other_language(self):
+        first_response = self.get(expected_status=HTTPStatus.OK)
+        languages = self.create_ad_entry_language_factory().get_choices()
+        other_language = next(
+            language for language in languages if language != get_language()
+        )
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = other_language
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], first_response["ETag"])
+        self.assertEqual(response.context["ad_count"], 0)
+
+    def test_caching_with_ad_creation(self):
+        first_response = self.get(expected_status=HTTPStatus.OK)
+        with self.captureOnCommitCallbacks(execute=True):
+            ad = self.ad_factory.create()
+            self.entry_factory.create(ad=ad, language=get_language())
+        response = self.get(
+            HTTP_IF_NONE_MATCH=first_response["ETag"], expected_status=HTTPStatus.OK
+        )
+        self.assertNotEqual(response["ETag"], first_response["ETag"])
+        self.assertEqual(response.context["ad_count"], 2)
+
+    def test_not_modified_with_etag(self):
+        first_response = self.get(expected_status=HTTPStatus.OK)
+        # Cookies other than the session one don't disable caching
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = get_language()
+        with self.assertNumQueries(0):
+            response = self.get(
+                HTTP_IF_NONE_MATCH=first_response["ETag"],
+                expected_status=HTTPStatus.NOT_MODIFIED,
+            )
+        self.assertEqual(response["ETag"], first_response["ETag"])
+
+    def test_without_last_modified(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertFalse(response.has_header("Last-Modified"))
+        # A modification time from the future is not enough
+        self.get(
+            HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600),
+            expected_status=HTTPStatus.OK,
+        )
+
+    def test_vary(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        self.assertIn("Cookie", response["Vary"])
+        self.assertIn("Accept-Language", response["Vary"])
+
+
+# Query count
+
+
+class BaseAdListViewQueryCountTestMixin(
+    TempMediaRootTestMixin, BaseAdListViewTestMixin
+):
+    """Test that the number of queries doesn't depend on the page contents."""
+
+    def test(self):
+        for ad_count, category_depth, image_count in [
+            (1, 1, 0),
+            (1, 1, 1),
+            (AdQueryForm._DEFAULT_PAGE_SIZE, 5, Ad.MAX_IMAGES),
+        ]:
+            with self.subTest(
+                ad_count=ad_count,
+                category_depth=category_depth,
+                image_count=image_count,
+            ):
+                self.create_ads(ad_count, category_depth, image_count)
+                with self.assertNumQueries(self.query_budget):
+                    self.get(expected_status=HTTPStatus.OK)
+
+    def create_ads(self, count, category_depth, image_count):
+        category_factory = self.create_category_factory()
+        category = None
+        for i in range(category_depth):
+            category = category_factory.create(
+                parent=category, ultimate=i == category_depth - 1
+            )
+        ad_factory = self.create_ad_factory(not_create=["category"])
+        entry_factory = self.create_ad_entry_factory(not_create=["ad"])
+        image_factory = self.create_ad_image_factory(not_create=["ad"])
+        for i in range(count):
+            ad = ad_factory.create(category=category)
+            entry_factory.create(ad=ad, language=get_language())
+            for number in range(1, image_count + 1):
+                image_factory.create(ad=ad, number=number)
+
+
+class AdListViewQueryCountTest(
+    AdListViewTestMixin, BaseAdListViewQueryCountTestMixin, TestCase
+):
+    query_budget = 6
+
+
+class UserAdListViewQueryCountTest(
+    UserAdListViewTestMixin, BaseAdListViewQueryCountTestMixin, TestCase
+):
+    # With the viewed user
+    query_budget = 7
@@ -3,10 +3,10 @@ from types import MappingProxyType
 from unittest.mock import Mock, patch
 from urllib.parse import urlencode, urlsplit, urlunsplit
 
-from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
 
 from ads.forms import AdQueryForm
-from ads.models import Ad, AdEntry
+from ads.models import Ad, AdEntry, CategoryAdCounter
 from ads.tests.test_views.test_ad_list_views.mixins import (
     AdListViewTestMixin,
     BaseAdListViewTestMixin,
@@ -292,6 +292,20 @@ class UserAdListViewGetCategoryAdCountTest(
     pass
 
 
+class AdListViewGetCategoryAdCountWithCategoryAdCountersTest(
+    AdListViewGetCategoryAdCountTest
+):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ADS_CATEGORY_AD_COUNTERS=True))
+
+    def _test(self, *args, **kwargs):
+        # Ads are created in bulk, bypassing maintenance of the counters
+        CategoryAdCounter.objects.rebuild()
+        super()._test(*args, **kwargs)
+
+
 # --------------------------------------
 # Template of URLs of other pages
 
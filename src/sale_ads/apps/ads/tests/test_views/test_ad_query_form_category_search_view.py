@@ -0,0 +1,66 @@
+from http import HTTPStatus
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+
+from ads.forms import AdQueryForm
+from ads.views import _AdQueryFormCategorySearchView
+from common.tests import SaleAdsTestMixin
+from common.tests.utils.view_test_mixin import ViewTestMixin
+
+
+class AdQueryFormCategorySearchViewTest(SaleAdsTestMixin, ViewTestMixin, TestCase):
+    url_pattern_name = "ads_category_search"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        cls.root = category_factory.create(name="Vehicles", name_ru="Транспорт")
+        cls.child = category_factory.create(name="Car parts", parent=cls.root)
+        cls.other = category_factory.create(name="Cameras")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_results(self):
+        response = self.search("ca")
+        choices = response.context["query_form"].fields["categories"].choices
+        self.assertEqual(
+            list(choices),
+            [
+                (self.other.pk, self.other.full_name),
+                (self.child.pk, self.child.full_name),
+            ],
+        )
+        name = AdQueryForm.URL_PARAMETERS["categories"]
+        self.assertContains(response, f'name="{name}"', count=2)
+        self.assertNotContains(response, "checked")
+
+    def test_without_query(self):
+        response = self.get(expected_status=HTTPStatus.OK)
+        choices = response.context["query_form"].fields["categories"].choices
+        self.assertEqual(list(choices), [])
+
+    def test_max_results(self):
+        with patch.object(_AdQueryFormCategorySearchView, "_MAX_RESULTS", 1):
+            response = self.search("ca")
+        choices = response.context["query_form"].fields["categories"].choices
+        self.assertEqual(list(choices), [(self.other.pk, self.other.full_name)])
+
+    def test_in_active_language(self):
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = "ru"
+        response = self.search("тра")
+        choices = response.context["query_form"].fields["categories"].choices
+        self.assertEqual([pk for pk, name in choices], [self.root.pk, self.child.pk])
+        self.assertEqual(choices[0][1], "Транспорт")
+        response = self.search("veh")
+        choices = response.context["query_form"].fields["categories"].choices
+        self.assertEqual(list(choices), [])
+
+    def search(self, query):
+        url = self.get_url(query={_AdQueryFormCategorySearchView.query_kwarg: query})
+        return self.get(url, expected_status=HTTPStatus.OK)
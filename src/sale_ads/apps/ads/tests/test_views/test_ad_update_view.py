@@ -1,12 +1,15 @@
 from collections import Counter
 from decimal import Decimal
 from http import HTTPStatus
+from unittest.mock import patch
 
 from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import DatabaseError
 from django.test import TestCase
 from django.urls import reverse
 
 from ads.forms import AdUpdateEntryChoiceForm
+from ads.models import _CategoryAdCounterQuerySet
 from ads.views import _AdUpdateView
 from categories.models import Category
 from common.tests import (
@@ -185,6 +188,16 @@ class AdUpdateViewPostUpdateTest(AdUpdateViewTestMixin, TestCase):
         self.post(expected_status=HTTPStatus.OK)
         self._test_ad_unchanged()
 
+    def test_ad_with_failed_category_ad_counter_refresh(self):
+        with (
+            patch.object(
+                _CategoryAdCounterQuerySet, "refresh", side_effect=DatabaseError
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            self.post_with_new_field_values(expected_status=HTTPStatus.OK)
+        self._test_ad_unchanged()
+
     def _test_ad(self, category_pk, price):
         self.ad.refresh_from_db(fields=["category", "price"])
         self.assertEqual(self.ad.category_id, category_pk)
@@ -374,3 +387,32 @@ class AdUpdateViewPostDeleteEntryTest(AdUpdateViewTestMixin, TestCase):
             data = {}
         data["language"] = self.unused_language
         return self.post(url, data, *args, **kwargs)
+
+
+class AdUpdateViewQueryCountTest(AdUpdateViewTestMixin, TestCase):
+    """Test that the number of queries doesn't depend on the ad."""
+
+    def test(self):
+        for category_depth, entry_languages in [
+            (1, [self.used_language]),
+            (5, [self.used_language, self.unused_language]),
+        ]:
+            with self.subTest(
+                category_depth=category_depth, entry_languages=entry_languages
+            ):
+                self.prepare_ad(category_depth, entry_languages)
+                with self.assertNumQueries(7):
+                    self.get(expected_status=HTTPStatus.OK)
+
+    def prepare_ad(self, category_depth, entry_languages):
+        category = None
+        for i in range(category_depth):
+            category = self.category_factory.create(
+                parent=category, ultimate=i == category_depth - 1
+            )
+        self.ad.category = category
+        self.ad.save(update_fields=["category"])
+        self.ad.entries.exclude(language__in=entry_languages).delete()
+        for language in entry_languages:
+            if not self.ad.entries.filter(language=language).exists():
+                self.entry_factory.create(language=language)
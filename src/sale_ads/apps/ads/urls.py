@@ -1,6 +1,7 @@
 from django.urls import include, path
 
 from ads.views import (
+    category_search,
     create,
     create_entry,
     delete,
@@ -16,6 +17,7 @@ _SEGMENT = "ads"
 
 urlpatterns = [path("", list_, name="ads_list")]
 _sub_urlpatterns = [
+    path("categories/", category_search, name="ads_category_search"),
     path("create/", create, name="ads_create"),
     path("<uuid:pk>/", detail, name="ads_detail"),
     path("<uuid:pk>/delete", delete, name="ads_delete"),
@@ -1,5 +1,7 @@
 from collections import namedtuple
+from datetime import datetime
 from functools import cached_property
+from hashlib import md5
 from types import MappingProxyType
 from urllib.parse import urlencode, urlsplit, urlunsplit
 
@@ -8,11 +10,31 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.postgres.search import SearchRank
+from django.core import signing
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db.models import Count, Q
-from django.http import Http404
+from django.core.paginator import InvalidPage, Page
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
+from django.template.loader import render_to_string
+from django.template.response import TemplateResponse
 from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import (
@@ -20,9 +42,11 @@ from django.views.generic import (
     DeleteView,
     DetailView,
     ListView,
+    TemplateView,
     UpdateView,
 )
 
+from ads.cache import ad_data_version
 from ads.forms import (
     AdDetailEntryChoiceForm,
     AdEntryForm,
@@ -32,8 +56,8 @@ from ads.forms import (
     AdUpdateEntryChoiceForm,
     ad_image_formset_factory,
 )
-from ads.models import Ad, AdEntry, AdImage
-from categories.models import Category
+from ads.models import Ad, AdEntry, AdImage, CategoryAdCounter
+from categories.models import Category, CategoryClosure
 
 
 class _AdAuthorRequiredMixin(UserPassesTestMixin):
@@ -55,19 +79,22 @@ class _AdCreateView(CreateView):
         entry_form = AdEntryForm(request.POST)
         image_formset = self._create_image_formset(request.POST, request.FILES)
         if ad_form.is_valid() and entry_form.is_valid() and image_formset.is_valid():
-            ad_form.instance.author = request.user
-            self.object = ad_form.save()
-            entry_form.instance.ad = ad_form.instance
-            entry_form.save()
-            images = []
-            valid_non_empty_image_forms = filter(
-                lambda form: form.cleaned_data, image_formset
-            )
-            for number, form in enumerate(valid_non_empty_image_forms, 1):
-                form.instance.ad = self.object
-                form.instance.number = number
-                images.append(form.instance)
-            AdImage.objects.bulk_create(images)
+            # In a single transaction with the refreshes of category ad
+            # counters made by signal receivers
+            with transaction.atomic():
+                ad_form.instance.author = request.user
+                self.object = ad_form.save()
+                entry_form.instance.ad = ad_form.instance
+                entry_form.save()
+                images = []
+                valid_non_empty_image_forms = filter(
+                    lambda form: form.cleaned_data, image_formset
+                )
+                for number, form in enumerate(valid_non_empty_image_forms, 1):
+                    form.instance.ad = self.object
+                    form.instance.number = number
+                    images.append(form.instance)
+                AdImage.objects.bulk_create(images)
             return redirect(self.get_success_url())
         if not image_formset.is_valid():
             output_image_formset = self._create_image_formset()
@@ -96,7 +123,8 @@ class _AdCreateView(CreateView):
 
     def _create_ad_form(self, **kwargs):
         return AdForm(
-            category_cache=Category.objects.cache(), **(self.get_form_kwargs() | kwargs)
+            category_cache=Category.objects.snapshot(),
+            **(self.get_form_kwargs() | kwargs),
         )
 
     @staticmethod
@@ -121,6 +149,8 @@ def create(request, *args, **kwargs):
 class _BaseAdListView(ListView):
     model = Ad
     page_kwarg = "p"
+    cursor_kwarg = "k"
+    category_tree_node_kwarg = "t"
 
     _ORDERINGS = MappingProxyType(
         {
@@ -128,6 +158,7 @@ class _BaseAdListView(ListView):
             AdQueryForm.Order.LOWEST_PRICE_FIRST: "price",
             AdQueryForm.Order.NEWEST_FIRST: "-created",
             AdQueryForm.Order.OLDEST_FIRST: "created",
+            AdQueryForm.Order.RELEVANCE: "-search_rank",
         }
     )
     _DEFAULT_ORDERING = _ORDERINGS[AdQueryForm.Order.NEWEST_FIRST]
@@ -140,6 +171,11 @@ class _BaseAdListView(ListView):
         super().__init__(*args, **kwargs)
         self._category_ad_counts = {}
 
+    def get(self, request, *args, **kwargs):
+        if self._category_tree_node is not None:
+            return self._get_category_tree_node_response()
+        return super().get(request, *args, **kwargs)
+
     # ==========================================================
     # Queryset
 
@@ -148,32 +184,240 @@ class _BaseAdListView(ListView):
 
     @cached_property
     def _queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(self._get_condition())
-            .distinct()
-            .select_related("author", "category")
+        queryset = (
+            self.model._default_manager.filter(self._get_condition())
+            .select_related("author")
             .prefetch_related("entries", "images")
         )
+        # The rank has to be annotated before ordering by it
+        if self._ordered_by_relevance:
+            queryset = queryset.annotate(search_rank=self._search_rank)
+        return queryset.order_by(*self.get_ordering())
 
     def get_ordering(self):
-        orderings = [self._ORDERINGS[self._query_form.cleaned_order]]
+        orderings = []
+        order = self._query_form.cleaned_order
+        # Without full-text search, there is no relevance to order by
+        if order != AdQueryForm.Order.RELEVANCE or self._ordered_by_relevance:
+            orderings.append(self._ORDERINGS[order])
         if self._DEFAULT_ORDERING not in orderings:
             orderings.append(self._DEFAULT_ORDERING)
+        orderings.append(self._TIE_BREAKING_ORDERING)
         return orderings
 
+    _TIE_BREAKING_ORDERING = "pk"
+
+    @property
+    def _ordered_by_relevance(self):
+        return (
+            self._query_form.cleaned_order == AdQueryForm.Order.RELEVANCE
+            and self._search_rank is not None
+        )
+
+    # ==========================================================
+    # Keyset pagination
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self._cursor
+        if cursor is None:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        try:
+            number = paginator.validate_number(cursor.number)
+        except InvalidPage as error:
+            raise Http404(str(error))
+        object_list = self._get_keyset_page_object_list(
+            queryset, cursor, number, paginator
+        )
+        page = Page(object_list, number, paginator)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def _get_keyset_page_object_list(self, queryset, cursor, number, paginator):
+        """
+        Get objects of page located by cursor.
+
+        If the cursor has a key, then seeks past the key in the cursor
+        direction, so that the cost doesn't depend on the page number.
+        Otherwise, takes the page from the start (or from the end, if
+        the cursor is reversed).
+        """
+        if cursor.reverse:
+            queryset = queryset.reverse()
+        if cursor.key is not None:
+            queryset = queryset.filter(
+                self._create_keyset_condition(cursor.key, cursor.reverse)
+            )
+            start = cursor.skip
+            stop = start + paginator.per_page
+        else:
+            bottom = (number - 1) * paginator.per_page
+            top = min(bottom + paginator.per_page, paginator.count)
+            start, stop = (
+                (paginator.count - top, paginator.count - bottom)
+                if cursor.reverse
+                else (bottom, top)
+            )
+        object_list = list(queryset[start:stop])
+        if cursor.reverse:
+            object_list.reverse()
+        return object_list
+
+    def _create_keyset_condition(self, key, reverse=False):
+        """
+        Create condition of following key in ordering.
+
+        If `reverse` is true, then creates condition of preceding key.
+        """
+        condition = Q()
+        preceding_fields_condition = Q()
+        for (name, descending), value in zip(self._keyset_fields, key):
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= preceding_fields_condition & Q(**{f"{name}__{lookup}": value})
+            preceding_fields_condition &= Q(**{name: value})
+        return condition
+
+    @cached_property
+    def _keyset_fields(self):
+        return tuple(
+            (ordering.removeprefix("-"), ordering.startswith("-"))
+            for ordering in self.get_ordering()
+        )
+
+    def _get_key(self, ad):
+        return tuple(getattr(ad, name) for name, descending in self._keyset_fields)
+
+    # --------------------------------------
+    # Cursor
+
+    _Cursor = namedtuple(
+        "_Cursor", ["number", "order", "page_size", "key", "reverse", "skip"]
+    )
+
+    _CURSOR_SALT = "ads.views.cursor"
+
+    @cached_property
+    def _cursor(self):
+        """
+        Cursor from URL parameters.
+
+        `None` if keyset pagination is disabled, or if the cursor is
+        missing or invalid.
+        If the cursor was created for another order or page size, then
+        its key is dropped, and only its page number is used.
+        """
+        if not settings.ADS_KEYSET_PAGINATION:
+            return None
+        token = self.request.GET.get(self.cursor_kwarg)
+        if not token:
+            return None
+        try:
+            cursor = self._decode_cursor(token)
+        except (signing.BadSignature, TypeError, ValueError, ValidationError):
+            return None
+        if (
+            cursor.order != self._query_form.cleaned_order
+            or cursor.page_size != self._query_form.cleaned_page_size
+        ):
+            cursor = cursor._replace(key=None, reverse=False, skip=0)
+        return cursor
+
+    def _encode_cursor(self, cursor):
+        key = cursor.key
+        if key is not None:
+            key = [self._encode_key_value(value) for value in key]
+        data = [*cursor[:3], key, *cursor[4:]]
+        return signing.dumps(data, salt=self._CURSOR_SALT, compress=True)
+
+    @staticmethod
+    def _encode_key_value(value):
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+
+    def _decode_cursor(self, token):
+        number, order, page_size, key, reverse, skip = signing.loads(
+            token, salt=self._CURSOR_SALT
+        )
+        if number < 1 or skip < 0:
+            raise ValueError(f"Invalid cursor: {token}.")
+        if key is not None and order == self._query_form.cleaned_order:
+            if len(key) != len(self._keyset_fields):
+                raise ValueError(f"Invalid cursor key length: {len(key)}.")
+            key = tuple(
+                self._get_keyset_field(name).to_python(value)
+                for (name, descending), value in zip(self._keyset_fields, key)
+            )
+        return self._Cursor(number, order, page_size, key, reverse, skip)
+
+    def _get_keyset_field(self, name):
+        if name == "pk":
+            return self.model._meta.pk
+        if name == "search_rank":
+            return FloatField()
+        return self.model._meta.get_field(name)
+
+    def _create_cursor(self, number, page):
+        """
+        Create cursor of page with number relative to current page.
+
+        Neighbors of the current page are located by the key of its
+        first or last ad, the first page is located from the start and
+        the last page is located from the end.
+        """
+        paginator = page.paginator
+        key = None
+        reverse = False
+        skip = 0
+        if number == 1:
+            pass
+        elif number == paginator.num_pages:
+            reverse = True
+        elif len(page) and (
+            page.number < number <= page.number + self._ONE_SIDE_NEIGHBORING_PAGES
+        ):
+            key = self._get_key(page[-1])
+            skip = (number - page.number - 1) * paginator.per_page
+        elif len(page) and (
+            page.number - self._ONE_SIDE_NEIGHBORING_PAGES <= number < page.number
+        ):
+            key = self._get_key(page[0])
+            reverse = True
+            skip = (page.number - number - 1) * paginator.per_page
+        return self._Cursor(
+            number,
+            self._query_form.cleaned_order,
+            self._query_form.cleaned_page_size,
+            key,
+            reverse,
+            skip,
+        )
+
     # ==========================================================
     # Context
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["ad_count"] = self._queryset.count()
-        context["category_tree"] = self._get_context_category_tree()
+        self._set_cached_categories(context["page_obj"])
+        context["ad_count"] = self._ad_count
+        context["lazy_category_tree"] = settings.ADS_LAZY_CATEGORY_TREE
+        context["category_picker"] = settings.ADS_CATEGORY_PICKER
+        if settings.ADS_CATEGORY_TREE_CACHING:
+            context["category_tree_html"] = cache.get_or_set(
+                self._category_tree_cache_key, self._render_category_tree
+            )
+        else:
+            context["category_tree"] = self._get_context_category_tree()
         context["query_form"] = self._query_form_factory.create(
             initial=self._query_form.create_initial_from_cleaned()
         )
-        context["other_page_url_template"] = self._get_page_url_html_template()
+        context["other_page_url_template"] = (
+            self._get_keyset_page_url_html_template(context["page_obj"])
+            if settings.ADS_KEYSET_PAGINATION
+            else self._get_page_url_html_template()
+        )
         context["one_side_neighboring_pages"] = self._ONE_SIDE_NEIGHBORING_PAGES
         context["previous_pages"] = self._get_previous_pages(context["page_obj"])
         context["next_pages"] = self._get_next_pages(
@@ -181,31 +425,118 @@ class _BaseAdListView(ListView):
         )
         return context
 
+    def _set_cached_categories(self, ads):
+        # Cached categories get their full names without querying
+        # their ancestors
+        for ad in ads:
+            ad.category = self._category_cache[ad.category_id]
+
     def get_paginate_by(self, queryset):
         return self._query_form.cleaned_page_size
 
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        # Overriding the cached property, so that the paginator doesn't
+        # count the ads on its own
+        paginator.count = self._ad_count
+        return paginator
+
+    # --------------------------------------
+    # Ad count
+
+    @cached_property
+    def _ad_count(self):
+        if not settings.ADS_AD_COUNT_CACHING:
+            return self._queryset.count()
+        return cache.get_or_set(self._ad_count_cache_key, self._queryset.count)
+
+    @property
+    def _ad_count_cache_key(self):
+        return self._make_cache_key("ad_count", self._get_ad_count_cache_key_parts())
+
+    @staticmethod
+    def _make_cache_key(name, parts):
+        digest = md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        return ad_data_version.make_key(name, digest)
+
+    def _get_ad_count_cache_key_parts(self):
+        """
+        Get parts of the key of the cached ad count.
+
+        The parts are normalized values of the query form fields that
+        affect the ad count.
+        """
+        search = self._query_form.cleaned_search
+        keywords = sorted(set(search.split())) if search else []
+        search_fields = sorted(self._query_form.cleaned_search_fields)
+        return (
+            type(self).__name__,
+            sorted(category.pk for category in self._query_form.cleaned_categories),
+            sorted(self._query_form.cleaned_languages),
+            self._query_form.cleaned_min_price,
+            self._query_form.cleaned_max_price,
+            keywords,
+            search_fields if keywords else [],
+        )
+
     # --------------------------------------
     # Category tree
 
     def _get_context_category_tree(self):
-        roots = [
-            category
-            for category in self._category_cache.values()
-            if category.parent is None
-        ]
-        sorted_roots = sorted(roots, key=lambda category: category.lowercased_name)
-        return self._get_context_category_tree_siblings(sorted_roots)
+        return self._get_context_category_tree_siblings(
+            self._category_cache.sorted_roots
+        )
 
     def _get_context_category_tree_siblings(self, siblings):
         result = []
         for sibling in siblings:
             url = self._category_tree_url_template.format(sibling.pk)
             ad_count = self._get_category_ad_count(sibling.pk)
-            children = self._get_context_category_tree_siblings(sibling.sorted_children)
-            node = self._CategoryTreeNode(sibling.name, url, ad_count, children)
+            lazy = settings.ADS_LAZY_CATEGORY_TREE
+            if not lazy or sibling in self._expanded_categories:
+                children = self._get_context_category_tree_siblings(
+                    sibling.sorted_children
+                )
+                node = self._CategoryTreeNode(
+                    sibling.name, url, ad_count, children, expanded=lazy
+                )
+            else:
+                children_url = (
+                    self._category_tree_children_url_template.format(sibling.pk)
+                    if sibling.all_children
+                    else None
+                )
+                node = self._CategoryTreeNode(
+                    sibling.name, url, ad_count, [], children_url=children_url
+                )
             result.append(node)
         return result
 
+    def _render_category_tree(self):
+        context = {"root": True, "siblings": self._get_context_category_tree()}
+        return render_to_string(self._CATEGORY_TREE_TEMPLATE_NAME, context)
+
+    _CATEGORY_TREE_TEMPLATE_NAME = "ads/lists/_base/_category_tree.html"
+
+    @property
+    def _category_tree_cache_key(self):
+        parts = self._get_category_tree_cache_key_parts()
+        return self._make_cache_key("category_tree", parts)
+
+    def _get_category_tree_cache_key_parts(self):
+        """
+        Get parts of the key of the cached category tree HTML.
+
+        The parts are the language of the category names and the URL
+        template of the nodes. The URL template contains normalized
+        values of the query form fields other than the categories, so
+        it determines the ad counts of the nodes as well.
+        """
+        parts = (type(self).__name__, get_language(), self._category_tree_url_template)
+        if settings.ADS_LAZY_CATEGORY_TREE:
+            parts += (sorted(category.pk for category in self._expanded_categories),)
+        return parts
+
     @cached_property
     def _category_tree_url_template(self):
         parameter_name = AdQueryForm.URL_PARAMETERS["categories"]
@@ -217,20 +548,165 @@ class _BaseAdListView(ListView):
         )
 
     def _get_category_ad_count(self, pk):
+        if self._category_ad_counter_language is not None:
+            return self._category_subtree_ad_counts.get(pk, 0)
+        if settings.ADS_LAZY_CATEGORY_TREE:
+            return self._category_tree_node_ad_counts.get(pk, 0)
+        if settings.ADS_CATEGORY_AD_COUNT_ROLLUP:
+            return self._category_rolled_up_ad_counts.get(pk, 0)
         try:
             return self._category_ad_counts[pk]
         except KeyError:
             category = self._category_cache[pk]
-            count = category.own_ad_count
+            count = self._category_own_ad_counts.get(pk, 0)
             for child in category.all_children:
                 count += self._get_category_ad_count(child.pk)
             self._category_ad_counts[pk] = count
             return count
 
+    @cached_property
+    def _category_own_ad_counts(self):
+        ads = self.model._default_manager.filter(self._get_condition(categories=False))
+        return dict(ads.values_list("category").annotate(Count("pk")))
+
+    @cached_property
+    def _category_rolled_up_ad_counts(self):
+        """
+        Numbers of ads in subtrees of categories summed in the database.
+
+        Only categories with ads in their subtrees are included.
+        """
+        ads = self.model._default_manager.filter(self._get_condition(categories=False))
+        own_counts = ads.order_by().values("category").annotate(Count("pk"))
+        own_counts_sql, params = own_counts.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self._CATEGORY_AD_COUNT_ROLLUP_SQL.format(own_counts=own_counts_sql),
+                params,
+            )
+            return dict(cursor.fetchall())
+
+    # Own counts of categories are added to the counts of all their
+    # ancestors by walking up the parents
+    _CATEGORY_AD_COUNT_ROLLUP_SQL = """
+        WITH RECURSIVE
+            own_counts (category_id, count) AS ({own_counts}),
+            counts (category_id, count) AS (
+                SELECT category_id, count FROM own_counts
+                UNION ALL
+                SELECT category.parent_id, counts.count
+                FROM counts
+                JOIN categories_category AS category
+                    ON category.id = counts.category_id
+                WHERE category.parent_id IS NOT NULL
+            )
+        SELECT category_id, SUM(count) FROM counts GROUP BY category_id
+    """
+
+    # The children of lazy nodes aren't loaded, and are fetched from
+    # the children URL on expansion
     _CategoryTreeNode = namedtuple(
-        "_CategoryTreeNode", ["name", "url", "ad_count", "children"]
+        "_CategoryTreeNode",
+        ["name", "url", "ad_count", "children", "expanded", "children_url"],
+        defaults=[False, None],
     )
 
+    # Lazy category tree
+
+    @cached_property
+    def _category_tree_node(self):
+        """
+        Category whose children are requested for the lazy tree.
+
+        `None` if the lazy tree is disabled or a page is requested.
+        Raises `Http404` if the category is invalid.
+        """
+        if not settings.ADS_LAZY_CATEGORY_TREE:
+            return None
+        value = self.request.GET.get(self.category_tree_node_kwarg)
+        if value is None:
+            return None
+        try:
+            return self._category_cache[Category.pk_from_string(value)]
+        except (KeyError, ValueError):
+            raise Http404
+
+    def _get_category_tree_node_response(self):
+        children = self._get_context_category_tree_siblings(
+            self._category_tree_node.sorted_children
+        )
+        context = {"root": False, "siblings": children}
+        return TemplateResponse(
+            self.request, self._CATEGORY_TREE_TEMPLATE_NAME, context
+        )
+
+    @cached_property
+    def _expanded_categories(self):
+        """Selected categories and their ancestors, expanded in lazy tree."""
+        if self._category_tree_node is not None:
+            return frozenset()
+        categories = set()
+        for category in self._query_form.cleaned_categories:
+            categories.add(category)
+            categories.update(category.ancestors)
+        return frozenset(categories)
+
+    @cached_property
+    def _category_tree_children_url_template(self):
+        other_url_parameters = self._get_ad_query_url_parameters(
+            self._AD_QUERY_URL_PARAMETERS
+            - {AdQueryForm.URL_PARAMETERS["categories"], self.page_kwarg}
+        )
+        return self._get_url_template_with_fillable_parameter(
+            self.category_tree_node_kwarg, other_url_parameters
+        )
+
+    @cached_property
+    def _category_tree_node_pks(self):
+        """Primary keys of categories whose nodes are in lazy tree."""
+        node = self._category_tree_node
+        if node is not None:
+            return [child.pk for child in node.all_children]
+        pks = [category.pk for category in self._category_cache.sorted_roots]
+        for category in self._expanded_categories:
+            pks += [child.pk for child in category.all_children]
+        return pks
+
+    @cached_property
+    def _category_tree_node_ad_counts(self):
+        """
+        Numbers of ads in subtrees of categories in lazy tree.
+
+        Only the categories whose nodes are in the tree are counted,
+        through the category closure table.
+        """
+        ads = self.model._default_manager.filter(
+            self._get_condition(categories=False),
+            category__ancestor_links__ancestor__in=self._category_tree_node_pks,
+        )
+        return dict(
+            ads.order_by()
+            .values_list("category__ancestor_links__ancestor")
+            .annotate(Count("pk"))
+        )
+
+    @cached_property
+    def _category_ad_counter_language(self):
+        """
+        Language of category ad counters matching the query.
+
+        `None` means that the counters don't match the query, so the
+        numbers of ads in categories have to be aggregated.
+        """
+        return None
+
+    @cached_property
+    def _category_subtree_ad_counts(self):
+        counters = CategoryAdCounter.objects.filter(
+            language=self._category_ad_counter_language
+        )
+        return dict(counters.values_list("category", "subtree_count"))
+
     # --------------------------------------
     # Numbers of neighboring pages
 
@@ -268,6 +744,26 @@ class _BaseAdListView(ListView):
         def render(self, context):
             return self._string_template.format(context["number"])
 
+    def _get_keyset_page_url_html_template(self, page):
+        other_parameters = self._get_ad_query_url_parameters(
+            self._AD_QUERY_URL_PARAMETERS - {self.page_kwarg}
+        )
+        string_template = self._get_url_template_with_fillable_parameter(
+            self.cursor_kwarg, other_parameters
+        )
+        get_cursor = lambda number: self._encode_cursor(
+            self._create_cursor(number, page)
+        )
+        return self._KeysetPageURLHTMLTemplate(string_template, get_cursor)
+
+    class _KeysetPageURLHTMLTemplate:
+        def __init__(self, string_template, get_cursor):
+            self._string_template = string_template
+            self._get_cursor = get_cursor
+
+        def render(self, context):
+            return self._string_template.format(self._get_cursor(context["number"]))
+
     # ==========================================================
     # Utilities
 
@@ -290,69 +786,100 @@ class _BaseAdListView(ListView):
     # --------------------------------------
     # Condition
 
-    def _get_condition(self, *, categories=True, prefix=""):
+    def _get_condition(self, *, categories=True):
         condition = Q()
 
         # Categories
         if categories:
             root_categories = self._query_form.cleaned_categories
-            if root_categories:
-                categories = set(root_categories)
-                for root_category in root_categories:
-                    categories.update(root_category.descendants)
-                condition &= Q(category__in=[category.pk for category in categories])
-
-        # Languages
-        language_condition = Q()
-        for language in self._query_form.cleaned_languages:
-            language_condition |= Q(**{f"{prefix}entries__language": language})
-        condition &= language_condition
+            root_pks = [category.pk for category in root_categories]
+            if any(category.all_children for category in root_categories):
+                # Expanding the categories to their subtrees in the
+                # database instead of listing all descendants
+                links = CategoryClosure.objects.filter(ancestor__in=root_pks)
+                condition &= Q(category__in=links.values("descendant"))
+            elif root_pks:
+                # Leaves only, so that the category indexes can be used
+                condition &= Q(category__in=root_pks)
 
         # Price
         price_condition = Q()
         min_price = self._query_form.cleaned_min_price
         if min_price is not None:
-            price_condition &= Q(**{f"{prefix}price__gte": min_price})
+            price_condition &= Q(price__gte=min_price)
         max_price = self._query_form.cleaned_max_price
         if max_price is not None:
-            price_condition &= Q(**{f"{prefix}price__lte": max_price})
+            price_condition &= Q(price__lte=max_price)
         condition &= price_condition
 
+        # Entries
+        # Filtering through a subquery instead of joining entries, so
+        # that ads with several matching entries aren't duplicated and
+        # don't need deduplication
+        entries = AdEntry.objects.filter(self._get_entry_condition(), ad=OuterRef("pk"))
+        condition &= Exists(entries)
+
+        return condition
+
+    def _get_entry_condition(self):
+        """Get condition of entries, some of which ads must have."""
+        condition = Q()
+
+        # Languages
+        language_condition = Q()
+        for language in self._query_form.cleaned_languages:
+            language_condition |= Q(language=language)
+        condition &= language_condition
+
         # Search
-        search = self._query_form.cleaned_search
-        if search:
-            search_condition = Q()
+        keywords = self._search_keywords
+        if keywords:
             search_fields = self._query_form.cleaned_search_fields
-            for keyword in set(search.split()):
-                keyword_search_condition = Q()
-                for field in search_fields:
-                    keyword_search_condition |= (
-                        self._create_field_keyword_search_condition(
-                            field, keyword, prefix
-                        )
-                    )
-                search_condition &= keyword_search_condition
-            condition &= search_condition
+            condition &= self._create_search_condition(keywords, search_fields)
 
         return condition
 
-    def _create_field_keyword_search_condition(self, field, keyword, prefix=""):
+    @cached_property
+    def _search_keywords(self):
+        search = self._query_form.cleaned_search
+        return frozenset(search.split()) if search else frozenset()
+
+    def _create_search_condition(self, keywords, fields):
+        method = self._CREATE_SEARCH_CONDITION_METHODS[settings.ADS_SEARCH_MODE]
+        return method(self, keywords, fields)
+
+    # Substring search
+
+    def _create_substring_search_condition(self, keywords, fields):
+        condition = Q()
+        for keyword in keywords:
+            keyword_condition = Q()
+            for field in fields:
+                keyword_condition |= self._create_field_keyword_search_condition(
+                    field, keyword
+                )
+            condition &= keyword_condition
+        return condition
+
+    def _create_field_keyword_search_condition(self, field, keyword):
         method = self._CREATE_FIELD_KEYWORD_SEARCH_CONDITION_METHODS[field]
-        return method(self, keyword, prefix)
+        return method(self, keyword)
 
-    def _create_description_keyword_search_condition(self, keyword, prefix=""):
-        return self._create_entry_field_keyword_search_condition(
-            "description", keyword, prefix
-        )
+    def _create_description_keyword_search_condition(self, keyword):
+        return self._create_entry_field_keyword_search_condition("description", keyword)
 
-    def _create_name_keyword_search_condition(self, keyword, prefix=""):
-        return self._create_entry_field_keyword_search_condition(
-            "name", keyword, prefix
-        )
+    def _create_name_keyword_search_condition(self, keyword):
+        return self._create_entry_field_keyword_search_condition("name", keyword)
 
     @staticmethod
-    def _create_entry_field_keyword_search_condition(name, keyword, prefix=""):
-        return Q(**{f"{prefix}entries__{name}__icontains": keyword})
+    def _create_entry_field_keyword_search_condition(name, keyword):
+        # In trigram mode, the lookup can use trigram indexes of entries
+        lookup = (
+            "trigram_icontains"
+            if settings.ADS_SEARCH_MODE == "trigram"
+            else "icontains"
+        )
+        return Q(**{f"{name}__{lookup}": keyword})
 
     _CREATE_FIELD_KEYWORD_SEARCH_CONDITION_METHODS = MappingProxyType(
         {
@@ -363,6 +890,71 @@ class _BaseAdListView(ListView):
         }
     )
 
+    # Full-text search
+
+    def _create_full_text_search_condition(self, keywords, fields):
+        condition = Q()
+        for language, query in self._get_search_queries(keywords, fields).items():
+            condition |= Q(language=language, search_vector=query)
+        return condition
+
+    def _get_search_queries(self, keywords, fields):
+        entry_fields = [self._SEARCH_FIELD_ENTRY_FIELDS[field] for field in fields]
+        return {
+            language: AdEntry.create_search_query(keywords, language, entry_fields)
+            for language in self._query_form.cleaned_languages
+        }
+
+    _SEARCH_FIELD_ENTRY_FIELDS = MappingProxyType(
+        {
+            AdQueryForm.SearchField.DESCRIPTION: "description",
+            AdQueryForm.SearchField.NAME: "name",
+        }
+    )
+
+    @cached_property
+    def _search_rank(self):
+        """
+        Relevance of ads to full-text search.
+
+        The relevance of an ad is the highest rank of its entries
+        matching the search.
+        `None` if there is no full-text search.
+        """
+        keywords = self._search_keywords
+        if settings.ADS_SEARCH_MODE != "full_text" or not keywords:
+            return None
+        queries = self._get_search_queries(
+            keywords, self._query_form.cleaned_search_fields
+        )
+        # The rank is cast from `real` to `double precision`, so that it's
+        # compared exactly with the float values of keyset cursors
+        rank = Case(
+            *[
+                When(
+                    language=language,
+                    then=Cast(SearchRank(F("search_vector"), query), FloatField()),
+                )
+                for language, query in queries.items()
+            ],
+            output_field=FloatField(),
+        )
+        entries = (
+            AdEntry.objects.filter(ad=OuterRef("pk"), language__in=queries.keys())
+            .annotate(rank=rank)
+            .order_by("-rank")
+            .values("rank")[:1]
+        )
+        return Coalesce(Subquery(entries), 0.0)
+
+    _CREATE_SEARCH_CONDITION_METHODS = MappingProxyType(
+        {
+            "full_text": _create_full_text_search_condition,
+            "substring": _create_substring_search_condition,
+            "trigram": _create_substring_search_condition,
+        }
+    )
+
     # --------------------------------------
     # Query string unparsing
 
@@ -394,9 +986,7 @@ class _BaseAdListView(ListView):
 
     @cached_property
     def _category_cache(self):
-        own_ad_count_condition = self._get_condition(categories=False, prefix="ad__")
-        own_ad_count = Count("ad", filter=own_ad_count_condition)
-        return Category.objects.annotate(own_ad_count=own_ad_count).cache()
+        return Category.objects.snapshot()
 
     @cached_property
     def _query_form(self):
@@ -412,9 +1002,76 @@ class _AdListView(_BaseAdListView):
 
     _URL_PATH = reverse_lazy("ads_list")
 
-    def _get_condition(self, *args, prefix="", **kwargs):
-        condition = super()._get_condition(*args, prefix=prefix, **kwargs)
-        return condition & Q(**{f"{prefix}verified": True})
+    # ==========================================================
+    # Page caching
+
+    def get(self, request, *args, **kwargs):
+        if not self._page_caching_used:
+            return super().get(request, *args, **kwargs)
+        # The key includes the data version, which is stored in the cache,
+        # so that conditional requests are answered without hitting the
+        # database. There's no Last-Modified header, since the version
+        # isn't a time the page was modified at.
+        etag = quote_etag(
+            md5(self._page_cache_key.encode(), usedforsecurity=False).hexdigest()
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self._get_cached_page_response(request, *args, **kwargs)
+        response.headers["ETag"] = etag
+        patch_vary_headers(response, ["Accept-Language", "Cookie"])
+        return response
+
+    @property
+    def _page_caching_used(self):
+        # Requests without a session are of anonymous users. The session
+        # cookie is checked instead of the user, since getting the user
+        # loads the session from the database.
+        return (
+            settings.ADS_LIST_PAGE_CACHING
+            and settings.SESSION_COOKIE_NAME not in self.request.COOKIES
+        )
+
+    def _get_cached_page_response(self, request, *args, **kwargs):
+        # The status and headers are cached with the content, so that
+        # cached responses are the same as rendered ones
+        cached = cache.get(self._page_cache_key)
+        if cached is not None:
+            status, headers, content = cached
+            return HttpResponse(content, status=status, headers=headers)
+        response = super().get(request, *args, **kwargs)
+        response.render()
+        cached = (response.status_code, dict(response.headers), response.content)
+        cache.set(self._page_cache_key, cached)
+        return response
+
+    @cached_property
+    def _page_cache_key(self):
+        # The parameters are sorted by name, but the order of values
+        # of each parameter is kept
+        parameters = sorted(self.request.GET.lists())
+        return self._make_cache_key("list_page", (get_language(), parameters))
+
+    def _get_condition(self, *args, **kwargs):
+        condition = super()._get_condition(*args, **kwargs)
+        return condition & Q(verified=True)
+
+    @cached_property
+    def _category_ad_counter_language(self):
+        if not settings.ADS_CATEGORY_AD_COUNTERS:
+            return None
+        form = self._query_form
+        if (
+            form.cleaned_min_price is not None
+            or form.cleaned_max_price is not None
+            or form.cleaned_search
+        ):
+            return None
+        languages = form.cleaned_languages
+        if len(languages) != 1:
+            return None
+        (language,) = languages
+        return language
 
     @staticmethod
     def get_category_url(pk):
@@ -438,13 +1095,25 @@ class _UserAdListView(_BaseAdListView):
         context["viewed_user"] = self._viewed_user
         return context
 
-    def _get_condition(self, *args, prefix="", **kwargs):
-        condition = super()._get_condition(*args, prefix=prefix, **kwargs)
-        condition &= Q(**{f"{prefix}author": self._viewed_user})
-        if self.request.user != self._viewed_user:
-            condition &= Q(**{f"{prefix}verified": True})
+    def _get_condition(self, *args, **kwargs):
+        condition = super()._get_condition(*args, **kwargs)
+        condition &= Q(author=self._viewed_user)
+        if not self._viewed_by_author:
+            condition &= Q(verified=True)
         return condition
 
+    def _get_ad_count_cache_key_parts(self):
+        parts = super()._get_ad_count_cache_key_parts()
+        return (*parts, self._viewed_user.pk, self._viewed_by_author)
+
+    def _get_category_tree_cache_key_parts(self):
+        parts = super()._get_category_tree_cache_key_parts()
+        return (*parts, self._viewed_user.pk, self._viewed_by_author)
+
+    @property
+    def _viewed_by_author(self):
+        return self.request.user == self._viewed_user
+
     @cached_property
     def _viewed_user(self):
         try:
@@ -456,6 +1125,34 @@ class _UserAdListView(_BaseAdListView):
 user_list = _UserAdListView.as_view()
 
 
+class _AdQueryFormCategorySearchView(TemplateView):
+    """
+    Search of categories for the category field of the ad query form.
+
+    Renders the field with the choices of the found categories (not
+    selected), which are added to the form on the ad list pages.
+    """
+
+    template_name = "ads/lists/_base/_category_search_results.html"
+    query_kwarg = "q"
+
+    _MAX_RESULTS = 20
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        category_cache = Category.objects.snapshot()
+        query_form = AdQueryForm(get_category_cache=lambda: category_cache)
+        query = self.request.GET.get(self.query_kwarg, "")
+        query_form.fields["categories"].choices = category_cache.search_choices(
+            query, self._MAX_RESULTS
+        )
+        context["query_form"] = query_form
+        return context
+
+
+category_search = _AdQueryFormCategorySearchView.as_view()
+
+
 class _AdDetailView(DetailView):
     model = Ad
     template_name = "ads/detail.html"
@@ -464,9 +1161,33 @@ class _AdDetailView(DetailView):
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        queryset = queryset.select_related("author", "category")
+        queryset = queryset.select_related("author")
         return queryset.prefetch_related("entries", "images")
 
+    def get_object(self, queryset=None):
+        ad = super().get_object(queryset)
+        # The category gets its full name without querying its ancestors
+        # one by one
+        if settings.CATEGORIES_SNAPSHOT:
+            ad.category = Category.objects.snapshot()[ad.category_id]
+        else:
+            ad.category = self._get_category_with_ancestors(ad.category_id)
+        return ad
+
+    @staticmethod
+    def _get_category_with_ancestors(pk):
+        """
+        Get category with its ancestors set as parents, fetching them with
+        a single query.
+        """
+        category = None
+        for category_or_ancestor in Category.objects.filter(
+            descendant_links__descendant=pk
+        ).order_by("-descendant_links__depth"):
+            category_or_ancestor.parent = category
+            category = category_or_ancestor
+        return category
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["entry"] = self._entry
@@ -503,7 +1224,10 @@ class _AdUpdateView(_AdAuthorRequiredMixin, UpdateView):
 
     def _perform_post_action(self, action):
         method = self._POST_ACTION_METHODS[action]
-        return method(self)
+        # In a single transaction with the refreshes of category ad
+        # counters made by signal receivers
+        with transaction.atomic():
+            return method(self)
 
     def _update(self):
         form = self._create_ad_form(self.request.POST)
@@ -585,7 +1309,7 @@ class _AdUpdateView(_AdAuthorRequiredMixin, UpdateView):
     def _create_ad_form(self, *args, **kwargs):
         return AdForm(
             *args,
-            category_cache=Category.objects.cache(),
+            category_cache=Category.objects.snapshot(),
             instance=self.object,
             **kwargs,
         )
@@ -615,8 +1339,12 @@ class _AdEntryCreateOrUpdateMixin(_AdAuthorRequiredMixin):
         return True
 
     def form_valid(self, form):
-        Ad.objects.filter(pk=self.kwargs["ad_pk"]).update(verified=False)
-        return super().form_valid(form)
+        # The ad is unverified in the same transaction as the entry is
+        # saved and its category ad counters are refreshed
+        with transaction.atomic():
+            Ad.objects.filter(pk=self.kwargs["ad_pk"]).update(verified=False)
+            transaction.on_commit(ad_data_version.bump)
+            return super().form_valid(form)
 
     def get_success_url(self):
         return reverse("ads_update", kwargs={"pk": self.kwargs["ad_pk"]})
@@ -693,7 +1421,10 @@ class _AdImagesUpdateView(_AdAuthorRequiredMixin, UpdateView):
 
     def _perform_post_action(self, action):
         method = self._POST_ACTION_METHODS[action]
-        return method(self)
+        # In a single transaction with the refreshes of category ad
+        # counters made by signal receivers
+        with transaction.atomic():
+            return method(self)
 
     def _add(self):
         formset = self._create_addition_formset(self.request.POST, self.request.FILES)
@@ -788,6 +1519,8 @@ class _AdImagesUpdateView(_AdAuthorRequiredMixin, UpdateView):
         if addition_formset is None:
             addition_formset = self._create_output_addition_formset()
         context["addition_formset"] = addition_formset
+        # The images of the ad object may be outdated after the actions
+        context["ordered_images"] = self._get_ordered_images()
         return context
 
     def _create_output_addition_formset(self, *args, **kwargs):
@@ -1,5 +1,3 @@
-from functools import cached_property
-
 from django.contrib import admin
 from django.utils.translation import pgettext_lazy
 from modeltranslation.admin import TranslationAdmin
@@ -50,14 +48,8 @@ class _CategoryAdmin(TranslationAdmin):
                 queryset = queryset.filter(parent_id=value)
             return queryset
 
-    @cached_property
+    @property
     def _parent_choices(self):
-        return [
-            (category.pk, category.full_name)
-            for category in sorted(
-                Category.objects.cache().values(),
-                key=lambda category: category.lowercased_full_name,
-            )
-        ]
+        return Category.objects.snapshot().choices
 
     list_filter = (_RootListFilter, "ultimate", _ParentListFilter)
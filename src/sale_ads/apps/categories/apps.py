@@ -5,3 +5,7 @@ from django.utils.translation import pgettext_lazy
 class CategoriesConfig(AppConfig):
     name = "categories"
     verbose_name = pgettext_lazy("app name", "categories")
+
+    def ready(self):
+        import categories.checks  # NOQA
+        import categories.signals  # NOQA
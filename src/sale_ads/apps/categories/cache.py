@@ -0,0 +1,4 @@
+from common.cache_versions import CacheVersion
+
+# Categories
+category_data_version = CacheVersion("categories.category_data")
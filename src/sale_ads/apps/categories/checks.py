@@ -0,0 +1,8 @@
+from django.core import checks
+
+from common.cache_versions import check_cache_is_shared
+
+
+@checks.register(checks.Tags.caches)
+def check_category_snapshot(app_configs, **kwargs):
+    return check_cache_is_shared(["CATEGORIES_SNAPSHOT"], "categories.E001")
@@ -0,0 +1,98 @@
+import random
+import tracemalloc
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from categories.models import Category
+from categories.tree import CategoryTree
+from common.benchmarking import measure
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure build time and memory of the category cache against the "
+        "number of categories. The benchmark data is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default=[1000, 10000, 100000], nargs="+", type=int
+        )
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, sizes, repeat, **options):
+        columns = ["categories", "cache", "tree", "properties", "memory"]
+        self.stdout.write(str.join("\t", columns))
+        with transaction.atomic():
+            # The sizes include the existing categories
+            pks = list(Category.objects.values_list("pk", flat=True))
+            for size in sorted(sizes):
+                pks += self._create_categories(pks, size - len(pks))
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE categories_category")
+                categories = list(Category.objects.all())
+                times = [
+                    measure(Category.objects.cache, repeat=repeat),
+                    measure(
+                        lambda: CategoryTree(
+                            categories, Category._concatenate_parent_and_child_names
+                        ),
+                        repeat=repeat,
+                    ),
+                    measure(
+                        self._access_properties,
+                        repeat=repeat,
+                        setup=lambda: Category.objects.cache().values(),
+                    ),
+                ]
+                memory = self._measure_memory()
+                row = [
+                    str(size),
+                    *(f"{value * 1000:.1f} ms" for value in times),
+                    f"{memory / 2**20:.1f} MiB",
+                ]
+                self.stdout.write(str.join("\t", row))
+            transaction.set_rollback(True)
+
+    def _create_categories(self, parent_pks, count):
+        """
+        Create categories with random parents.
+
+        The categories are created in chunks, so that parents of
+        categories of each chunk are chosen from the previous chunks.
+        """
+        pks = []
+        while len(pks) < count:
+            existing_pks = parent_pks + pks
+            chunk_size = min(count - len(pks), max(len(existing_pks), 10))
+            categories = Category.objects.bulk_create(
+                Category(
+                    name=uuid4().hex,
+                    parent_id=random.choice(existing_pks) if existing_pks else None,
+                    ultimate=True,
+                )
+                for i in range(chunk_size)
+            )
+            pks += [category.pk for category in categories]
+        return pks
+
+    @staticmethod
+    def _access_properties(categories):
+        """Access the properties of all categories used for category trees."""
+        for category in categories:
+            category.sorted_children
+            category.descendants
+            category.full_name
+            category.lowercased_full_name
+
+    @staticmethod
+    def _measure_memory():
+        """Measure memory retained by the cache."""
+        tracemalloc.start()
+        try:
+            cache = Category.objects.cache()  # NOQA
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
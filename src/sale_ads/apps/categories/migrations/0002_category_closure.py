@@ -0,0 +1,142 @@
+# Generated by Django 4.1.13 on 2026-10-18 00:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Links are maintained by a trigger, so that they are up to date
+# regardless of the way categories are saved (including bulk creation)
+CLOSURE_SQL = """
+CREATE FUNCTION categories_category_closure_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM categories_categoryclosure
+        WHERE ancestor_id = OLD.id OR descendant_id = OLD.id;
+        RETURN OLD;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO categories_categoryclosure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, NEW.id, depth + 1
+        FROM categories_categoryclosure
+        WHERE descendant_id = NEW.parent_id
+        UNION ALL
+        SELECT NEW.id, NEW.id, 0;
+        RETURN NEW;
+    END IF;
+    IF NEW.parent_id IS NOT DISTINCT FROM OLD.parent_id THEN
+        RETURN NEW;
+    END IF;
+    IF EXISTS (
+        SELECT FROM categories_categoryclosure
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+    ) THEN
+        RAISE EXCEPTION 'Category % can''t be moved into its subtree.', NEW.id;
+    END IF;
+    -- Detaching the subtree from the old ancestors
+    DELETE FROM categories_categoryclosure
+    WHERE
+        descendant_id IN (
+            SELECT descendant_id FROM categories_categoryclosure
+            WHERE ancestor_id = NEW.id
+        )
+        AND ancestor_id NOT IN (
+            SELECT descendant_id FROM categories_categoryclosure
+            WHERE ancestor_id = NEW.id
+        );
+    -- Attaching it to the new ones
+    INSERT INTO categories_categoryclosure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_link.ancestor_id, subtree_link.descendant_id,
+        ancestor_link.depth + subtree_link.depth + 1
+    FROM categories_categoryclosure AS ancestor_link
+    CROSS JOIN categories_categoryclosure AS subtree_link
+    WHERE
+        ancestor_link.descendant_id = NEW.parent_id
+        AND subtree_link.ancestor_id = NEW.id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER categories_category_closure_insert_update
+AFTER INSERT OR UPDATE OF parent_id ON categories_category
+FOR EACH ROW EXECUTE FUNCTION categories_category_closure_trigger();
+
+CREATE TRIGGER categories_category_closure_delete
+BEFORE DELETE ON categories_category
+FOR EACH ROW EXECUTE FUNCTION categories_category_closure_trigger();
+
+INSERT INTO categories_categoryclosure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE links (ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM categories_category
+    UNION ALL
+    SELECT links.ancestor_id, category.id, links.depth + 1
+    FROM links
+    JOIN categories_category AS category ON category.parent_id = links.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM links;
+"""
+
+REVERSE_CLOSURE_SQL = """
+DROP TRIGGER categories_category_closure_delete ON categories_category;
+DROP TRIGGER categories_category_closure_insert_update ON categories_category;
+DROP FUNCTION categories_category_closure_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.IntegerField(verbose_name="depth")),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="descendant_links",
+                        to="categories.category",
+                        verbose_name="ancestor",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="ancestor_links",
+                        to="categories.category",
+                        verbose_name="descendant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "category closure",
+                "verbose_name_plural": "category closures",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="categoryclosure",
+            index=models.Index(
+                fields=["descendant", "depth"], name="category_closure_descendant"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="categoryclosure",
+            constraint=models.UniqueConstraint(
+                fields=("ancestor", "descendant"),
+                name="ancestor_and_descendant_unique_together",
+            ),
+        ),
+        migrations.RunSQL(CLOSURE_SQL, REVERSE_CLOSURE_SQL),
+    ]
@@ -1,11 +1,20 @@
-from functools import cached_property
-from types import MappingProxyType
-
+import re
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from functools import cached_property, reduce
+from pathlib import Path
+
+from django.conf import settings
 from django.db import models
 from django.db.models.functions import Lower
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 
+from categories.cache import category_data_version
+from categories.tree import CategoryTree, MappedCategoryTree
+
 
 class _CategoryQuerySet(models.QuerySet):
     def cache(self):
@@ -44,12 +53,265 @@ class _CategoryQuerySet(models.QuerySet):
         >>> cached_child.lowercased_name
         'child'
         """
-        cache = self.in_bulk()
-        for category in cache.values():
+        categories = self.in_bulk()
+        tree = CategoryTree(
+            categories.values(), Category._concatenate_parent_and_child_names
+        )
+        cache = _CategoryCache(categories, tree)
+        for category in categories.values():
             category._cache = cache
+            category._tree = tree
+            category._tree_index = tree.get_index(category)
             if category.parent_id is not None:
-                category.parent = cache[category.parent_id]
-        return MappingProxyType(cache)
+                category.parent = categories[category.parent_id]
+        return cache
+
+    # Languages mapped to pairs of category data versions and caches
+    _snapshots = {}
+
+    def snapshot(self):
+        """
+        Get cache of all categories shared within the process.
+
+        Returns the same mapping as `cache()` called on all categories,
+        but the mapping is reused by all calls in the process (separately
+        for each language, since translated names are cached on access)
+        until the category data version changes.
+        The cached categories are shared, so they must not be modified.
+        The version is bumped on saving and deleting categories; after
+        bulk changes it should be bumped with
+        `category_data_version.bump()`.
+        If the `CATEGORIES_SNAPSHOT` setting is false, works the same as
+        `cache()` called on all categories.
+        If the `CATEGORIES_SHARED_SNAPSHOT_DIR` setting is set, the
+        mapping is backed by a file in the directory mapped to memory
+        (see `_map_shared_snapshot()`).
+        """
+        manager = self.model._default_manager
+        if not settings.CATEGORIES_SNAPSHOT:
+            return manager.cache()
+        language = get_language()
+        version = category_data_version.get()
+        snapshot = self._snapshots.get(language)
+        if snapshot is None or snapshot[0] != version:
+            cache = (
+                self._map_shared_snapshot(language, version)
+                if settings.CATEGORIES_SHARED_SNAPSHOT_DIR
+                else manager.cache()
+            )
+            snapshot = self._snapshots[language] = (version, cache)
+        return snapshot[1]
+
+    def _map_shared_snapshot(self, language, version):
+        """
+        Map file of category tree of language and data version.
+
+        The file is shared by processes using the same directory: it's
+        written by the first process that needs it (atomically, so that
+        concurrent writers don't conflict), and the files of older
+        versions are removed then.
+        """
+        directory = Path(settings.CATEGORIES_SHARED_SNAPSHOT_DIR)
+        prefix = f"categories-{language}-"
+        path = directory / f"{prefix}{version}"
+        try:
+            return _MappedCategoryCache(path)
+        except FileNotFoundError:
+            pass
+        directory.mkdir(parents=True, exist_ok=True)
+        self.model._default_manager.cache()._tree.write(path)
+        for other_path in directory.glob(f"{prefix}*"):
+            other_version = other_path.name.removeprefix(prefix)
+            if other_version.isdigit() and int(other_version) < version:
+                other_path.unlink(missing_ok=True)
+        return _MappedCategoryCache(path)
+
+
+class _CategoryCache(Mapping):
+    """
+    Read-only mapping of cached categories.
+
+    Besides the categories, provides choices of categories sorted
+    case-insensitively by full names and search by full names,
+    computed once per cache (in the language that is active then).
+    """
+
+    def __init__(self, categories, tree):
+        self._categories = categories
+        self._tree = tree
+
+    def __getitem__(self, pk):
+        return self._categories[pk]
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._categories!r})"
+
+    @property
+    def sorted_roots(self):
+        """Root categories sorted case-insensitively by name."""
+        return self._tree.get_sorted_roots()
+
+    @cached_property
+    def choices(self):
+        """Pairs of primary keys and full names of all categories."""
+        tree = self._tree
+        return tuple(
+            (tree.get_pk(index), tree.get_full_name(index))
+            for index in self._sorted_indices
+        )
+
+    @cached_property
+    def ultimate_choices(self):
+        """Pairs of primary keys and full names of ultimate categories."""
+        tree = self._tree
+        return tuple(
+            (tree.get_pk(index), tree.get_full_name(index))
+            for index in self._sorted_indices
+            if tree.is_ultimate(index)
+        )
+
+    @cached_property
+    def choice_values(self):
+        """Primary keys of all categories as strings, as submitted in forms."""
+        return frozenset(map(str, self))
+
+    @cached_property
+    def _sorted_indices(self):
+        """Indices of categories in the tree sorted by full names."""
+        return self._tree.get_indices_sorted_by_full_name()
+
+    def get_choices_selected_first(self, pks):
+        """
+        Get choices of all categories with selected ones first.
+
+        Both the selected and the other choices are sorted.
+        The choices aren't resorted; the other choices are copied in
+        slices between the selected ones.
+        """
+        indices = sorted({self._choice_indices[pk] for pk in pks})
+        choices = [self.choices[index] for index in indices]
+        start = 0
+        for index in indices:
+            choices += self.choices[start:index]
+            start = index + 1
+        choices += self.choices[start:]
+        return tuple(choices)
+
+    @cached_property
+    def _choice_indices(self):
+        return {pk: index for index, (pk, full_name) in enumerate(self.choices)}
+
+    def get_selected_choices(self, pks):
+        """Get sorted choices of selected categories."""
+        indices = sorted({self._choice_indices[pk] for pk in pks})
+        return tuple(self.choices[index] for index in indices)
+
+    def search_choices(self, query, limit):
+        """
+        Get sorted choices of categories whose full names match query.
+
+        A full name matches if any of its words, together with the rest
+        of the full name, starts with the query (case-insensitively and
+        with whitespace runs treated as single spaces).
+        At most `limit` first choices are returned.
+        """
+        query = self._normalize_search_text(query.lower())
+        if not query:
+            return ()
+        prefixes, indices = self._prefix_index
+        found = set()
+        for position in range(bisect_left(prefixes, query), len(prefixes)):
+            if not prefixes[position].startswith(query):
+                break
+            found.add(indices[position])
+        return tuple(self.choices[index] for index in sorted(found)[:limit])
+
+    @cached_property
+    def _prefix_index(self):
+        """
+        Prefix index over lowercased full names of categories.
+
+        Consists of the sorted suffixes of the full names starting at
+        the words and the indices of choices of the respective
+        categories.
+        """
+        entries = sorted(
+            (full_name[match.start() :], index)
+            for index, tree_index in enumerate(self._sorted_indices)
+            for full_name in [
+                self._normalize_search_text(
+                    self._tree.get_lowercased_full_name(tree_index)
+                )
+            ]
+            for match in self._WORD_START_PATTERN.finditer(full_name)
+        )
+        return (
+            [suffix for suffix, index in entries],
+            array("i", [index for suffix, index in entries]),
+        )
+
+    _WORD_START_PATTERN = re.compile(r"\b\w")
+
+    @staticmethod
+    def _normalize_search_text(text):
+        # The full names contain non-breaking spaces
+        return str.join(" ", text.split())
+
+
+class _MappedCategoryCache(_CategoryCache):
+    """
+    Read-only mapping of categories of mapped category tree file.
+
+    The categories are created on first access (with their ancestors),
+    so that only the accessed ones take memory of the process.
+    The created categories are cached the same way as the categories of
+    `_CategoryCache`, but only in the language of the file.
+    """
+
+    def __init__(self, path):
+        super().__init__({}, MappedCategoryTree(path, self._get_category))
+
+    def __getitem__(self, pk):
+        index = self._tree.find_index(pk)
+        if index is None:
+            raise KeyError(pk)
+        return self._get_category(index)
+
+    def __iter__(self):
+        return iter(self._tree.get_pks())
+
+    def __len__(self):
+        return len(self._tree)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {len(self)} categories>"
+
+    def _get_category(self, index):
+        # The created categories are keyed by indices
+        try:
+            return self._categories[index]
+        except KeyError:
+            pass
+        tree = self._tree
+        parent_index = tree.get_parent_index(index)
+        category = Category(
+            pk=tree.get_pk(index),
+            name=tree.get_name(index),
+            ultimate=tree.is_ultimate(index),
+        )
+        category._cache = self
+        category._tree = tree
+        category._tree_index = index
+        if parent_index is not None:
+            category.parent = self._get_category(parent_index)
+        self._categories[index] = category
+        return category
 
 
 class Category(models.Model):
@@ -59,16 +321,22 @@ class Category(models.Model):
                 return super().__new__(cls)
             return lambda compute: cls(compute, **kwargs)
 
-        def __init__(self, compute, *, freeze=None):
+        def __init__(self, compute, *, freeze=None, from_tree=None):
             super().__init__()
             self._compute = compute
             self._freeze = freeze
+            # Name of the method of the tree of the cache getting the value
+            # of a cached category by the index of the category
+            self._from_tree = from_tree
             self.__doc__ = compute.__doc__
 
         def __get__(self, instance, owner=None):
             if instance is None:
                 return super().__get__(instance, owner)
             if instance._cache is not None:
+                if self._from_tree is not None:
+                    get_value = getattr(instance._tree, self._from_tree)
+                    return get_value(instance._tree_index)
                 return getattr(instance, self._cache_attr_name)
             return self._compute(instance)
 
@@ -199,23 +467,47 @@ class Category(models.Model):
     @property
     def all_children(self):
         if self._cache is not None:
-            return self._cached_all_children
+            return self._tree.get_children(self._tree_index)
         return self.children.all()
 
-    @cached_property
-    def _cached_all_children(self):
-        return frozenset(
-            category for category in self._cache.values() if category.parent == self
+    @_cacheable_readonly_property(freeze=tuple, from_tree="get_ancestors")
+    def ancestors(self):
+        """
+        Ancestor categories ordered from the root.
+
+        The ancestors of a saved non-cached category, whose parent isn't
+        loaded yet, are fetched with a single query.
+        """
+        if self._ancestors_fetchable:
+            return list(
+                Category.objects.filter(
+                    descendant_links__descendant=self, descendant_links__depth__gt=0
+                ).order_by("-descendant_links__depth")
+            )
+        ancestors = []
+        category = self.parent
+        while category is not None:
+            ancestors.append(category)
+            category = category.parent
+        return ancestors[::-1]
+
+    @property
+    def _ancestors_fetchable(self):
+        return (
+            self._cache is None
+            and self.pk is not None
+            and self.parent_id is not None
+            and not Category.parent.is_cached(self)
         )
 
-    @_cacheable_readonly_property(freeze=frozenset)
+    @_cacheable_readonly_property(freeze=frozenset, from_tree="get_descendants")
     def descendants(self):
         descendants = set(self.all_children)
         for child in self.all_children:
             descendants.update(child.descendants)
         return descendants
 
-    @_cacheable_readonly_property
+    @_cacheable_readonly_property(from_tree="get_full_name")
     def full_name(self):
         r"""
         Example:
@@ -234,9 +526,12 @@ class Category(models.Model):
         >>> root_grandchild.full_name
         'root\xa0/ root child\xa0/ root grandchild'
         """
+        if self._ancestors_fetchable:
+            names = [*(ancestor.name for ancestor in self.ancestors), self.name]
+            return reduce(self._concatenate_parent_and_child_names, names)
         return self.name_relative_to(None)
 
-    @_cacheable_readonly_property
+    @_cacheable_readonly_property(from_tree="get_lowercased_full_name")
     def lowercased_full_name(self):
         if self.parent is not None:
             return self._concatenate_parent_and_child_names(
@@ -244,11 +539,53 @@ class Category(models.Model):
             )
         return self.lowercased_name
 
-    @_cacheable_readonly_property
+    @_cacheable_readonly_property(from_tree="get_lowercased_name")
     def lowercased_name(self):
         return self.name.lower()
 
-    @_cacheable_readonly_property(freeze=tuple)
+    @_cacheable_readonly_property(freeze=tuple, from_tree="get_sorted_children")
     def sorted_children(self):
         """Child categories sorted case-insensitively by name."""
         return sorted(self.all_children, key=lambda category: category.lowercased_name)
+
+
+class CategoryClosure(models.Model):
+    """
+    Link of category to itself or its descendant.
+
+    The links of all categories are maintained by a database trigger
+    (see migrations), so that bulk creation and updates keep them up to
+    date too.
+    The depth is the number of levels between the categories (0 for the
+    link of a category to itself).
+    """
+
+    # Links are deleted with their categories by the trigger
+    ancestor = models.ForeignKey(
+        Category,
+        models.DO_NOTHING,
+        "descendant_links",
+        verbose_name=pgettext_lazy("category closure field", "ancestor"),
+    )
+    depth = models.IntegerField(pgettext_lazy("category closure field", "depth"))
+    descendant = models.ForeignKey(
+        Category,
+        models.DO_NOTHING,
+        "ancestor_links",
+        verbose_name=pgettext_lazy("category closure field", "descendant"),
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="ancestor_and_descendant_unique_together",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["descendant", "depth"], name="category_closure_descendant"
+            )
+        ]
+        verbose_name = pgettext_lazy("model", "category closure")
+        verbose_name_plural = pgettext_lazy("model plural", "category closures")
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.cache import category_data_version
+from categories.models import Category
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Category)
+def bump_category_data_version(**kwargs):
+    # Bumping after the commit, so that snapshots rebuilt for the new
+    # version don't miss the change
+    transaction.on_commit(category_data_version.bump)
@@ -1,12 +1,22 @@
 from collections import Counter
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import Mock, patch
 
-from django.db import models
-from django.test import SimpleTestCase, TestCase
+from django.core.cache import cache
+from django.db import DatabaseError, models, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import translation
 
 import categories.models
 from ads.views import _AdListView
-from categories.models import Category, _CategoryQuerySet
+from categories.cache import category_data_version
+from categories.models import (
+    Category,
+    CategoryClosure,
+    _CategoryQuerySet,
+    _MappedCategoryCache,
+)
 from common.tests import SaleAdsTestMixin
 from common.tests.utils.doctest_in_unittest_mixin import DocTestInUnitTestMixin
 
@@ -240,6 +250,27 @@ class CategoryCacheableReadOnlyPropertyTest(SaleAdsTestMixin, TestCase):
         self.assertEqual(second_value, self.first_compute_result)
         compute.assert_called_once_with(self.cached_category)
 
+    def test_from_tree_on_cached_category(self):
+        compute = Mock()
+        property = Category._cacheable_readonly_property(from_tree="get_full_name")(
+            compute
+        )
+        tree = self.cached_category._tree
+        with self.patch(property), patch.object(tree, "get_full_name") as from_tree:
+            value = getattr(self.cached_category, self.property_name)
+        self.assertEqual(value, from_tree.return_value)
+        compute.assert_not_called()
+        from_tree.assert_called_once_with(self.cached_category._tree_index)
+
+    def test_from_tree_on_non_cached_category(self):
+        compute = Mock()
+        property = Category._cacheable_readonly_property(from_tree="get_full_name")(
+            compute
+        )
+        with self.patch(property):
+            value = getattr(self.non_cached_category, self.property_name)
+        self.assertEqual(value, compute.return_value)
+
     def test_on_class(self):
         property = Category._cacheable_readonly_property(Mock())
         with self.patch(property):
@@ -382,6 +413,46 @@ class CategoryAllChildrenTest(SaleAdsTestMixin, TestCase):
         self.assertEqual(self.cached_branch.all_children, first_value)
 
 
+class CategoryAncestorsTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        cls.root = category_factory.create()
+        cls.root_child = category_factory.create(parent=cls.root)
+        cls.root_grandchild = category_factory.create(parent=cls.root_child)
+
+    def test_on_non_cached_category_fetches_in_one_query(self):
+        category = Category.objects.get(pk=self.root_grandchild.pk)
+        with self.assertNumQueries(1):
+            value = category.ancestors
+        self.assertEqual(value, [self.root, self.root_child])
+
+    def test_on_non_cached_root(self):
+        category = Category.objects.get(pk=self.root.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(category.ancestors, [])
+
+    def test_on_non_cached_category_with_loaded_parent(self):
+        category = Category.objects.get(pk=self.root_child.pk)
+        parent = Category(name=self.create_category_name_factory().get_unique())
+        category.parent = parent
+        with self.assertNumQueries(0):
+            self.assertEqual(category.ancestors, [parent])
+
+    def test_on_cached_category(self):
+        cache = Category.objects.cache()
+        with self.assertNumQueries(0):
+            value = cache[self.root_grandchild.pk].ancestors
+        self.assertEqual(value, (cache[self.root.pk], cache[self.root_child.pk]))
+
+    def test_is_cacheable_readonly_property(self):
+        self.assertIsInstance(Category.ancestors, Category._cacheable_readonly_property)
+
+    def test_freezes_on_cached_category_to_tuple(self):
+        self.assertIs(Category.ancestors._freeze, tuple)
+
+
 class CategoryDescendantsTest(SaleAdsTestMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -440,6 +511,18 @@ class CategoryFullNameTest(SaleAdsTestMixin, DocTestInUnitTestMixin, SimpleTestC
         self.doctest_object(Category.full_name, vars(categories.models))
 
 
+class CategoryFullNameFetchingTest(SaleAdsTestMixin, TestCase):
+    def test(self):
+        category_factory = self.create_category_factory()
+        root = category_factory.create()
+        root_child = category_factory.create(parent=root)
+        root_grandchild = category_factory.create(parent=root_child)
+        category = Category.objects.get(pk=root_grandchild.pk)
+        with self.assertNumQueries(1):
+            value = category.full_name
+        self.assertEqual(value, root_grandchild.name_relative_to(None))
+
+
 class CategoryLowercasedFullNameTest(SaleAdsTestMixin, SimpleTestCase):
     def setUp(self):
         super().setUp()
@@ -575,3 +658,305 @@ class CategoryQuerySetCacheTest(SaleAdsTestMixin, DocTestInUnitTestMixin, TestCa
 
     def test_docstring(self):
         self.doctest_object(_CategoryQuerySet.cache, vars(categories.models))
+
+
+class CategoryCacheChoicesTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        # Names whose case-sensitive order differs from case-insensitive one
+        cls.root = category_factory.create(name="b")
+        cls.root_child = category_factory.create(
+            name="C", parent=cls.root, ultimate=True
+        )
+        cls.other_root = category_factory.create(name="A", ultimate=True)
+        cls.last_root = category_factory.create(name="d")
+
+    def setUp(self):
+        super().setUp()
+        self.cache = Category.objects.cache()
+
+    def test_choices(self):
+        expected = self._create_choices(
+            [self.other_root, self.root, self.root_child, self.last_root]
+        )
+        self.assertEqual(self.cache.choices, expected)
+
+    def test_ultimate_choices(self):
+        expected = self._create_choices([self.other_root, self.root_child])
+        self.assertEqual(self.cache.ultimate_choices, expected)
+
+    def test_choices_computed_once(self):
+        self.assertIs(self.cache.choices, self.cache.choices)
+        self.assertIs(self.cache.ultimate_choices, self.cache.ultimate_choices)
+
+    def test_choices_in_language_of_cache(self):
+        Category.objects.filter(pk=self.other_root.pk).update(name_ru="е")
+        with translation.override("ru"):
+            cache = Category.objects.cache()
+            expected = self._create_choices(
+                [self.root, self.root_child, self.last_root, self.other_root], cache
+            )
+            self.assertEqual(cache.choices, expected)
+        self.assertEqual(expected[-1], (self.other_root.pk, "е"))
+
+    def test_get_choices_selected_first(self):
+        result = self.cache.get_choices_selected_first(
+            [self.last_root.pk, self.root.pk, self.last_root.pk]
+        )
+        expected = self._create_choices(
+            [self.root, self.last_root, self.other_root, self.root_child]
+        )
+        self.assertEqual(result, expected)
+
+    def test_get_choices_selected_first_without_selected(self):
+        result = self.cache.get_choices_selected_first([])
+        self.assertEqual(result, self.cache.choices)
+
+    def test_choice_values(self):
+        expected = {
+            str(category.pk)
+            for category in [
+                self.root,
+                self.root_child,
+                self.other_root,
+                self.last_root,
+            ]
+        }
+        self.assertEqual(self.cache.choice_values, expected)
+
+    def test_get_selected_choices(self):
+        result = self.cache.get_selected_choices(
+            [self.last_root.pk, self.root.pk, self.last_root.pk]
+        )
+        expected = self._create_choices([self.root, self.last_root])
+        self.assertEqual(result, expected)
+
+    def test_search_choices(self):
+        # Full names: "A", "b", "b / C", "d"
+        for query, expected_categories in [
+            ("b", [self.root, self.root_child]),
+            (" B ", [self.root, self.root_child]),
+            ("c", [self.root_child]),
+            ("b / c", [self.root_child]),
+            ("b /", [self.root_child]),
+            ("e", []),
+            ("", []),
+        ]:
+            with self.subTest(query=query):
+                result = self.cache.search_choices(query, 10)
+                self.assertEqual(result, self._create_choices(expected_categories))
+
+    def test_search_choices_limit(self):
+        result = self.cache.search_choices("b", 1)
+        self.assertEqual(result, self._create_choices([self.root]))
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            self.cache[self.root.pk] = self.root
+
+    def _create_choices(self, categories, cache=None):
+        cache = self.cache if cache is None else cache
+        return tuple(
+            (category.pk, cache[category.pk].full_name) for category in categories
+        )
+
+
+@override_settings(CATEGORIES_SNAPSHOT=True)
+class CategoryQuerySetSnapshotTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category_factory = cls.create_category_factory()
+        cls.categories = Category.objects.bulk_create(
+            cls.category_factory.create(save=False) for i in range(2)
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.enterContext(patch.dict(_CategoryQuerySet._snapshots, clear=True))
+
+    def test(self):
+        result = Category.objects.snapshot()
+        self.assertEqual(len(result), len(self.categories))
+        for category in self.categories:
+            cached_category = result[category.pk]
+            self.assertEqual(cached_category, category)
+            self.assertEqual(cached_category._cache, result)
+
+    def test_reused(self):
+        first_result = Category.objects.snapshot()
+        with self.assertNumQueries(0):
+            second_result = Category.objects.snapshot()
+        self.assertIs(second_result, first_result)
+
+    def test_rebuilt_after_version_bump(self):
+        first_result = Category.objects.snapshot()
+        category_data_version.bump()
+        second_result = Category.objects.snapshot()
+        self.assertIsNot(second_result, first_result)
+        self.assertEqual(second_result, first_result)
+
+    def test_rebuilt_after_category_creation(self):
+        Category.objects.snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            new_category = self.category_factory.create()
+        self.assertIn(new_category.pk, Category.objects.snapshot())
+
+    def test_separate_for_languages(self):
+        with translation.override("en"):
+            first_en_result = Category.objects.snapshot()
+        with translation.override("ru"):
+            ru_result = Category.objects.snapshot()
+        with translation.override("en"), self.assertNumQueries(0):
+            second_en_result = Category.objects.snapshot()
+        self.assertIsNot(ru_result, first_en_result)
+        self.assertIs(second_en_result, first_en_result)
+
+    @override_settings(CATEGORIES_SNAPSHOT=False)
+    def test_disabled(self):
+        first_result = Category.objects.snapshot()
+        with self.assertNumQueries(1):
+            second_result = Category.objects.snapshot()
+        self.assertIsNot(second_result, first_result)
+        self.assertEqual(second_result, first_result)
+
+
+class CategoryQuerySetSharedSnapshotTest(CategoryQuerySetSnapshotTest):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.child = cls.category_factory.create(parent=cls.categories[0])
+        cls.categories.append(cls.child)
+
+    def setUp(self):
+        super().setUp()
+        self.directory = Path(self.enterContext(TemporaryDirectory()))
+        self.enterContext(
+            override_settings(
+                CATEGORIES_SNAPSHOT=True, CATEGORIES_SHARED_SNAPSHOT_DIR=self.directory
+            )
+        )
+
+    def test_mapped(self):
+        result = Category.objects.snapshot()
+        self.assertIsInstance(result, _MappedCategoryCache)
+        (path,) = self.directory.iterdir()
+        self.assertIn(str(category_data_version.get()), path.name)
+
+    def test_coincides_with_cache(self):
+        result = Category.objects.snapshot()
+        expected_cache = Category.objects.cache()
+        self.assertEqual(sorted(result), sorted(expected_cache))
+        self.assertEqual(result.choices, expected_cache.choices)
+        self.assertEqual(result.ultimate_choices, expected_cache.ultimate_choices)
+        self.assertEqual(result.sorted_roots, expected_cache.sorted_roots)
+        for pk, expected in expected_cache.items():
+            with self.subTest(category=expected):
+                category = result[pk]
+                for name in [
+                    "ancestors",
+                    "descendants",
+                    "full_name",
+                    "lowercased_full_name",
+                    "lowercased_name",
+                    "name",
+                    "parent",
+                    "sorted_children",
+                    "ultimate",
+                ]:
+                    self.assertEqual(
+                        getattr(category, name), getattr(expected, name), name
+                    )
+                self.assertEqual(category.all_children, expected.all_children)
+
+    def test_categories_created_on_access(self):
+        result = Category.objects.snapshot()
+        with self.assertNumQueries(0):
+            child = result[self.child.pk]
+            self.assertIs(child.parent, result[self.child.parent_id])
+        self.assertEqual(len(result._categories), 2)
+
+    def test_shared_by_processes(self):
+        first_result = Category.objects.snapshot()
+        # As if in another process
+        _CategoryQuerySet._snapshots.clear()
+        with self.assertNumQueries(0):
+            second_result = Category.objects.snapshot()
+        self.assertIsNot(second_result, first_result)
+        self.assertEqual(second_result, first_result)
+
+    def test_older_files_removed(self):
+        Category.objects.snapshot()
+        category_data_version.bump()
+        Category.objects.snapshot()
+        (path,) = self.directory.iterdir()
+        self.assertIn(str(category_data_version.get()), path.name)
+
+    def test_missing_key(self):
+        result = Category.objects.snapshot()
+        nonexistent_pk = max(category.pk for category in self.categories) + 1
+        self.assertNotIn(nonexistent_pk, result)
+        with self.assertRaises(KeyError):
+            result[nonexistent_pk]
+
+
+###############################################################################
+# Closure
+
+
+class CategoryClosureTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category_factory = cls.create_category_factory()
+        cls.root = cls.category_factory.create()
+        cls.root_child = cls.category_factory.create(parent=cls.root)
+        cls.root_grandchild = cls.category_factory.create(parent=cls.root_child)
+        cls.other_root = cls.category_factory.create()
+
+    def test_creation(self):
+        self._assert_links_match_parents()
+
+    def test_bulk_creation(self):
+        parent = Category.objects.bulk_create(
+            [self.category_factory.create(parent=self.root_child, save=False)]
+        )[0]
+        Category.objects.bulk_create(
+            [self.category_factory.create(parent=parent, save=False)]
+        )
+        self._assert_links_match_parents()
+
+    def test_moving(self):
+        self.root_child.parent = self.other_root
+        self.root_child.save()
+        self._assert_links_match_parents()
+
+    def test_moving_to_root(self):
+        Category.objects.filter(pk=self.root_child.pk).update(parent=None)
+        self._assert_links_match_parents()
+
+    def test_moving_into_subtree(self):
+        self.root.parent = self.root_grandchild
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            self.root.save()
+        self._assert_links_match_parents()
+
+    def test_deletion(self):
+        self.root_grandchild.delete()
+        self._assert_links_match_parents()
+
+    def _assert_links_match_parents(self):
+        parents = dict(Category.objects.values_list("pk", "parent"))
+        expected = set()
+        for pk in parents:
+            ancestor_pk = pk
+            depth = 0
+            while ancestor_pk is not None:
+                expected.add((ancestor_pk, pk, depth))
+                ancestor_pk = parents[ancestor_pk]
+                depth += 1
+        actual = CategoryClosure.objects.values_list("ancestor", "descendant", "depth")
+        self.assertSetEqual(set(actual), expected)
@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from categories.cache import category_data_version
+from common.tests import SaleAdsTestMixin
+
+
+class CategoryDataVersionBumpingTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = cls.create_category_factory().create()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_creation(self):
+        self._test(lambda: self.create_category_factory().create())
+
+    def test_update(self):
+        self.category.name = self.create_category_name_factory().get_unique()
+        self._test(self.category.save)
+
+    def test_deletion(self):
+        self._test(self.category.delete)
+
+    def test_not_bumped_before_commit(self):
+        old_value = category_data_version.get()
+        with self.captureOnCommitCallbacks():
+            self.create_category_factory().create()
+            self.assertEqual(category_data_version.get(), old_value)
+
+    def test_non_category_data_change(self):
+        old_value = category_data_version.get()
+        self.create_user_factory().create()
+        self.assertEqual(category_data_version.get(), old_value)
+
+    def _test(self, change):
+        old_value = category_data_version.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertNotEqual(category_data_version.get(), old_value)
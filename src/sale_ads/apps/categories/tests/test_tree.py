@@ -0,0 +1,154 @@
+import os
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase
+
+from categories.models import Category
+from categories.tree import CategoryTree, MappedCategoryTree
+from common.tests import SaleAdsTestMixin
+
+
+class CategoryTreeTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category_factory = cls.create_category_factory()
+        name_factory = cls.create_category_name_factory()
+        roots = [category_factory.create() for i in range(2)]
+        children = [
+            # Mixed case, so that sorting is checked to be case-insensitive
+            category_factory.create(name=name.upper() if i % 2 else name, parent=root)
+            for root in roots
+            for i, name in enumerate(name_factory.get_unique() for i in range(3))
+        ]
+        for child in children[:2]:
+            category_factory.create(parent=child)
+
+    def setUp(self):
+        super().setUp()
+        self.categories = list(Category.objects.all())
+        self.tree = CategoryTree(
+            self.categories, Category._concatenate_parent_and_child_names
+        )
+
+    def test_indices_in_depth_first_order(self):
+        for category in self.categories:
+            index = self.tree.get_index(category)
+            for descendant in category.descendants:
+                descendant_index = self.tree.get_index(descendant)
+                self.assertGreater(descendant_index, index)
+                self.assertLessEqual(
+                    descendant_index, index + len(category.descendants)
+                )
+
+    def test_ancestors(self):
+        self._test("get_ancestors", lambda category: tuple(category.ancestors))
+
+    def test_children(self):
+        self._test("get_children", lambda category: frozenset(category.all_children))
+
+    def test_descendants(self):
+        self._test("get_descendants", lambda category: frozenset(category.descendants))
+
+    def test_full_name(self):
+        self._test("get_full_name", lambda category: category.name_relative_to(None))
+
+    def test_lowercased_full_name(self):
+        self._test(
+            "get_lowercased_full_name",
+            lambda category: category.name_relative_to(None).lower(),
+        )
+
+    def test_lowercased_name(self):
+        self._test("get_lowercased_name", lambda category: category.name.lower())
+
+    def test_sorted_children(self):
+        self._test(
+            "get_sorted_children",
+            lambda category: tuple(
+                sorted(category.all_children, key=lambda child: child.name.lower())
+            ),
+        )
+
+    def test_name(self):
+        self._test("get_name", lambda category: category.name)
+
+    def test_pk(self):
+        self._test("get_pk", lambda category: category.pk)
+
+    def test_ultimate(self):
+        self._test("is_ultimate", lambda category: category.ultimate)
+
+    def test_sorted_roots(self):
+        expected = sorted(
+            (category for category in self.categories if category.parent is None),
+            key=lambda category: category.name.lower(),
+        )
+        self.assertEqual(list(self.tree.get_sorted_roots()), expected)
+
+    def test_indices_sorted_by_full_name(self):
+        result = [
+            self.tree.get_lowercased_full_name(index)
+            for index in self.tree.get_indices_sorted_by_full_name()
+        ]
+        expected = sorted(
+            category.name_relative_to(None).lower() for category in self.categories
+        )
+        self.assertEqual(result, expected)
+
+    def _test(self, method_name, compute_expected):
+        for category in self.categories:
+            with self.subTest(category=category):
+                index = self.tree.get_index(category)
+                actual = getattr(self.tree, method_name)(index)
+                self.assertEqual(actual, compute_expected(category))
+
+
+class MappedCategoryTreeTest(CategoryTreeTest):
+    def setUp(self):
+        super().setUp()
+        directory = self.enterContext(TemporaryDirectory())
+        path = os.path.join(directory, "tree")
+        self.tree.write(path)
+        categories = {category.pk: category for category in self.categories}
+        self.tree = MappedCategoryTree(
+            path, lambda index: categories[self.tree.get_pk(index)]
+        )
+
+    def test_find_index(self):
+        for category in self.categories:
+            with self.subTest(category=category):
+                index = self.tree.find_index(category.pk)
+                self.assertEqual(self.tree.get_pk(index), category.pk)
+        nonexistent_pk = max(category.pk for category in self.categories) + 1
+        for pk in [nonexistent_pk, str(self.categories[0].pk)]:
+            with self.subTest(pk=pk):
+                self.assertIsNone(self.tree.find_index(pk))
+
+    def test_parent_index(self):
+        for category in self.categories:
+            with self.subTest(category=category):
+                index = self.tree.get_parent_index(self.tree.get_index(category))
+                if category.parent is None:
+                    self.assertIsNone(index)
+                else:
+                    self.assertEqual(self.tree.get_pk(index), category.parent_id)
+
+    def test_invalid_file(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree")
+            with open(path, "wb") as file:
+                file.write(b"\0" * 1024)
+            with self.assertRaises(ValueError):
+                MappedCategoryTree(path, lambda index: None)
+
+
+class MappedEmptyCategoryTreeTest(TestCase):
+    def test(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree")
+            CategoryTree([], Category._concatenate_parent_and_child_names).write(path)
+            tree = MappedCategoryTree(path, lambda index: None)
+            self.assertEqual(len(tree), 0)
+            self.assertEqual(tree.get_sorted_roots(), ())
+            self.assertIsNone(tree.find_index(1))
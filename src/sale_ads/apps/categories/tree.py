@@ -0,0 +1,338 @@
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+
+
+class _BaseCategoryTree:
+    """
+    Tree of categories indexed in the depth-first order.
+
+    The categories are indexed with children sorted case-insensitively
+    by name, so that the descendants of a category directly follow it.
+    The children of the category with index `i` are stored in
+    `_child_indices[_child_offsets[i]:_child_offsets[i + 1]]`.
+    """
+
+    _NO_PARENT = -1
+
+    def __len__(self):
+        return len(self._parent_indices)
+
+    def get_ancestors(self, index):
+        ancestors = []
+        index = self._parent_indices[index]
+        while index != self._NO_PARENT:
+            ancestors.append(self._get_category(index))
+            index = self._parent_indices[index]
+        return tuple(reversed(ancestors))
+
+    def get_children(self, index):
+        try:
+            return self._children_sets[index]
+        except KeyError:
+            value = self._children_sets[index] = frozenset(
+                self.get_sorted_children(index)
+            )
+            return value
+
+    def get_descendants(self, index):
+        try:
+            return self._descendant_sets[index]
+        except KeyError:
+            value = self._descendant_sets[index] = frozenset(
+                map(self._get_category, range(index + 1, self._subtree_ends[index]))
+            )
+            return value
+
+    def get_full_name(self, index):
+        return self._full_names[index]
+
+    def get_lowercased_full_name(self, index):
+        return self._lowercased_full_names[index]
+
+    def get_lowercased_name(self, index):
+        return self._lowercased_names[index]
+
+    def get_name(self, index):
+        return self._names[index]
+
+    def get_sorted_children(self, index):
+        return tuple(
+            map(
+                self._get_category,
+                self._child_indices[
+                    self._child_offsets[index] : self._child_offsets[index + 1]
+                ],
+            )
+        )
+
+    def get_sorted_roots(self):
+        """Root categories sorted case-insensitively by name."""
+        roots = []
+        index = 0
+        while index < len(self):
+            roots.append(self._get_category(index))
+            index = self._subtree_ends[index]
+        return tuple(roots)
+
+
+class CategoryTree(_BaseCategoryTree):
+    """
+    Compact tree of cached categories.
+
+    The tree is built in a single pass over the categories (apart from
+    sorting children by name).
+    The names are computed once, with the current language.
+    """
+
+    def __init__(self, categories, join_names):
+        """
+        Build the tree.
+
+        The parents of the categories must be among the categories.
+        `join_names` is called with the full name of the parent and the
+        name of the child to get the full name of the child.
+        """
+        # Names are translated on access, so each name is got once
+        children = {}
+        for category in categories:
+            name = category.name
+            children.setdefault(category.parent_id, []).append(
+                (name.lower(), name, category)
+            )
+        for siblings in children.values():
+            siblings.sort(key=lambda item: item[0])
+
+        self._categories = []
+        self._parent_indices = array("i")
+        self._subtree_ends = array("i")
+        self._names = []
+        self._lowercased_names = []
+        self._full_names = []
+        self._lowercased_full_names = []
+        child_counts = []
+        indices = {}
+        # Stack of (lowercased name, name, category, parent index), with the
+        # children of the current category popped in order of names
+        stack = [(*item, self._NO_PARENT) for item in reversed(children.get(None, ()))]
+        # Indices of categories whose subtrees aren't finished yet
+        path = []
+        while stack:
+            lowercased_name, name, category, parent_index = stack.pop()
+            while path and path[-1] != parent_index:
+                self._subtree_ends[path.pop()] = len(self._categories)
+            index = len(self._categories)
+            indices[category.pk] = index
+            self._categories.append(category)
+            self._parent_indices.append(parent_index)
+            self._subtree_ends.append(index + 1)
+            self._names.append(name)
+            self._lowercased_names.append(lowercased_name)
+            if parent_index == self._NO_PARENT:
+                full_name = name
+                lowercased_full_name = lowercased_name
+            else:
+                full_name = join_names(self._full_names[parent_index], name)
+                lowercased_full_name = join_names(
+                    self._lowercased_full_names[parent_index], lowercased_name
+                )
+            self._full_names.append(full_name)
+            self._lowercased_full_names.append(lowercased_full_name)
+            category_children = children.get(category.pk, ())
+            child_counts.append(len(category_children))
+            stack.extend((*item, index) for item in reversed(category_children))
+            path.append(index)
+        for index in path:
+            self._subtree_ends[index] = len(self._categories)
+
+        self._child_offsets = array("i", [0])
+        self._child_indices = array("i")
+        for index, category in enumerate(self._categories):
+            self._child_offsets.append(self._child_offsets[-1] + child_counts[index])
+            self._child_indices.extend(
+                indices[child.pk] for *names, child in children.get(category.pk, ())
+            )
+
+        self._indices = indices
+        self._children_sets = {}
+        self._descendant_sets = {}
+
+    def get_index(self, category):
+        return self._indices[category.pk]
+
+    def get_pk(self, index):
+        return self._categories[index].pk
+
+    def is_ultimate(self, index):
+        return self._categories[index].ultimate
+
+    def get_indices_sorted_by_full_name(self):
+        """Indices sorted case-insensitively by full names."""
+        return sorted(range(len(self)), key=self._lowercased_full_names.__getitem__)
+
+    def _get_category(self, index):
+        return self._categories[index]
+
+    def write(self, path):
+        """
+        Write the tree to file to be mapped by `MappedCategoryTree`.
+
+        The file is replaced atomically.
+        """
+        sections = [
+            array("q", [category.pk for category in self._categories]),
+            self._parent_indices,
+            self._subtree_ends,
+            self._child_offsets,
+            self._child_indices,
+            array("b", [category.ultimate for category in self._categories]),
+            array("i", self.get_indices_sorted_by_full_name()),
+            array("i", sorted(range(len(self)), key=self.get_pk)),
+        ]
+        for strings in [
+            self._names,
+            self._lowercased_names,
+            self._full_names,
+            self._lowercased_full_names,
+        ]:
+            encoded = [string.encode() for string in strings]
+            offsets = array("q", [0])
+            for item in encoded:
+                offsets.append(offsets[-1] + len(item))
+            sections += [offsets, b"".join(encoded)]
+
+        header = []
+        offset = _align(struct.calcsize(_HEADER_FORMAT))
+        for section in sections:
+            length = len(memoryview(section).cast("B"))
+            header += [offset, length]
+            offset = _align(offset + length)
+
+        directory = os.path.dirname(path) or None
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+            try:
+                file.write(struct.pack(_HEADER_FORMAT, _MAGIC, len(self), *header))
+                for section, section_offset in zip(sections, header[::2]):
+                    file.write(b"\0" * (section_offset - file.tell()))
+                    file.write(section)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, path)
+
+
+class MappedCategoryTree(_BaseCategoryTree):
+    """
+    Category tree written by `CategoryTree.write()`, mapped from file.
+
+    The file is mapped read-only, so that processes mapping the same
+    file share its memory; only the categories accessed through the
+    tree are created (by `get_category` called with their indices), and
+    the names are decoded on access.
+    """
+
+    def __init__(self, path, get_category):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, count, *header = struct.unpack_from(_HEADER_FORMAT, view)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} isn't a category tree file.")
+        sections = [
+            view[offset : offset + length].cast(section_format)
+            for offset, length, section_format in zip(
+                header[::2], header[1::2], _SECTION_FORMATS
+            )
+        ]
+        (
+            self._pks,
+            self._parent_indices,
+            self._subtree_ends,
+            self._child_offsets,
+            self._child_indices,
+            self._ultimate_flags,
+            self._indices_sorted_by_full_name,
+            self._indices_sorted_by_pk,
+        ) = sections[:8]
+        (
+            self._names,
+            self._lowercased_names,
+            self._full_names,
+            self._lowercased_full_names,
+        ) = (
+            _MappedStrings(offsets, data)
+            for offsets, data in zip(sections[8::2], sections[9::2])
+        )
+        self._get_category = get_category
+        self._children_sets = {}
+        self._descendant_sets = {}
+
+    def get_index(self, category):
+        index = self.find_index(category.pk)
+        if index is None:
+            raise KeyError(category.pk)
+        return index
+
+    def get_pks(self):
+        """Primary keys of the categories in order of indices."""
+        return self._pks
+
+    def find_index(self, pk):
+        """Find index of category by primary key; `None` if not found."""
+        try:
+            position = bisect_left(
+                self._indices_sorted_by_pk, pk, key=self._pks.__getitem__
+            )
+        except TypeError:
+            return None
+        if position < len(self):
+            index = self._indices_sorted_by_pk[position]
+            if self._pks[index] == pk:
+                return index
+        return None
+
+    def get_parent_index(self, index):
+        """Get index of parent; `None` for roots."""
+        parent_index = self._parent_indices[index]
+        return None if parent_index == self._NO_PARENT else parent_index
+
+    def get_pk(self, index):
+        return self._pks[index]
+
+    def is_ultimate(self, index):
+        return bool(self._ultimate_flags[index])
+
+    def get_indices_sorted_by_full_name(self):
+        """Indices sorted case-insensitively by full names."""
+        return self._indices_sorted_by_full_name
+
+
+class _MappedStrings:
+    """Sequence of strings decoded on access from mapped UTF-8 data."""
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __getitem__(self, index):
+        return str(self._data[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+_MAGIC = b"CATTREE1"
+# Primary keys, parent indices, subtree ends, child offsets, child indices,
+# ultimate flags, indices sorted by full name, indices sorted by primary key,
+# and offsets and data of names, lowercased names, full names and lowercased
+# full names
+_SECTION_FORMATS = ("q", "i", "i", "i", "i", "b", "i", "i", *("q", "B") * 4)
+# Magic, number of categories and offsets and lengths of sections
+_HEADER_FORMAT = f"=8sq{len(_SECTION_FORMATS) * 2}q"
+
+
+def _align(offset):
+    return (offset + 7) // 8 * 8
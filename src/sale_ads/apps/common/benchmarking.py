@@ -0,0 +1,35 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def measure(function, *, number=1, repeat=5, setup=None):
+    """
+    Measure median time of calling function.
+
+    The function is called `number` times per each of `repeat` rounds,
+    and the median of the mean times of the rounds is returned.
+    If `setup` is given, then it's called before each call (outside of
+    the measured time), and its result is passed to the function.
+    """
+    times = []
+    for i in range(repeat):
+        total = 0
+        for j in range(number):
+            args = [] if setup is None else [setup()]
+            start = time.perf_counter()
+            function(*args)
+            total += time.perf_counter() - start
+        times.append(total / number)
+    return statistics.median(times)
+
+
+@contextmanager
+def compiled_htmlforms_elements(lib, compiled):
+    """Temporarily enable or disable compiling elements of htmlforms library."""
+    previous = lib.compile_elements
+    lib.compile_elements = compiled
+    try:
+        yield
+    finally:
+        lib.compile_elements = previous
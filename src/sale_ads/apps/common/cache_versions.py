@@ -0,0 +1,72 @@
+import time
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class CacheVersion:
+    """
+    Version of data stored in the cache backend.
+
+    The version is shared by all processes using the cache backend, so
+    the backend must be shared by processes (not the local-memory one);
+    settings depending on versions should be checked with
+    `check_cache_is_shared()`.
+    It should be bumped on every change of the data, so that values
+    cached under keys containing the version become unreachable.
+    Example:
+
+    >>> version = CacheVersion("test_data")
+    >>> old_value = version.get()
+    >>> version.get() == old_value
+    True
+    >>> version.bump()
+    >>> version.get() == old_value
+    False
+    """
+
+    def __init__(self, key):
+        self._key = f"version:{key}"
+
+    def get(self):
+        """
+        Get the version.
+
+        The version is the time of the last change in nanoseconds since
+        the epoch (or the time of the first access, if the data haven't
+        been changed since the version was evicted from the cache).
+        """
+        value = cache.get(self._key)
+        if value is None:
+            cache.add(self._key, time.time_ns(), None)
+            value = cache.get(self._key)
+        return value
+
+    def bump(self):
+        cache.set(self._key, max(time.time_ns(), self.get() + 1), None)
+
+    def make_key(self, *parts):
+        """Make cache key containing the version."""
+        return str.join(":", map(str, [self._key, self.get(), *parts]))
+
+
+def check_cache_is_shared(setting_names, id):
+    """
+    Check that the default cache backend is shared by processes, if any
+    of boolean settings is true.
+    """
+    enabled = [name for name in setting_names if getattr(settings, name)]
+    if not enabled or not isinstance(caches["default"], (DummyCache, LocMemCache)):
+        return []
+    return [
+        checks.Error(
+            "A cache backend shared by processes is required by "
+            f"{str.join(', ', enabled)}.",
+            hint="Set the DJANGO_CACHE_URL environment variable (for example, "
+            'to "db://django_cache" or "redis://...").',
+            id=id,
+        )
+    ]
@@ -0,0 +1,21 @@
+from django.db import models
+from django.db.models.lookups import IContains
+
+
+@models.CharField.register_lookup
+@models.TextField.register_lookup
+class TrigramIContains(IContains):
+    """
+    Case-insensitive containment lookup using `ILIKE` on PostgreSQL.
+
+    Unlike `icontains`, doesn't wrap the column in `UPPER()`, so that
+    `pg_trgm` GIN indexes (with `gin_trgm_ops`) of the column can be
+    used.
+    """
+
+    lookup_name = "trigram_icontains"
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", [*lhs_params, *rhs_params]
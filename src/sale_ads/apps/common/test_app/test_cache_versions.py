@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+import common.cache_versions
+from common.cache_versions import CacheVersion, check_cache_is_shared
+from common.tests.utils.doctest_in_unittest_mixin import DocTestInUnitTestMixin
+
+
+class CacheVersionTest(DocTestInUnitTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.version = CacheVersion("test")
+
+    def test_doctest(self):
+        self.doctest_object(CacheVersion, vars(common.cache_versions))
+
+    def test_get_without_cached_version(self):
+        self.assertEqual(self.version.get(), self.version.get())
+
+    def test_get_after_eviction(self):
+        old_value = self.version.get()
+        cache.clear()
+        self.assertIsNotNone(self.version.get())
+        self.assertNotEqual(self.version.get(), old_value)
+
+    def test_bump(self):
+        old_value = self.version.get()
+        self.version.bump()
+        self.assertGreater(self.version.get(), old_value)
+
+    def test_make_key(self):
+        old_key = self.version.make_key("spam", 1)
+        self.assertEqual(self.version.make_key("spam", 1), old_key)
+        self.assertNotEqual(self.version.make_key("spam", 2), old_key)
+        self.version.bump()
+        self.assertNotEqual(self.version.make_key("spam", 1), old_key)
+
+    def test_versions_are_independent(self):
+        other_version = CacheVersion("other_test")
+        other_value = other_version.get()
+        self.version.bump()
+        self.assertEqual(other_version.get(), other_value)
+
+
+class CheckCacheIsSharedTest(SimpleTestCase):
+    _LOCAL_CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    _SHARED_CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "test_cache",
+        }
+    }
+
+    @override_settings(CACHES=_LOCAL_CACHES, SPAM=True, EGGS=False)
+    def test_enabled_setting_with_local_cache(self):
+        errors = check_cache_is_shared(["SPAM", "EGGS"], "test.E001")
+        self.assertEqual([error.id for error in errors], ["test.E001"])
+        self.assertIn("SPAM", errors[0].msg)
+        self.assertNotIn("EGGS", errors[0].msg)
+
+    @override_settings(CACHES=_LOCAL_CACHES, SPAM=False)
+    def test_disabled_setting_with_local_cache(self):
+        self.assertEqual(check_cache_is_shared(["SPAM"], "test.E001"), [])
+
+    @override_settings(CACHES=_SHARED_CACHES, SPAM=True)
+    def test_enabled_setting_with_shared_cache(self):
+        self.assertEqual(check_cache_is_shared(["SPAM"], "test.E001"), [])
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.test import TestCase
+
+from common.lookups import TrigramIContains
+from common.tests import SaleAdsTestMixin
+
+
+class TrigramIContainsTest(SaleAdsTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        user_factory = cls.create_user_factory()
+        cls.user = user_factory.create(name="Part AB-12_3%x")
+        cls.other_user = user_factory.create(name="Part AB-1203x")
+
+    def test_case_insensitive(self):
+        self.assertMatches("ab-12", expected=[self.user, self.other_user])
+
+    def test_not_contained(self):
+        self.assertMatches("ab-13", expected=[])
+
+    def test_special_characters_are_literal(self):
+        self.assertMatches("12_3%")
+
+    def test_registration(self):
+        for field_class in [models.CharField, models.TextField]:
+            with self.subTest(field_class.__name__):
+                lookup = field_class.get_lookups()["trigram_icontains"]
+                self.assertIs(lookup, TrigramIContains)
+
+    def test_sql(self):
+        queryset = get_user_model().objects.filter(name__trigram_icontains="ab")
+        self.assertIn("ILIKE", str(queryset.query))
+        self.assertNotIn("UPPER", str(queryset.query))
+
+    def assertMatches(self, value, expected=None):
+        if expected is None:
+            expected = [self.user]
+        queryset = get_user_model().objects.filter(name__trigram_icontains=value)
+        self.assertQuerysetEqual(queryset, expected, ordered=False)
@@ -1,90 +1,98 @@
-from functools import cached_property
 from inspect import getmro
 
+# Value of items not resolved yet
+_UNSET = object()
+
 
 class BaseContext:
-    items = (
-        "error",
-        "field",
-        "field_errors",
-        "required",
+    # Mixins of contexts must define empty `__slots__` too, so that contexts
+    # don't have `__dict__`
+    __slots__ = ("element", "_parent", "_values", "_inherited")
+    items = ("error", "field", "field_errors", "required")
+    # Items only set by arguments (never computed), that the compiled parts
+    # of elements depend on
+    static_items = (
         "error_class",
         "error_extra_class",
         "error_list_class",
         "error_list_extra_class",
     )
+    # Returned by `compute_*` methods for the item to be inherited from the
+    # context of the parent element
+    INHERIT = object()
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        cls.item_cleaners = {}
-        for name in cls.get_item_names():
-            cls.create_item_descriptor(name)
+        cls.static_item_names = frozenset(cls.get_static_item_names())
+        # Item name -> (index of value in `_values`, clean method or `None`)
+        cls._item_table = {}
+        for index, name in enumerate(sorted(cls.get_item_names())):
+            cls.create_item_descriptor(name, index)
 
     @classmethod
     def get_item_names(cls):
-        names = set()
+        names = cls.get_static_item_names()
         for class_in_mro in getmro(cls):
             names.update(getattr(class_in_mro, "items", ()))
         return names
 
     @classmethod
-    def create_item_descriptor(cls, name):
-        compute_method_name = "compute_" + name
-        try:
-            compute = getattr(cls, compute_method_name)
-        except AttributeError:
-            setattr(cls, compute_method_name, cls.default_compute)
-            compute = cls.default_compute
-
-        internal_name = "_" + name
-
-        def get(self):
-            try:
-                return getattr(self, internal_name)
-            except AttributeError:
-                try:
+    def get_static_item_names(cls):
+        names = set()
+        for class_in_mro in getmro(cls):
+            names.update(getattr(class_in_mro, "static_items", ()))
+        return names
+
+    @classmethod
+    def create_item_descriptor(cls, name, index):
+        compute = getattr(cls, "compute_" + name, None)
+        inherit = cls.INHERIT
+
+        if compute is None:
+
+            def get(self):
+                value = self._values[index]
+                if value is _UNSET:
+                    value = self._values[index] = self._inherit(name, index)
+                return value
+
+        else:
+
+            def get(self):
+                value = self._values[index]
+                if value is _UNSET:
                     value = compute(self)
-                except cls.ItemComputationFailed:
-                    if self._parent:
-                        value = getattr(self._parent, name)
-                        self._inherited.add(name)
-                    else:
-                        value = None
-                setattr(self, internal_name, value)
+                    if value is inherit:
+                        value = self._inherit(name, index)
+                    self._values[index] = value
                 return value
 
         descriptor = property(get)
         setattr(cls, name, descriptor)
         descriptor.__set_name__(cls, name)
-
-        clean_method_name = "clean_" + name
-        try:
-            clean = getattr(cls, clean_method_name)
-        except AttributeError:
-            setattr(cls, clean_method_name, cls.default_clean)
-            clean = cls.default_clean
-        cls.item_cleaners[name] = clean
+        cls._item_table[name] = (index, getattr(cls, "clean_" + name, None))
 
     def __init__(self, *, element, **items):
         self.element = element
+        self._parent = getattr(element.parent, "context", None)
+        # Bit mask of indices of the inherited items
+        self._inherited = 0
+        self._values = values = [_UNSET] * len(self._item_table)
         for name, value in items.items():
             if value != "":
-                setattr(self, "_" + name, self.item_cleaners[name](self, value))
-        self._inherited = set()
-
-    @cached_property
-    def _parent(self):
-        return getattr(self.element.parent, "context", None)
+                index, clean = self._item_table[name]
+                values[index] = clean(self, value) if clean else value
+
+    def _inherit(self, name, index):
+        if self._parent is None:
+            return None
+        value = getattr(self._parent, name)
+        self._inherited |= 1 << index
+        return value
 
     def is_inherited(self, name):
         getattr(self, name)
-        return name in self._inherited
-
-    class ItemComputationFailed(Exception):
-        pass
-
-    def default_compute(self):
-        raise self.ItemComputationFailed
+        return bool(self._inherited >> self._item_table[name][0] & 1)
 
     def clean_bool(self, value):
         if isinstance(value, bool):
@@ -94,18 +102,15 @@ class BaseContext:
             f"`{type(value).__name__}`."
         )
 
-    def default_clean(self, value):
-        return value
-
     def compute_field_errors(self):
         if not self.is_inherited("field"):
             return self.field.errors if self.field else None
-        raise self.ItemComputationFailed
+        return self.INHERIT
 
     def compute_required(self):
         if not self.is_inherited("field"):
             return self.field.field.required if self.field else None
-        raise self.ItemComputationFailed
+        return self.INHERIT
 
     def clean_required(self, value):
         return self.clean_bool(value)
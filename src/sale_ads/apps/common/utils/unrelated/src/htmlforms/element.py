@@ -1,4 +1,8 @@
-from unparse_html_element import unparse_html_element
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from unparse_html_element import unparse_html_start_tag
 
 
 class Element:
@@ -10,6 +14,7 @@ class Element:
     def __init_subclass__(cls, lib, **kwargs):
         super().__init_subclass__(**kwargs)
         cls.lib = lib
+        cls._compiled_parts = {}
         cls.init_class()
 
     @classmethod
@@ -19,19 +24,81 @@ class Element:
     def __init__(self, *, parent, **context):
         self.parent = parent
         self.context = self.lib.Context(element=self, **context)
+        self.static_key = self.get_static_key(context)
+
+    def get_static_key(self, context):
+        """
+        Get key of values of the static context items; `None` if the
+        element isn't compiled.
+
+        The static items are never computed, so their values are taken
+        from the arguments of the element and its ancestors only.
+        Children that don't set static items share the key of parent.
+        """
+        if not self.lib.compile_elements:
+            return None
+        try:
+            static_items = frozenset(
+                (name, value)
+                for name, value in context.items()
+                if name in self.context.static_item_names and value != ""
+            )
+        except TypeError:  # Unhashable value
+            return None
+        if self.parent is None:
+            return (get_language(), static_items)
+        parent_key = self.parent.static_key
+        if parent_key is None or not static_items:
+            return parent_key
+        return (parent_key, static_items)
+
+    def compile(self, name, compute, *dynamic_key):
+        """
+        Get part `name` of the element computed by `compute`.
+
+        The part is computed once per element class, static key and
+        `dynamic_key` (the other values it depends on).
+        """
+        if self.static_key is None:
+            return compute()
+        key = (name, self.static_key, *dynamic_key)
+        try:
+            return self._compiled_parts[key]
+        except KeyError:
+            value = self._compiled_parts[key] = compute()
+            return value
 
     def render(self):
-        return unparse_html_element(
-            self.tag, self.get_attrs(), self.get_content(), close=self.close
-        )
+        parts = []
+        self.render_into(parts)
+        return mark_safe(str.join("", parts))
+
+    def render_into(self, parts):
+        """
+        Append escaped parts of the markup to `parts`.
+
+        Children are rendered into the same list, so that the markup is
+        joined once, by `render()` of the outermost element.
+        """
+        parts.append(unparse_html_start_tag(self.tag, self.get_attrs()))
+        if self.close:
+            self.render_content_into(parts)
+            parts.append(f"</{self.tag}>")
 
     def get_attrs(self):
         attrs = {}
-        classes = self.get_css_classes()
-        if classes:
-            attrs["class"] = str.join(" ", classes)
+        css_class = self.get_css_class()
+        if css_class:
+            attrs["class"] = css_class
         return attrs
 
+    def get_css_class(self):
+        return self.compile("css_class", self.create_css_class)
+
+    def create_css_class(self):
+        classes = self.get_css_classes()
+        return conditional_escape(str.join(" ", classes)) if classes else None
+
     def get_css_classes(self):
         classes = []
         cls = (
@@ -53,6 +120,11 @@ class Element:
                 classes.append(extra)
         return classes
 
+    def render_content_into(self, parts):
+        content = self.get_content()
+        if content is not None:
+            parts.append(conditional_escape(content))
+
     def get_content(self):
         return None
 
@@ -1,9 +1,3 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMTPY_STRING = mark_safe("")
-
-
 class FieldErrorListLibMixin:
     element_mixin_getters = {"FieldErrorList": "get_field_error_list_mixins"}
     tags = ("field_errors",)
@@ -21,15 +15,13 @@ class FieldErrorListLibMixin:
                 cls.error_element_object_class_name
             )
 
-        def get_content(self):
-            content = _SAFE_EMTPY_STRING
+        def render_content_into(self, parts):
             for error in self.context.field_errors or ():
-                content += conditional_escape(self.get_error_content(error))
-            return content
+                self.render_error_into(parts, error)
 
-        def get_error_content(self, error):
+        def render_error_into(self, parts, error):
             error = self.create_child(self.error_element_object_class, error=error)
-            return error.render()
+            error.render_into(parts)
 
     @classmethod
     def get_field_error_list_mixins(cls):
@@ -1,9 +1,3 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMPTY_STRING = mark_safe("")
-
-
 class FieldLibMixin:
     class FieldMixin:
         tag = "div"
@@ -29,39 +23,31 @@ class FieldLibMixin:
                     cls.error_list_element_object_class_name
                 )
 
-        def get_content(self):
-            content = _SAFE_EMPTY_STRING
-            label = self.get_label_content()
-            if label:
-                content += conditional_escape(label)
-            widget = self.get_widget_content()
-            if widget:
-                content += conditional_escape(widget)
-            errors = self.get_errors_content()
-            if errors:
-                content += conditional_escape(errors)
-            return content
+        def render_content_into(self, parts):
+            self.render_label_into(parts)
+            self.render_widget_into(parts)
+            self.render_errors_into(parts)
 
-        def get_label_content(self):
+        def render_label_into(self, parts):
             label = self.create_child(self.label_element_object_class)
-            return label.render() if label.label else None
+            if label.label:
+                label.render_into(parts)
 
-        def get_widget_content(self):
-            return self.create_child(self.widget_element_object_class).render()
+        def render_widget_into(self, parts):
+            self.create_child(self.widget_element_object_class).render_into(parts)
 
-        def get_errors_content(self):
-            return (
-                self.create_child(self.error_list_element_object_class).render()
-                if self.context.field_errors
-                else None
-            )
+        def render_errors_into(self, parts):
+            if self.context.field_errors:
+                error_list = self.create_child(self.error_list_element_object_class)
+                error_list.render_into(parts)
 
     @classmethod
     def get_field_mixins(cls):
         return [cls.FieldMixin]
 
     class ContextMixin:
-        items = ("field_class", "field_extra_class")
+        __slots__ = ()
+        static_items = ("field_class", "field_extra_class")
 
     @classmethod
     def field(cls, __element_object_class, field="", label="", **kwargs):
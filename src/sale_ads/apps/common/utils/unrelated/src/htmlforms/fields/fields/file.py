@@ -16,25 +16,25 @@ class FileFieldLibMixin:
                     )
                 )
 
-        def get_widget_content(self):
-            return (
-                self.get_unclearable_widget_content()
-                if not self.context.clearable_file
-                else self.get_clearable_widget_content()
-            )
+        def render_widget_into(self, parts):
+            if not self.context.clearable_file:
+                self.render_unclearable_widget_into(parts)
+            else:
+                self.render_clearable_widget_into(parts)
 
-        def get_unclearable_widget_content(self):
-            return super().get_widget_content()
+        def render_unclearable_widget_into(self, parts):
+            super().render_widget_into(parts)
 
-        def get_clearable_widget_content(self):
+        def render_clearable_widget_into(self, parts):
             widget = self.create_child(self.clearable_widget_element_object_class)
-            return widget.render()
+            widget.render_into(parts)
 
     @classmethod
     def get_file_field_mixins(cls):
         return [cls.FileFieldMixin, *cls.get_field_mixins()]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("clearable_file",)
 
         def clean_clearable_file(self, value):
@@ -16,12 +16,22 @@ class FieldLabelLibMixin:
         css_extra_class_context_item = "label_extra_class"
         default_required_mark = None
 
+        def render_into(self, parts):
+            parts.append(
+                self.compile("markup", self.render_uncompiled, self.context.required)
+            )
+
+        def render_uncompiled(self):
+            parts = []
+            super().render_into(parts)
+            return mark_safe(str.join("", parts))
+
         def get_content(self):
             return self.label
 
         @cached_property
         def label(self):
-            return self.get_label()
+            return self.compile("label", self.get_label, self.context.required)
 
         def get_label(self):
             label = (
@@ -57,7 +67,8 @@ class FieldLabelLibMixin:
         return [cls.FieldLabelMixin]
 
     class ContextMixin:
-        items = (
+        __slots__ = ()
+        static_items = (
             "label",
             "required_mark",
             "required_mark_if_empty",
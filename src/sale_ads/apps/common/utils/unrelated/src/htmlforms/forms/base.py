@@ -1,3 +1,4 @@
 class FormLibMixin:
     class ContextMixin:
+        __slots__ = ()
         items = ("form",)
@@ -1,9 +1,3 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMTPY_STRING = mark_safe("")
-
-
 class FormErrorListLibMixin:
     element_mixin_getters = {"FormErrorList": "get_form_error_list_mixins"}
     tags = ("form_errors",)
@@ -21,27 +15,26 @@ class FormErrorListLibMixin:
                 cls.error_element_object_class_name
             )
 
-        def get_content(self):
-            content = _SAFE_EMTPY_STRING
+        def render_content_into(self, parts):
             for error in self.context.form_errors or ():
-                content += conditional_escape(self.get_error_content(error))
-            return content
+                self.render_error_into(parts, error)
 
-        def get_error_content(self, error):
+        def render_error_into(self, parts, error):
             error = self.create_child(self.error_element_object_class, error=error)
-            return error.render()
+            error.render_into(parts)
 
     @classmethod
     def get_form_error_list_mixins(cls):
         return [cls.FormErrorListMixin]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("form_errors",)
 
         def compute_form_errors(self):
             if not self.is_inherited("form"):
                 return self.form.non_field_errors() if self.form else None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
     @classmethod
     def base_form_errors(cls, __element_object_class, form="", **kwargs):
@@ -1,7 +1,4 @@
 from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMPTY_STRING = mark_safe("")
 
 
 class HiddenFieldListLibMixin:
@@ -11,23 +8,22 @@ class HiddenFieldListLibMixin:
     class HiddenFieldListMixin:
         tag = "div"
 
-        def get_content(self):
-            content = _SAFE_EMPTY_STRING
+        def render_content_into(self, parts):
             for field in self.context.hidden_fields or ():
-                content += conditional_escape(field)
-            return content
+                parts.append(conditional_escape(field))
 
     @classmethod
     def get_hidden_field_list_mixins(cls):
         return [cls.HiddenFieldListMixin]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("hidden_fields",)
 
         def compute_hidden_fields(self):
             if not self.is_inherited("form"):
                 return self.form.hidden_fields() if self.form else None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
     @classmethod
     def base_hidden_fields(cls, __element_object_class, form="", **kwargs):
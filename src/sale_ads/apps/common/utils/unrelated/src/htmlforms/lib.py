@@ -1,3 +1,4 @@
+from functools import partial
 from inspect import getmro
 
 from htmlforms.context import BaseContext
@@ -7,31 +8,71 @@ from htmlforms.forms import FORM_LIB_MIXINS
 from htmlforms.widgets import WIDGET_LIB_MIXINS
 
 
+class _ClassCreatedOnAccess:
+    """
+    Class attribute of library returning the class created by `create()`,
+    which replaces the attribute with the class.
+    """
+
+    def __init__(self, create):
+        self.create = create
+
+    def __get__(self, instance, owner):
+        return self.create()
+
+
 class _BaseHTMLFormsLib:
+    # Whether the invariant parts of elements are computed once per static
+    # arguments (see `Element.compile()`)
+    compile_elements = True
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        cls._element_mixins = cls.get_element_mixins()
+        cls._element_mixin_getters = cls.get_element_mixin_getters()
         cls._element_object_classes = {}
-        cls.create_element_classes()
-        cls.Context = type("Context", (*cls.get_context_mixins(), BaseContext), {})
+        # The classes are created on first access, so that loading the library
+        # doesn't create the classes of all the elements
+        for name in cls._element_mixin_getters:
+            setattr(
+                cls,
+                name,
+                _ClassCreatedOnAccess(partial(cls.get_element_object_class, name)),
+            )
+        cls.Context = _ClassCreatedOnAccess(cls.create_context_class)
 
     @classmethod
-    def get_element_mixins(cls):
-        mixins = {}
+    def get_element_mixin_getters(cls):
+        getter_names = {}
         for class_in_mro in getmro(cls):
             try:
                 getters = getattr(class_in_mro, "element_mixin_getters")
             except AttributeError:
                 continue
             for element_name, getter_name in getters.items():
-                if element_name not in mixins:
-                    mixins[element_name] = getattr(cls, getter_name)()
-        return mixins
+                if element_name not in getter_names:
+                    getter_names[element_name] = getter_name
+        return getter_names
+
+    @classmethod
+    def get_element_mixins(cls, name):
+        return getattr(cls, cls._element_mixin_getters[name])()
 
     @classmethod
     def create_element_classes(cls):
-        for name in cls._element_mixins:
-            setattr(cls, name, cls.get_element_object_class(name))
+        """
+        Create the classes of all the elements and the context class (for
+        example, before forking worker processes).
+        """
+        for name in [*cls._element_mixin_getters, "Context"]:
+            getattr(cls, name)
+
+    @classmethod
+    def create_context_class(cls):
+        context_class = type(
+            "Context", (*cls.get_context_mixins(), BaseContext), {"__slots__": ()}
+        )
+        cls.Context = context_class
+        return context_class
 
     @classmethod
     def get_context_mixins(cls):
@@ -54,7 +95,7 @@ class _BaseHTMLFormsLib:
         try:
             return cls._element_object_classes[name]
         except KeyError:
-            mixins = cls._element_mixins[name]
+            mixins = cls.get_element_mixins(name)
             element_class = type(
                 name, (*mixins, cls.ElementMixin, cls.Element), {}, lib=cls
             )
@@ -16,6 +16,9 @@ class WidgetLibMixin:
             if self.context.autocomplete is not None:
                 attrs["autocomplete"] = self.context.autocomplete
 
+        def get_css_class(self):
+            return self.compile("css_class", self.create_css_class, self.context.valid)
+
         def get_css_classes(self):
             classes = []
             classes.extend(self.get_base_css_classes())
@@ -68,6 +71,7 @@ class WidgetLibMixin:
         return [cls.WidgetMixin]
 
     class ContextMixin:
+        __slots__ = ()
         items = (
             "autocomplete",
             "maxlength",
@@ -78,6 +82,8 @@ class WidgetLibMixin:
             "valid",
             "value",
             "safe_value",
+        )
+        static_items = (
             "widget_class",
             "widget_extra_class",
             "widget_invalid_class",
@@ -91,7 +97,7 @@ class WidgetLibMixin:
                     if self.field
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_minlength(self):
             if not self.is_inherited("field"):
@@ -100,7 +106,7 @@ class WidgetLibMixin:
                     if self.field
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_multi_choice(self):
             if not self.is_inherited("field") or not self.is_inherited("value"):
@@ -112,7 +118,7 @@ class WidgetLibMixin:
                         and not isinstance(self.value, str)
                     )  # fmt: skip
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_multi_choice(self, value):
             return self.clean_bool(value)
@@ -120,14 +126,14 @@ class WidgetLibMixin:
         def compute_name(self):
             if not self.is_inherited("field"):
                 return self.field.html_name if self.field else None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_valid(self):
             if not self.is_inherited("field") or not self.is_inherited("field_errors"):
                 if self.field is not None:
                     return not self.field.errors if self.field else None
                 return not self.field_errors if self.field_errors is not None else None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_valid(self, value):
             return self.clean_bool(value)
@@ -135,7 +141,7 @@ class WidgetLibMixin:
         def compute_value(self):
             if not self.is_inherited("field"):
                 return self.field.value() if self.field else None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_safe_value(self):
             if not self.is_inherited("value"):
@@ -146,7 +152,7 @@ class WidgetLibMixin:
                         else tuple(map(conditional_escape, self.value))
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
     @classmethod
     def widget(cls, __element_object_class, field="", **kwargs):
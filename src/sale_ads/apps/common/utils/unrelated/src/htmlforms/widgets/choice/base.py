@@ -1,8 +1,93 @@
 from django.utils.html import conditional_escape
+from django.utils.translation import get_language
 
 
 class ChoiceWidgetLibMixin:
+    class CachedChoicesMixin:
+        """
+        Mixin of elements rendering lists of choices, caching the markup.
+
+        Each choice is rendered once in both states (chosen and not) per
+        element class, static key, choices and values returned by
+        `get_choices_cache_key()`; then rendering is copying the cached
+        fragments, with those of the chosen choices patched in.
+        """
+
+        max_cached_choice_lists = 100
+
+        @classmethod
+        def init_class(cls):
+            super().init_class()
+            cls._rendered_choices = {}
+
+        def render_choices_into(self, parts):
+            rendered = self.get_rendered_choices()
+            if rendered is None:
+                self.render_uncached_choices_into(parts)
+                return
+            fragments, chosen_fragments = rendered
+            offset = len(parts)
+            parts.extend(fragments)
+            for value in self.get_chosen_string_values():
+                for index, fragment in chosen_fragments.get(value, ()):
+                    parts[offset + index] = fragment
+
+        def get_rendered_choices(self):
+            if self.static_key is None:
+                return None
+            key = (self.static_key, self.context.choices, *self.get_choices_cache_key())
+            try:
+                rendered = self._rendered_choices.get(key)
+            except TypeError:  # Unhashable choices
+                return None
+            if rendered is None:
+                # Cleared rather than evicted, since hashes of lazily
+                # translated choices depend on the current language
+                if len(self._rendered_choices) >= self.max_cached_choice_lists:
+                    self._rendered_choices.clear()
+                rendered = self._rendered_choices[key] = self.create_rendered_choices()
+            return rendered
+
+        def get_choices_cache_key(self):
+            return ()
+
+        def create_rendered_choices(self):
+            """
+            Create fragments of choices that aren't chosen and mapping of
+            string values of choices to indices and chosen fragments.
+            """
+            fragments = []
+            chosen_fragments = {}
+            for value, fragment, chosen_fragment in self.render_choice_fragments():
+                if value is not None:
+                    chosen_fragments.setdefault(value, []).append(
+                        (len(fragments), chosen_fragment)
+                    )
+                fragments.append(fragment)
+            return tuple(fragments), chosen_fragments
+
+        def render_choice_fragment(self, value, label, *args, parent=None):
+            """
+            Render choice not chosen and chosen, by `render_choice_into()`
+            of `parent` (the element itself by default).
+            """
+            if parent is None:
+                parent = self
+            fragments = []
+            for chosen in [False, True]:
+                parts = []
+                parent.render_choice_into(parts, value, label, *args, chosen=chosen)
+                fragments.append(str.join("", parts))
+            return (str(value), *fragments)
+
+        def get_chosen_string_values(self):
+            value = self.context.string_value
+            if value is None:
+                return ()
+            return value if self.context.multi_choice else (value,)
+
     class ContextMixin:
+        __slots__ = ()
         items = (
             "choice_label",
             "choice_value",
@@ -20,7 +105,7 @@ class ChoiceWidgetLibMixin:
                     choices = getattr(self.field.field, "choices", None)
                     return tuple(choices) if choices is not None else None
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_chosen(self):
             if not self.is_inherited("choice_value") or not self.is_inherited("value"):
@@ -31,7 +116,7 @@ class ChoiceWidgetLibMixin:
                         else self.string_choice_value in self.string_value
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_chosen(self, value):
             return self.clean_bool(value)
@@ -43,25 +128,49 @@ class ChoiceWidgetLibMixin:
                     if self.choice_value is not None
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_safe_choices(self):
             if not self.is_inherited("choices"):
                 if self.choices is not None:
-                    return tuple(
-                        (conditional_escape(left), right)
-                        if not isinstance(right, (list, tuple))
-                        else (
-                            left,
-                            tuple(
-                                (conditional_escape(nested_value), nested_label)
-                                for nested_value, nested_label in right
-                            ),
-                        )
-                        for left, right in self.choices
+                    return (
+                        self.get_cached_safe_choices()
+                        if self.element.lib.compile_elements
+                        else self.escape_choices(self.choices)
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
+
+        # Escaped choices by language and choices, shared by the elements
+        # rendering the same choices
+        _safe_choices_cache = {}
+        max_cached_safe_choices = 100
+
+        def get_cached_safe_choices(self):
+            cache = self._safe_choices_cache
+            key = (get_language(), self.choices)
+            try:
+                value = cache.get(key)
+            except TypeError:  # Unhashable choices
+                return self.escape_choices(self.choices)
+            if value is None:
+                if len(cache) >= self.max_cached_safe_choices:
+                    cache.clear()
+                value = cache[key] = self.escape_choices(self.choices)
+            return value
+
+        @staticmethod
+        def escape_choices(choices):
+            escaped_choices = []
+            for left, right in choices:
+                if not isinstance(right, (list, tuple)):
+                    escaped_choices.append((conditional_escape(left), right))
+                else:
+                    group = tuple(
+                        (conditional_escape(value), label) for value, label in right
+                    )
+                    escaped_choices.append((left, group))
+            return tuple(escaped_choices)
 
         def compute_string_choice_value(self):
             if not self.is_inherited("choice_value"):
@@ -70,7 +179,7 @@ class ChoiceWidgetLibMixin:
                     if self.choice_value is not None
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def compute_string_value(self):
             if not self.is_inherited("value"):
@@ -81,4 +190,4 @@ class ChoiceWidgetLibMixin:
                         else tuple(map(str, self.safe_value))
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
@@ -17,6 +17,7 @@ class CheckboxWidgetLibMixin:
         return [cls.CheckboxWidgetMixin, *cls.get_flag_widget_mixins()]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("checkbox_required",)
 
         def clean_checkbox_required(self, value):
@@ -1,6 +1,3 @@
-from django.utils.html import conditional_escape
-
-
 class LabeledFlagWidgetLibMixin:
     class LabeledFlagWidgetMixin:
         tag = "div"
@@ -21,26 +18,25 @@ class LabeledFlagWidgetLibMixin:
                     cls.label_element_object_class_name
                 )
 
-        def get_content(self):
-            content = conditional_escape(self.get_widget_content())
-            label = self.get_label_content()
-            if label:
-                content += conditional_escape(label)
-            return content
+        def render_content_into(self, parts):
+            self.render_widget_into(parts)
+            self.render_label_into(parts)
 
-        def get_widget_content(self):
-            return self.create_child(self.widget_element_object_class).render()
+        def render_widget_into(self, parts):
+            self.create_child(self.widget_element_object_class).render_into(parts)
 
-        def get_label_content(self):
+        def render_label_into(self, parts):
             label = self.create_child(self.label_element_object_class)
-            return label.render() if label.label else None
+            if label.label:
+                label.render_into(parts)
 
     @classmethod
     def get_labeled_flag_widget_mixins(cls):
         return [cls.LabeledFlagWidgetMixin]
 
     class ContextMixin:
-        items = ("labeled_flag_widget_class", "labeled_flag_widget_extra_class")
+        __slots__ = ()
+        static_items = ("labeled_flag_widget_class", "labeled_flag_widget_extra_class")
 
     @classmethod
     def labeled_flag_widget(
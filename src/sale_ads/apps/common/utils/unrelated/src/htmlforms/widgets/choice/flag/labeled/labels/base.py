@@ -22,7 +22,8 @@ class FlagWidgetLabelLibMixin:
         return [cls.FlagWidgetLabelMixin]
 
     class ContextMixin:
-        items = ("flag_widget_label_class", "flag_widget_label_extra_class")
+        __slots__ = ()
+        static_items = ("flag_widget_label_class", "flag_widget_label_extra_class")
 
     @classmethod
     def flag_widget_label(cls, __element_object_class, choice_label="", **kwargs):
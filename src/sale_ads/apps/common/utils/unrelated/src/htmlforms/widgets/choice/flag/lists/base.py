@@ -1,9 +1,3 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMPTY_STRING = mark_safe("")
-
-
 class FlagWidgetListLibMixin:
     class FlagWidgetListMixin:
         tag = "div"
@@ -19,33 +13,49 @@ class FlagWidgetListLibMixin:
                     cls.choice_element_object_class_name
                 )
 
-        def get_content(self):
-            content = _SAFE_EMPTY_STRING
+        def render_content_into(self, parts):
+            self.render_choices_into(parts)
+
+        def render_uncached_choices_into(self, parts):
             extra_widget_kwargs = self.get_extra_widget_kwargs()
             for value, label in self.context.safe_choices or ():
-                content += conditional_escape(
-                    self.get_choice_content(value, label, extra_widget_kwargs)
-                )
-            return content
+                self.render_choice_into(parts, value, label, extra_widget_kwargs)
+
+        def render_choice_fragments(self):
+            extra_widget_kwargs = self.get_extra_widget_kwargs()
+            for value, label in self.context.safe_choices or ():
+                yield self.render_choice_fragment(value, label, extra_widget_kwargs)
+
+        def get_choices_cache_key(self):
+            return (
+                self.context.name,
+                self.context.required,
+                self.context.valid,
+                frozenset(self.get_extra_widget_kwargs().items()),
+            )
 
         def get_extra_widget_kwargs(self):
             return {}
 
-        def get_choice_content(self, value, label, extra_widget_kwargs):
+        def render_choice_into(
+            self, parts, value, label, extra_widget_kwargs, chosen=""
+        ):
             choice = self.create_child(
                 self.choice_element_object_class,
                 choice_value=value,
                 choice_label=label,
+                chosen=chosen,
                 **extra_widget_kwargs
             )
-            return choice.render()
+            choice.render_into(parts)
 
     @classmethod
     def get_flag_widget_list_mixins(cls):
-        return [cls.FlagWidgetListMixin]
+        return [cls.FlagWidgetListMixin, cls.CachedChoicesMixin]
 
     class ContextMixin:
-        items = ("flag_widget_list_class", "flag_widget_list_extra_class")
+        __slots__ = ()
+        static_items = ("flag_widget_list_class", "flag_widget_list_extra_class")
 
     @classmethod
     def flag_widget_list(cls, __element_object_class, field="", **kwargs):
@@ -1,9 +1,3 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMPTY_STRING = mark_safe("")
-
-
 class SelectOptgroupLibMixin:
     element_mixin_getters = {"SelectOptgroup": "get_select_optgroup_mixins"}
     tags = ("select_optgroup",)
@@ -31,29 +25,27 @@ class SelectOptgroupLibMixin:
             if self.context.choice_group_label is not None:
                 attrs["label"] = self.context.choice_group_label
 
-        def get_content(self):
-            content = _SAFE_EMPTY_STRING
+        def render_content_into(self, parts):
             for value, label in self.context.choice_group or ():
-                content += conditional_escape(self.get_choice_content(value, label))
-            return content
+                self.render_choice_into(parts, value, label)
 
-        def get_choice_content(self, value, label):
+        def render_choice_into(self, parts, value, label, chosen=""):
             choice = self.create_child(
-                self.choice_element_object_class, choice_value=value, choice_label=label
+                self.choice_element_object_class,
+                choice_value=value,
+                choice_label=label,
+                chosen=chosen,
             )
-            return choice.render()
+            choice.render_into(parts)
 
     @classmethod
     def get_select_optgroup_mixins(cls):
         return [cls.SelectOptgroupMixin]
 
     class ContextMixin:
-        items = (
-            "choice_group",
-            "choice_group_label",
-            "select_optgroup_class",
-            "select_optgroup_extra_class",
-        )
+        __slots__ = ()
+        items = ("choice_group", "choice_group_label")
+        static_items = ("select_optgroup_class", "select_optgroup_extra_class")
 
     @classmethod
     def base_select_optgroup(cls, __element_object_class, **kwargs):
@@ -35,11 +35,9 @@ class SelectOptionLibMixin:
         return [cls.SelectOptionMixin]
 
     class ContextMixin:
-        items = (
-            "select_option_hidden",
-            "select_option_class",
-            "select_option_extra_class",
-        )
+        __slots__ = ()
+        items = ("select_option_hidden",)
+        static_items = ("select_option_class", "select_option_extra_class")
 
         def clean_select_option_hidden(self, value):
             return self.clean_bool(value)
@@ -1,7 +1,4 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMPTY_STRING = mark_safe("")
+from unparse_html_element import unparse_html_start_tag
 
 
 class SelectWidgetLibMixin:
@@ -38,48 +35,69 @@ class SelectWidgetLibMixin:
             if self.context.multi_choice:
                 attrs["multiple"] = None
 
-        def get_content(self):
-            content = _SAFE_EMPTY_STRING
+        def render_content_into(self, parts):
             if (
                 not self.context.multi_choice
                 and (self.context.blank_select or self.context.blank_select is None)
             ):  # fmt: skip
-                content += conditional_escape(self.get_blank_choice_content())
+                self.render_blank_choice_into(parts)
+            self.render_choices_into(parts)
+
+        def render_uncached_choices_into(self, parts):
             for left, right in self.context.safe_choices or ():
-                content += conditional_escape(
-                    (
-                        self.get_choice_content
-                        if not isinstance(right, (list, tuple))
-                        else self.get_choice_group_content
-                    )(left, right)
-                )
-            return content
+                if not isinstance(right, (list, tuple)):
+                    self.render_choice_into(parts, left, right)
+                else:
+                    self.render_choice_group_into(parts, left, right)
 
-        def get_blank_choice_content(self):
+        def render_choice_fragments(self):
+            for left, right in self.context.safe_choices or ():
+                if not isinstance(right, (list, tuple)):
+                    yield self.render_choice_fragment(left, right)
+                else:
+                    group = self.create_choice_group(left, right)
+                    yield None, unparse_html_start_tag(
+                        group.tag, group.get_attrs()
+                    ), None
+                    for value, label in group.context.choice_group or ():
+                        yield self.render_choice_fragment(value, label, parent=group)
+                    yield None, f"</{group.tag}>", None
+
+        def render_blank_choice_into(self, parts):
             element = self.create_child(
                 self.choice_element_object_class, select_option_hidden=True
             )
-            return element.render()
+            element.render_into(parts)
 
-        def get_choice_content(self, value, label):
+        def render_choice_into(self, parts, value, label, chosen=""):
             choice = self.create_child(
-                self.choice_element_object_class, choice_value=value, choice_label=label
+                self.choice_element_object_class,
+                choice_value=value,
+                choice_label=label,
+                chosen=chosen,
             )
-            return choice.render()
+            choice.render_into(parts)
+
+        def render_choice_group_into(self, parts, label, group):
+            self.create_choice_group(label, group).render_into(parts)
 
-        def get_choice_group_content(self, label, group):
-            group = self.create_child(
+        def create_choice_group(self, label, group):
+            return self.create_child(
                 self.choice_group_element_object_class,
                 choice_group_label=label,
                 choice_group=group,
             )
-            return group.render()
 
     @classmethod
     def get_select_widget_mixins(cls):
-        return [cls.SelectWidgetMixin, *cls.get_widget_mixins()]
+        return [
+            cls.SelectWidgetMixin,
+            cls.CachedChoicesMixin,
+            *cls.get_widget_mixins(),
+        ]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("blank_select",)
 
         def compute_blank_select(self):
@@ -90,7 +108,7 @@ class SelectWidgetLibMixin:
                     if self.value is not None
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_blank_select(self, value):
             return self.clean_bool(value)
@@ -23,6 +23,7 @@ class FileWidgetLibMixin:
         return [cls.FileWidgetMixin, *cls.get_widget_mixins()]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("accept",)
 
     @classmethod
@@ -29,12 +29,15 @@ class FileRemovalSubwidgetLibMixin:
         return [cls.FileRemovalSubwidgetMixin, *cls.get_boolean_widget_mixins()]
 
     class ContextMixin:
+        __slots__ = ()
         items = (
             "file_removal_subwidget_checked",
             "file_removal_subwidget_name",
             "file_removal_subwidget_required",
             "removable_file_field",
             "removable_file_field_name",
+        )
+        static_items = (
             "file_removal_subwidget_class",
             "file_removal_subwidget_extra_class",
             "file_removal_subwidget_invalid_class",
@@ -51,7 +54,7 @@ class FileRemovalSubwidgetLibMixin:
                     if self.removable_file_field_name
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_file_removal_subwidget_required(self, value):
             return self.clean_bool(value)
@@ -63,7 +66,7 @@ class FileRemovalSubwidgetLibMixin:
                     if self.removable_file_field
                     else None
                 )
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
     @classmethod
     def base_file_removal_subwidget(
@@ -1,9 +1,3 @@
-from django.utils.html import conditional_escape
-from django.utils.safestring import mark_safe
-
-_SAFE_EMPTY_STRING = mark_safe("")
-
-
 class ClearableFileWidgetLibMixin:
     element_mixin_getters = {"ClearableFileWidget": "get_clearable_file_widget_mixins"}
     tags = ("clearable_file_widget",)
@@ -29,35 +23,29 @@ class ClearableFileWidgetLibMixin:
                     )
                 )
 
-        def get_content(self):
-            content = _SAFE_EMPTY_STRING
-            file_widget = self.get_file_widget_content()
-            if file_widget:
-                content += conditional_escape(file_widget)
-            removal_widget = self.get_removal_widget_content()
-            if removal_widget:
-                content += conditional_escape(removal_widget)
-            return content
+        def render_content_into(self, parts):
+            self.render_file_widget_into(parts)
+            self.render_removal_widget_into(parts)
 
-        def get_file_widget_content(self):
-            return self.create_child(self.file_widget_element_object_class).render()
+        def render_file_widget_into(self, parts):
+            self.create_child(self.file_widget_element_object_class).render_into(parts)
 
-        def get_removal_widget_content(self):
+        def render_removal_widget_into(self, parts):
             if self.context.clear_file:
                 widget = self.create_child(
                     self.removal_widget_element_object_class,
                     removable_file_field=self.context.field,
                 )
-                return widget.render()
-            return None
+                widget.render_into(parts)
 
     @classmethod
     def get_clearable_file_widget_mixins(cls):
         return [cls.ClearableFileWidgetMixin]
 
     class ContextMixin:
-        items = (
-            "clear_file",
+        __slots__ = ()
+        items = ("clear_file",)
+        static_items = (
             "clearable_file_widget_class",
             "clearable_file_widget_extra_class",
         )
@@ -65,7 +53,7 @@ class ClearableFileWidgetLibMixin:
         def compute_clear_file(self):
             if not self.is_inherited("value"):
                 return bool(self.value)
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_clear_file(self, value):
             return self.clean_bool(value)
@@ -41,6 +41,7 @@ class NumberWidgetLibMixin:
         return [cls.NumberWidgetMixin, *cls.get_widget_mixins()]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("max", "min", "step")
 
         def compute_max(self):
@@ -73,7 +74,7 @@ class NumberWidgetLibMixin:
                         else None
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_max(self, value):
             return self.normalize_decimal_limit(value) if value is not None else None
@@ -108,7 +109,7 @@ class NumberWidgetLibMixin:
                         else None
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_min(self, value):
             return self.normalize_decimal_limit(value) if value is not None else None
@@ -150,7 +151,7 @@ class NumberWidgetLibMixin:
                         else None
                     )
                 return None
-            raise self.ItemComputationFailed
+            return self.INHERIT
 
         def clean_step(self, value):
             return self.normalize_decimal_limit(value) if value is not None else None
@@ -32,6 +32,7 @@ class TextAreaWidgetLibMixin:
         return [cls.TextAreaWidgetMixin, *cls.get_widget_mixins()]
 
     class ContextMixin:
+        __slots__ = ()
         items = ("rows",)
 
     @classmethod
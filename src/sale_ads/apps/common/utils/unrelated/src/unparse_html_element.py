@@ -62,14 +62,32 @@ def unparse_html_element(name, attrs=None, content=None, *, close=True):
     >>> isinstance(result, SafeString)
     True
     """
-    if attrs is None:
-        attrs = {}
-    escaped_element = _unparse_and_escape_start_tag(name, attrs)
+    escaped_parts = [unparse_html_start_tag(name, attrs)]
     if close:
         if content is not None:
-            escaped_element += conditional_escape(content)
-        escaped_element += f"</{name}>"
-    return mark_safe(escaped_element)
+            escaped_parts.append(conditional_escape(content))
+        escaped_parts.append(f"</{name}>")
+    return mark_safe(str.join("", escaped_parts))
+
+
+def unparse_html_start_tag(name, attrs=None):
+    """
+    Example:
+
+    >>> from django.utils.safestring import SafeString
+    >>>
+    >>>
+    >>> result = unparse_html_start_tag("spam", {"a": "&", "b": None})
+    >>>
+    >>> result
+    '<spam a="&amp;" b>'
+    >>>
+    >>> isinstance(result, SafeString)
+    True
+    """
+    if attrs is None:
+        attrs = {}
+    return mark_safe(_unparse_and_escape_start_tag(name, attrs))
 
 
 def _unparse_and_escape_start_tag(name, attrs):
@@ -9,7 +9,8 @@ from django.core.files.base import ContentFile
 from django.core.management.base import BaseCommand
 from PIL import Image
 
-from ads.models import Ad, AdEntry, AdImage
+from ads.cache import ad_data_version
+from ads.models import Ad, AdEntry, AdImage, CategoryAdCounter
 from categories.models import Category
 
 
@@ -73,6 +74,10 @@ class Command(BaseCommand):
             )
         )
 
+        # Cached data
+        CategoryAdCounter.objects.rebuild()
+        ad_data_version.bump()
+
     @cached_property
     def _images(self):
         value = []
@@ -0,0 +1,53 @@
+from django import forms
+from django.core.management.base import BaseCommand
+
+from common.benchmarking import compiled_htmlforms_elements, measure
+from frontend.templatetags.htmlforms import _CustomHTMLFormsLib
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time of rendering select and checkbox list fields against "
+        "the number of choices, with and without compiled elements (and "
+        "cached markup of choices)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default=[1000, 10000, 100000], nargs="+", type=int
+        )
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, sizes, repeat, **options):
+        columns = ["choices", "field", "compiled", "time", "per choice"]
+        self.stdout.write(str.join("\t", columns))
+        for size in sorted(sizes):
+            form = self._create_form(size)
+            renders = {
+                "select": lambda: _CustomHTMLFormsLib.select_field(form["select"]),
+                "checkboxes": lambda: _CustomHTMLFormsLib.checkbox_list_field(
+                    form["checkboxes"]
+                ),
+            }
+            for name, render in renders.items():
+                for compiled in [False, True]:
+                    with compiled_htmlforms_elements(_CustomHTMLFormsLib, compiled):
+                        value = measure(render, repeat=repeat)
+                    row = [
+                        str(size),
+                        name,
+                        str(compiled),
+                        f"{value * 1000:.1f} ms",
+                        f"{value / size * 1e6:.2f} us",
+                    ]
+                    self.stdout.write(str.join("\t", row))
+
+    @staticmethod
+    def _create_form(size):
+        choices = [(str(i), f"Choice {i} & more") for i in range(size)]
+
+        class Form(forms.Form):
+            select = forms.ChoiceField(choices=choices)
+            checkboxes = forms.MultipleChoiceField(choices=choices)
+
+        return Form(initial={"select": "0", "checkboxes": ["0", str(size - 1)]})
@@ -0,0 +1,86 @@
+from django import forms
+from django.core.management.base import BaseCommand
+
+from common.benchmarking import compiled_htmlforms_elements, measure
+from frontend.templatetags.htmlforms import _CustomHTMLFormsLib
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time of creating htmlforms elements (and their contexts) "
+        "and of rendering a form with hundreds of options, with and without "
+        "compiled elements."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=[100, 300, 1000], nargs="+", type=int)
+        parser.add_argument("--number", default=20, type=int)
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, sizes, number, repeat, **options):
+        columns = ["options", "compiled", "elements", "form", "per option"]
+        self.stdout.write(str.join("\t", columns))
+        for size in sorted(sizes):
+            form = self._create_form(size)
+            for compiled in [False, True]:
+                with compiled_htmlforms_elements(_CustomHTMLFormsLib, compiled):
+                    elements = measure(
+                        lambda: self._create_elements(form),
+                        number=number,
+                        repeat=repeat,
+                    )
+                    value = measure(
+                        lambda: self._render_form(form), number=number, repeat=repeat
+                    )
+                row = [
+                    str(size),
+                    str(compiled),
+                    f"{elements * 1000:.2f} ms",
+                    f"{value * 1000:.2f} ms",
+                    f"{value / size * 1e6:.2f} us",
+                ]
+                self.stdout.write(str.join("\t", row))
+
+    @staticmethod
+    def _create_form(size):
+        # The options are split between the fields, a third in groups
+        count = size // 4
+        choices = [(str(i), f"Choice {i}") for i in range(count)]
+        grouped_choices = [
+            (f"Group {i}", choices[i : i + 10]) for i in range(0, count, 10)
+        ]
+
+        class Form(forms.Form):
+            text = forms.CharField()
+            select = forms.ChoiceField(choices=choices)
+            grouped_select = forms.ChoiceField(choices=grouped_choices)
+            checkboxes = forms.MultipleChoiceField(choices=choices)
+            radios = forms.ChoiceField(choices=choices)
+
+        return Form({"text": "text", "select": "0", "checkboxes": ["0", "1"]})
+
+    @staticmethod
+    def _create_elements(form):
+        """
+        Create elements as rendering options does, resolving the items
+        used by options.
+        """
+        select = _CustomHTMLFormsLib.SelectWidget(parent=None, field=form["select"])
+        option_class = select.choice_element_object_class
+        for value, label in select.context.safe_choices:
+            option = select.create_child(
+                option_class, choice_value=value, choice_label=label
+            )
+            option.get_attrs()
+            option.get_content()
+
+    @staticmethod
+    def _render_form(form):
+        for name, tag in [
+            ("text", "text_field"),
+            ("select", "select_field"),
+            ("grouped_select", "select_field"),
+            ("checkboxes", "checkbox_list_field"),
+            ("radios", "radio_list_field"),
+        ]:
+            getattr(_CustomHTMLFormsLib, tag)(form[name])
@@ -0,0 +1,94 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+# Run in a new process with the mode ("lazy" or "eager") as the argument,
+# printing times of Django setup and of the first render of a template
+_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+
+import django
+
+django.setup()
+setup_end = time.perf_counter()
+
+from django import forms
+from django.template import engines
+
+if sys.argv[1] == "eager":
+    # As the libraries were loaded before the element classes became lazy
+    from frontend.templatetags.htmlforms import _CustomHTMLFormsLib
+    from htmlforms import HTMLFormsLib
+
+    HTMLFormsLib.create_element_classes()
+    _CustomHTMLFormsLib.create_element_classes()
+
+choices = [(str(i), f"Choice {i}") for i in range(10)]
+
+
+class Form(forms.Form):
+    text = forms.CharField()
+    select = forms.ChoiceField(choices=choices)
+    checkboxes = forms.MultipleChoiceField(choices=choices)
+
+
+template = engines["django"].from_string(
+    "{% load htmlforms %}"
+    "{% text_field form.text 'Text' %}"
+    "{% select_field form.select 'Select' %}"
+    "{% checkbox_list_field form.checkboxes 'Checkboxes' %}"
+)
+template.render({"form": Form()})
+end = time.perf_counter()
+print(json.dumps([setup_end - start, end - setup_end]))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure time of Django setup and of the first render of a template "
+        "using htmlforms in new processes, with the element classes created "
+        "on first use (lazy) and with all of them created on loading the "
+        "library (eager)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", default=10, type=int)
+
+    def handle(self, *args, repeat, **options):
+        columns = ["mode", "setup", "first render", "total"]
+        self.stdout.write(str.join("\t", columns))
+        env = {**os.environ, "PYTHONPATH": str.join(os.pathsep, sys.path)}
+        modes = ["eager", "lazy"]
+        times = {mode: [] for mode in modes}
+        # The modes are alternated, so that they run under similar load
+        for i in range(repeat):
+            for mode in modes:
+                times[mode].append(self._run(mode, env))
+        for mode in modes:
+            values = [
+                statistics.median(setup for setup, render in times[mode]),
+                statistics.median(render for setup, render in times[mode]),
+                statistics.median(setup + render for setup, render in times[mode]),
+            ]
+            row = [mode, *(f"{value * 1000:.1f} ms" for value in values)]
+            self.stdout.write(str.join("\t", row))
+
+    @staticmethod
+    def _run(mode, env):
+        process = subprocess.run(
+            [sys.executable, "-c", _SCRIPT, mode],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return json.loads(process.stdout)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.utils.translation import get_language, get_language_info
+
+_language_choices = {}
+
+
+def get_language_choices():
+    """
+    Get choices of languages with local names, in preference order.
+
+    The choices are computed once per active language and value of
+    `LANGUAGE_PREFERENCE_ORDER` setting.
+    """
+    key = (get_language(), tuple(settings.LANGUAGE_PREFERENCE_ORDER))
+    try:
+        return _language_choices[key]
+    except KeyError:
+        value = _language_choices[key] = tuple(
+            (language, get_language_info(language)["name_local"])
+            for language in settings.LANGUAGE_PREFERENCE_ORDER
+        )
+        return value
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils import translation
+from django.utils.translation import get_language_info
+
+from languages.choices import get_language_choices
+
+
+class GetLanguageChoicesTest(SimpleTestCase):
+    def test(self):
+        with self.settings(LANGUAGE_PREFERENCE_ORDER=["de", "fr"]):
+            actual = get_language_choices()
+        expected = (
+            ("de", get_language_info("de")["name_local"]),
+            ("fr", get_language_info("fr")["name_local"]),
+        )
+        self.assertEqual(actual, expected)
+
+    def test_computed_once(self):
+        with self.settings(LANGUAGE_PREFERENCE_ORDER=["de", "fr"]):
+            first = get_language_choices()
+            with patch("languages.choices.get_language_info") as mock:
+                second = get_language_choices()
+        mock.assert_not_called()
+        self.assertIs(second, first)
+
+    def test_with_other_language_preference_order(self):
+        with self.settings(LANGUAGE_PREFERENCE_ORDER=["de", "fr"]):
+            get_language_choices()
+        with self.settings(LANGUAGE_PREFERENCE_ORDER=["fr"]):
+            actual = get_language_choices()
+        self.assertEqual(actual, (("fr", get_language_info("fr")["name_local"]),))
+
+    def test_with_other_active_language(self):
+        with self.settings(LANGUAGE_PREFERENCE_ORDER=["de", "fr"]):
+            first = get_language_choices()
+            with translation.override("ru"):
+                second = get_language_choices()
+        self.assertIsNot(second, first)
+        self.assertEqual(second, first)
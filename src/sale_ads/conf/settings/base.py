@@ -93,6 +93,11 @@ SOCIALACCOUNT_PROVIDERS = {
 
 # Data
 
+# The settings caching data (ADS_AD_COUNT_CACHING, ADS_CATEGORY_TREE_CACHING,
+# ADS_LIST_PAGE_CACHING and CATEGORIES_SNAPSHOT) require a cache shared by all
+# processes (such as "db://" or "redis://"), since the versions of the
+# cached data are stored in it (see `common.cache_versions`)
+CACHES = {"default": _env.dj_cache_url("DJANGO_CACHE_URL", "locmem://")}
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
@@ -162,8 +167,42 @@ TEMPLATES = [
 
 # Miscellaneous
 
+# ADS_AD_COUNT_CACHING and ADS_CATEGORY_TREE_CACHING require a shared cache
+# (see CACHES)
+ADS_AD_COUNT_CACHING = _env.bool("DJANGO_ADS_AD_COUNT_CACHING", False)
+ADS_CATEGORY_AD_COUNTERS = _env.bool("DJANGO_ADS_CATEGORY_AD_COUNTERS", False)
+ADS_CATEGORY_TREE_CACHING = _env.bool("DJANGO_ADS_CATEGORY_TREE_CACHING", False)
+
+# Summing numbers of ads of category subtrees in the database
+ADS_CATEGORY_AD_COUNT_ROLLUP = _env.bool("DJANGO_ADS_CATEGORY_AD_COUNT_ROLLUP", False)
+
+ADS_KEYSET_PAGINATION = _env.bool("DJANGO_ADS_KEYSET_PAGINATION", False)
+
+# Rendering only the roots of the category tree and the paths to the
+# selected categories, with other nodes expanded on demand
+ADS_LAZY_CATEGORY_TREE = _env.bool("DJANGO_ADS_LAZY_CATEGORY_TREE", False)
+
+# Rendering only the selected categories in the category field of the ad
+# query form, with other categories found by searching
+ADS_CATEGORY_PICKER = _env.bool("DJANGO_ADS_CATEGORY_PICKER", False)
+
+# Caching of whole ad list pages for anonymous users (requires a shared
+# cache)
+ADS_LIST_PAGE_CACHING = _env.bool("DJANGO_ADS_LIST_PAGE_CACHING", False)
+
+# "substring", "trigram" (index-assisted substring search) or "full_text"
+ADS_SEARCH_MODE = _env.str("DJANGO_ADS_SEARCH_MODE", "substring")
+
 ADS_VERIFIED_EMAIL_REQUIRED_FOR_CREATION = _env.bool(
     "DJANGO_ADS_VERIFIED_EMAIL_REQUIRED_FOR_CREATION", True
 )
 
+# Sharing of cached categories between requests of a process (requires a
+# shared cache)
+CATEGORIES_SNAPSHOT = _env.bool("DJANGO_CATEGORIES_SNAPSHOT", False)
+
+# Directory of category snapshots mapped to memory, shared by processes of
+# a node (used if CATEGORIES_SNAPSHOT is true)
+CATEGORIES_SHARED_SNAPSHOT_DIR = _env.str("DJANGO_CATEGORIES_SHARED_SNAPSHOT_DIR", None)
+
 SITE_ID = 1
@@ -8,6 +8,7 @@ _env.read_env()
 
 # Data
 
+CACHES = {"default": _env.dj_cache_url("DJANGO_CACHE_URL", "db://django_cache")}
 DATABASES = {
     "default": _env.dj_db_url("DATABASE_URL", "postgres://postgres@db/postgres")
 }
@@ -0,0 +1,57 @@
+// Searching categories for the category field of the ad query form.
+// The found categories are rendered as unchecked choices of the field,
+// and the checked ones are moved to the selected categories.
+(() => {
+  const input = document.getElementById("category-search");
+  const selected = document.getElementById("category-search-selected");
+  const results = document.getElementById("category-search-results");
+  let controller = null;
+
+  const search = async () => {
+    controller?.abort();
+    controller = new AbortController();
+    const url = new URL(input.dataset.searchUrl, document.baseURI);
+    url.searchParams.set("q", input.value);
+    let html;
+    try {
+      const response = await fetch(url, { signal: controller.signal });
+      if (!response.ok) {
+        return;
+      }
+      html = await response.text();
+    } catch (error) {
+      if (error.name === "AbortError") {
+        return;
+      }
+      throw error;
+    }
+    const container = document.createElement("div");
+    container.innerHTML = html;
+    // Categories that are already selected aren't repeated
+    for (const choice of selected.querySelectorAll("input[type=checkbox]")) {
+      container
+        .querySelector(`input[type=checkbox][value="${choice.value}"]`)
+        ?.parentElement.remove();
+    }
+    results.replaceChildren(...container.childNodes);
+  };
+
+  let timeout = null;
+  input.addEventListener("input", () => {
+    clearTimeout(timeout);
+    timeout = setTimeout(search, 250);
+  });
+  // Searching doesn't submit the form
+  input.addEventListener("keydown", (event) => {
+    if (event.key === "Enter") {
+      event.preventDefault();
+      clearTimeout(timeout);
+      search();
+    }
+  });
+  results.addEventListener("change", (event) => {
+    if (event.target.checked) {
+      selected.append(event.target.parentElement);
+    }
+  });
+})();
@@ -0,0 +1,21 @@
+// Loading children of lazy category tree nodes on their first expansion
+document.addEventListener(
+  "toggle",
+  async (event) => {
+    const node = event.target;
+    const url = node.dataset?.childrenUrl;
+    if (!node.open || !url) {
+      return;
+    }
+    delete node.dataset.childrenUrl;
+    const response = await fetch(url);
+    if (!response.ok) {
+      node.dataset.childrenUrl = url;
+      return;
+    }
+    node.querySelector(":scope > .category-tree-children").innerHTML =
+      await response.text();
+  },
+  // The event doesn't bubble
+  true,
+);